@@ -0,0 +1,28 @@
+"""Add lookup indexes for authors, borrows and reservations
+
+Revision ID: 3b8e61f0c2d4
+Revises: d59ba2d25a62
+Create Date: 2025-11-28 09:00:12.417305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b8e61f0c2d4'
+down_revision = 'd59ba2d25a62'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_book_authors_author_book', 'book_authors', ['author_id', 'book_id'], unique=False)
+    op.create_index('ix_borrow_records_copy_status_user', 'borrow_records', ['copy_id', 'status', 'user_id'], unique=False)
+    op.create_index('ix_reservations_book_status_reserved', 'reservations', ['book_id', 'status', 'reserved_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reservations_book_status_reserved', table_name='reservations')
+    op.drop_index('ix_borrow_records_copy_status_user', table_name='borrow_records')
+    op.drop_index('ix_book_authors_author_book', table_name='book_authors')
@@ -0,0 +1,29 @@
+"""Use partial index for pending reservations
+
+Revision ID: 8f2a4c7d91e3
+Revises: 3b8e61f0c2d4
+Create Date: 2025-11-28 09:30:47.902114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8f2a4c7d91e3'
+down_revision = '3b8e61f0c2d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_reservations_book_status_reserved', table_name='reservations')
+    op.create_index(
+        'ix_reservations_pending_fifo', 'reservations', ['book_id', 'reserved_at'],
+        unique=False, postgresql_where=sa.text("status = 'PENDING'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reservations_pending_fifo', table_name='reservations', postgresql_where=sa.text("status = 'PENDING'"))
+    op.create_index('ix_reservations_book_status_reserved', 'reservations', ['book_id', 'status', 'reserved_at'], unique=False)
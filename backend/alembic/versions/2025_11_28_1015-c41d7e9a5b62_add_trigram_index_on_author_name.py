@@ -0,0 +1,29 @@
+"""Add trigram index on author name
+
+Revision ID: c41d7e9a5b62
+Revises: 8f2a4c7d91e3
+Create Date: 2025-11-28 10:15:03.561829
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41d7e9a5b62'
+down_revision = '8f2a4c7d91e3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_authors_name_trgm', 'authors', ['name'], unique=False,
+        postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_authors_name_trgm', table_name='authors', postgresql_using='gin')
+    # pg_trgm is left installed; other objects may depend on it
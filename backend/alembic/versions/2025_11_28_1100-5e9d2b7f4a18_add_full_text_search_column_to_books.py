@@ -0,0 +1,36 @@
+"""Add full-text search column to books
+
+Revision ID: 5e9d2b7f4a18
+Revises: c41d7e9a5b62
+Create Date: 2025-11-28 11:00:26.184390
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e9d2b7f4a18'
+down_revision = 'c41d7e9a5b62'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Kept out of the ORM model: generated tsvector columns are PostgreSQL-only
+    op.execute(
+        """
+        ALTER TABLE books ADD COLUMN search_tsv tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(description, '')), 'B') ||
+            to_tsvector('simple', coalesce(isbn, ''))
+        ) STORED
+        """
+    )
+    op.create_index('ix_books_search_tsv', 'books', ['search_tsv'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_books_search_tsv', table_name='books', postgresql_using='gin')
+    op.drop_column('books', 'search_tsv')
@@ -0,0 +1,71 @@
+"""Add copy counters to books
+
+Revision ID: a7c3f95e2d06
+Revises: 5e9d2b7f4a18
+Create Date: 2025-11-28 11:45:51.730264
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c3f95e2d06'
+down_revision = '5e9d2b7f4a18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('books', sa.Column('total_copies', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('books', sa.Column('available_copies', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from existing copies
+    op.execute(
+        """
+        UPDATE books SET
+            total_copies = (
+                SELECT count(*) FROM book_copies WHERE book_copies.book_id = books.id
+            ),
+            available_copies = (
+                SELECT count(*) FROM book_copies
+                WHERE book_copies.book_id = books.id AND book_copies.status = 'AVAILABLE'
+            )
+        """
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION book_copies_update_counts() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE books
+                SET total_copies = total_copies - 1,
+                    available_copies = available_copies - CASE WHEN OLD.status = 'AVAILABLE' THEN 1 ELSE 0 END
+                WHERE id = OLD.book_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                UPDATE books
+                SET total_copies = total_copies + 1,
+                    available_copies = available_copies + CASE WHEN NEW.status = 'AVAILABLE' THEN 1 ELSE 0 END
+                WHERE id = NEW.book_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_book_copies_counts
+        AFTER INSERT OR DELETE OR UPDATE OF book_id, status ON book_copies
+        FOR EACH ROW EXECUTE FUNCTION book_copies_update_counts()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS trg_book_copies_counts ON book_copies')
+    op.execute('DROP FUNCTION IF EXISTS book_copies_update_counts()')
+    op.drop_column('books', 'available_copies')
+    op.drop_column('books', 'total_copies')
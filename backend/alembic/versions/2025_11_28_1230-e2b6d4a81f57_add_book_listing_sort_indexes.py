@@ -0,0 +1,32 @@
+"""Add book listing sort indexes
+
+Revision ID: e2b6d4a81f57
+Revises: a7c3f95e2d06
+Create Date: 2025-11-28 12:30:09.318472
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b6d4a81f57'
+down_revision = 'a7c3f95e2d06'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_books_created_at_desc', 'books', [sa.text('created_at DESC')], unique=False)
+    op.create_index(
+        'ix_books_rating_created_at', 'books',
+        [sa.text('average_rating DESC NULLS LAST'), sa.text('created_at DESC')],
+        unique=False
+    )
+    op.create_index('ix_book_genres_genre_book', 'book_genres', ['genre_id', 'book_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_book_genres_genre_book', table_name='book_genres')
+    op.drop_index('ix_books_rating_created_at', table_name='books')
+    op.drop_index('ix_books_created_at_desc', table_name='books')
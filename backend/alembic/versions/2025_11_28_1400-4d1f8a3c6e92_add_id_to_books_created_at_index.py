@@ -0,0 +1,30 @@
+"""Add id to books created_at index for keyset pagination
+
+Revision ID: 4d1f8a3c6e92
+Revises: e2b6d4a81f57
+Create Date: 2025-11-28 14:00:44.270915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4d1f8a3c6e92'
+down_revision = 'e2b6d4a81f57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_books_created_at_desc', table_name='books')
+    op.create_index(
+        'ix_books_created_at_id_desc', 'books',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_books_created_at_id_desc', table_name='books')
+    op.create_index('ix_books_created_at_desc', 'books', [sa.text('created_at DESC')], unique=False)
@@ -0,0 +1,28 @@
+"""Add created_at index to borrow_records for keyset pagination
+
+Revision ID: 9b3e7c2f4d10
+Revises: 4d1f8a3c6e92
+Create Date: 2025-11-28 15:00:12.508341
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b3e7c2f4d10'
+down_revision = '4d1f8a3c6e92'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_borrow_records_created_at_id_desc', 'borrow_records',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_borrow_records_created_at_id_desc', table_name='borrow_records')
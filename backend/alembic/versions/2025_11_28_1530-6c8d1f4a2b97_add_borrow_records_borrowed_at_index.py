@@ -0,0 +1,24 @@
+"""Add borrowed_at index to borrow_records for borrow trends
+
+Revision ID: 6c8d1f4a2b97
+Revises: 9b3e7c2f4d10
+Create Date: 2025-11-28 15:30:41.190427
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6c8d1f4a2b97'
+down_revision = '9b3e7c2f4d10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_borrow_records_borrowed_at', 'borrow_records', ['borrowed_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_borrow_records_borrowed_at', table_name='borrow_records')
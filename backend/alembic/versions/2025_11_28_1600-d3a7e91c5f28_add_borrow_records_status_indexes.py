@@ -0,0 +1,40 @@
+"""Add borrow_records status indexes and cart_items lookup index
+
+Revision ID: d3a7e91c5f28
+Revises: 6c8d1f4a2b97
+Create Date: 2025-11-28 16:00:27.633810
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3a7e91c5f28'
+down_revision = '6c8d1f4a2b97'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_borrow_records_user_status_created', 'borrow_records',
+        ['user_id', 'status', sa.text('created_at DESC')],
+        unique=False
+    )
+    op.create_index(
+        'ix_borrow_records_active_due', 'borrow_records', ['due_date'],
+        unique=False, postgresql_where=sa.text("status = 'ACTIVE'")
+    )
+    op.create_index(
+        'ix_borrow_records_returned_at', 'borrow_records', ['returned_at'],
+        unique=False, postgresql_where=sa.text("status = 'RETURNED'")
+    )
+    op.create_index('ix_cart_items_cart_book', 'cart_items', ['cart_id', 'book_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_cart_items_cart_book', table_name='cart_items')
+    op.drop_index('ix_borrow_records_returned_at', table_name='borrow_records', postgresql_where=sa.text("status = 'RETURNED'"))
+    op.drop_index('ix_borrow_records_active_due', table_name='borrow_records', postgresql_where=sa.text("status = 'ACTIVE'"))
+    op.drop_index('ix_borrow_records_user_status_created', table_name='borrow_records')
@@ -0,0 +1,37 @@
+"""Add keyset pagination indexes for loans and published news
+
+Revision ID: a5e2c8b71f43
+Revises: d3a7e91c5f28
+Create Date: 2025-11-28 16:30:12.418305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a5e2c8b71f43'
+down_revision = 'd3a7e91c5f28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # (borrowed_at DESC, id DESC) also serves the borrowed_at range scans
+    op.drop_index('ix_borrow_records_borrowed_at', table_name='borrow_records')
+    op.create_index(
+        'ix_borrow_records_borrowed_at_id_desc', 'borrow_records',
+        [sa.text('borrowed_at DESC'), sa.text('id DESC')],
+        unique=False
+    )
+    op.create_index(
+        'ix_news_published_at_id_desc', 'news',
+        [sa.text('published_at DESC'), sa.text('id DESC')],
+        unique=False, postgresql_where=sa.text('published')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_news_published_at_id_desc', table_name='news')
+    op.drop_index('ix_borrow_records_borrowed_at_id_desc', table_name='borrow_records')
+    op.create_index('ix_borrow_records_borrowed_at', 'borrow_records', ['borrowed_at'], unique=False)
@@ -0,0 +1,28 @@
+"""Add user lookup index to reservations
+
+Revision ID: f7b3d9e2a614
+Revises: a5e2c8b71f43
+Create Date: 2025-11-28 17:00:48.902716
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7b3d9e2a614'
+down_revision = 'a5e2c8b71f43'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_reservations_user_reserved', 'reservations',
+        ['user_id', sa.text('reserved_at DESC')],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reservations_user_reserved', table_name='reservations')
@@ -0,0 +1,39 @@
+"""Add trigram indexes for the loan search columns
+
+Revision ID: b8e4a1c7d395
+Revises: f7b3d9e2a614
+Create Date: 2025-11-28 17:30:21.604738
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e4a1c7d395'
+down_revision = 'f7b3d9e2a614'
+branch_labels = None
+depends_on = None
+
+# (index, table, column) searched with ILIKE '%term%' by the loans list
+TRGM_INDEXES = [
+    ('ix_users_full_name_trgm', 'users', 'full_name'),
+    ('ix_users_email_trgm', 'users', 'email'),
+    ('ix_books_title_trgm', 'books', 'title'),
+    ('ix_book_copies_barcode_trgm', 'book_copies', 'barcode'),
+]
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in TRGM_INDEXES:
+        op.create_index(
+            name, table, [column], unique=False,
+            postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'}
+        )
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(TRGM_INDEXES):
+        op.drop_index(name, table_name=table, postgresql_using='gin')
+    # pg_trgm is left installed; other objects may depend on it
@@ -1,31 +1,57 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, func, exists, lambda_stmt, bindparam
 from uuid import UUID
 from math import ceil
 
-from app.database import get_db
-from app.models.book import Author, Book
+from app.database import get_db, get_ro_db
+from app.models.book import Author, Book, book_authors
 from app.models.user import User
 from app.schemas.author import AuthorResponse, AuthorDetailResponse
 from app.schemas.book import BookResponse, BookListResponse, AuthorCreate, AuthorUpdate
+from app.api.v1.books import BOOK_EAGER
 from app.dependencies import require_librarian
+from app.utils.upsert import insert_on_conflict
+from app.utils.cache import cache
 from typing import List
 
 
 router = APIRouter(prefix="/authors", tags=["Authors"])
 
 
+# Hot single-row lookups, built once at import time (lambda statements are
+# cached by SQLAlchemy, so per-request expression construction is skipped)
+GET_AUTHOR_BY_ID = lambda_stmt(lambda: select(Author).where(Author.id == bindparam("author_id")))
+AUTHOR_NAME_EXISTS = lambda_stmt(lambda: select(exists().where(Author.name == bindparam("name"))))
+
+# Plain columns for read-only author endpoints (rows are fetched as mappings,
+# skipping ORM identity map and instance construction)
+AUTHOR_DETAIL_COLUMNS = (Author.id, Author.name, Author.bio, Author.created_at)
+
+
+def author_with_book_count_query():
+    """Select author columns together with their book count (authors without books count as 0)"""
+    return (
+        select(*AUTHOR_DETAIL_COLUMNS, func.count(book_authors.c.book_id).label("book_count"))
+        .outerjoin(book_authors, book_authors.c.author_id == Author.id)
+        .group_by(Author.id)
+    )
+
+
 @router.get("/", response_model=List[AuthorDetailResponse])
 async def get_all_authors(
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=200),
     search: str = Query(None),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_ro_db)
 ):
     """Get all authors with book counts (with pagination and search)"""
-    query = select(Author)
+    cache_key = ("all", page, page_size, search)
+    cached = cache.get("authors", cache_key)
+    if cached is not None:
+        return cached
+
+    query = author_with_book_count_query()
 
     # Apply search filter
     if search:
@@ -38,40 +64,29 @@ async def get_all_authors(
     query = query.offset(offset).limit(page_size)
 
     result = await db.execute(query)
-    authors = result.scalars().all()
-
-    # Get book count for each author
-    author_responses = []
-    for author in authors:
-        book_count_result = await db.execute(
-            select(func.count(Book.id))
-            .join(Book.authors)
-            .where(Author.id == author.id)
-        )
-        book_count = book_count_result.scalar() or 0
-
-        author_responses.append(AuthorDetailResponse(
-            id=author.id,
-            name=author.name,
-            bio=author.bio,
-            created_at=author.created_at,
-            book_count=book_count
-        ))
 
+    author_responses = [AuthorDetailResponse(**row) for row in result.mappings()]
+    cache.set("authors", cache_key, author_responses)
     return author_responses
 
 
 @router.get("/recent", response_model=List[AuthorDetailResponse])
 async def get_recent_authors(
     limit: int = Query(6, ge=1, le=20),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_ro_db)
 ):
     """Get authors with recently added books"""
+    cache_key = ("recent", limit)
+    cached = cache.get("authors", cache_key)
+    if cached is not None:
+        return cached
+
     # Subquery to find the latest book creation date for each author
     latest_book_subquery = (
         select(
             Author.id.label("author_id"),
-            func.max(Book.created_at).label("latest_book_date")
+            func.max(Book.created_at).label("latest_book_date"),
+            func.count(Book.id).label("book_count")
         )
         .join(Book.authors)
         .group_by(Author.id)
@@ -80,33 +95,16 @@ async def get_recent_authors(
 
     # Query authors ordered by their latest book date
     query = (
-        select(Author)
+        select(*AUTHOR_DETAIL_COLUMNS, latest_book_subquery.c.book_count)
         .join(latest_book_subquery, Author.id == latest_book_subquery.c.author_id)
         .order_by(latest_book_subquery.c.latest_book_date.desc())
         .limit(limit)
     )
 
     result = await db.execute(query)
-    authors = result.scalars().all()
-
-    # Get book count for each author
-    author_responses = []
-    for author in authors:
-        book_count_result = await db.execute(
-            select(func.count(Book.id))
-            .join(Book.authors)
-            .where(Author.id == author.id)
-        )
-        book_count = book_count_result.scalar() or 0
-
-        author_responses.append(AuthorDetailResponse(
-            id=author.id,
-            name=author.name,
-            bio=author.bio,
-            created_at=author.created_at,
-            book_count=book_count
-        ))
 
+    author_responses = [AuthorDetailResponse(**row) for row in result.mappings()]
+    cache.set("authors", cache_key, author_responses)
     return author_responses
 
 
@@ -117,18 +115,23 @@ async def create_author(
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new author (librarian only)"""
-    # Check if author already exists
-    existing = await db.execute(select(Author).where(Author.name == author_data.name))
-    if existing.scalar_one_or_none():
+    # Insert and check name uniqueness in one statement; no row back means it already exists
+    result = await db.execute(
+        insert_on_conflict(db, Author)
+        .values(name=author_data.name, bio=author_data.bio)
+        .on_conflict_do_nothing(index_elements=["name"])
+        .returning(Author)
+    )
+    new_author = result.scalar_one_or_none()
+
+    if not new_author:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Author with this name already exists"
         )
 
-    new_author = Author(name=author_data.name, bio=author_data.bio)
-    db.add(new_author)
     await db.commit()
-    await db.refresh(new_author)
+    cache.invalidate("authors")
 
     return AuthorResponse.model_validate(new_author)
 
@@ -141,7 +144,7 @@ async def update_author(
     db: AsyncSession = Depends(get_db)
 ):
     """Update an author (librarian only)"""
-    result = await db.execute(select(Author).where(Author.id == author_id))
+    result = await db.execute(GET_AUTHOR_BY_ID, {"author_id": author_id})
     author = result.scalar_one_or_none()
 
     if not author:
@@ -152,8 +155,7 @@ async def update_author(
 
     # Check if new name conflicts with existing author
     if author_data.name and author_data.name != author.name:
-        existing = await db.execute(select(Author).where(Author.name == author_data.name))
-        if existing.scalar_one_or_none():
+        if await db.scalar(AUTHOR_NAME_EXISTS, {"name": author_data.name}):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Author with this name already exists"
@@ -165,6 +167,8 @@ async def update_author(
 
     await db.commit()
     await db.refresh(author)
+    # Book list pages and details embed author names
+    cache.invalidate("authors", "books")
 
     return AuthorResponse.model_validate(author)
 
@@ -176,24 +180,28 @@ async def delete_author(
     db: AsyncSession = Depends(get_db)
 ):
     """Delete an author (librarian only) - only if no books associated"""
-    result = await db.execute(select(Author).where(Author.id == author_id))
-    author = result.scalar_one_or_none()
+    # Fetch author and probe for linked books in one round-trip;
+    # EXISTS stops at the first association row instead of counting them all
+    has_books = exists().where(book_authors.c.author_id == Author.id)
+    result = await db.execute(
+        select(Author, has_books.label("has_books")).where(Author.id == author_id)
+    )
+    row = result.one_or_none()
 
-    if not author:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Author not found"
         )
 
-    # Check if author has books
-    book_count_result = await db.execute(
-        select(func.count(Book.id))
-        .join(Book.authors)
-        .where(Author.id == author_id)
-    )
-    book_count = book_count_result.scalar() or 0
+    author, author_has_books = row
 
-    if book_count > 0:
+    if author_has_books:
+        # Only count books when we need the number for the error message
+        book_count = await db.scalar(
+            select(func.count(book_authors.c.book_id))
+            .where(book_authors.c.author_id == author_id)
+        )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Cannot delete author with {book_count} books. Remove books first."
@@ -201,6 +209,7 @@ async def delete_author(
 
     await db.delete(author)
     await db.commit()
+    cache.invalidate("authors")
 
     return None
 
@@ -208,35 +217,21 @@ async def delete_author(
 @router.get("/{author_id}", response_model=AuthorDetailResponse)
 async def get_author(
     author_id: UUID,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_ro_db)
 ):
     """Get author details by ID with book count"""
     result = await db.execute(
-        select(Author).where(Author.id == author_id)
+        author_with_book_count_query().where(Author.id == author_id)
     )
-    author = result.scalar_one_or_none()
+    row = result.mappings().one_or_none()
     
-    if not author:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Author not found"
         )
     
-    # Get book count
-    book_count_result = await db.execute(
-        select(func.count(Book.id))
-        .join(Book.authors)
-        .where(Author.id == author_id)
-    )
-    book_count = book_count_result.scalar() or 0
-    
-    return AuthorDetailResponse(
-        id=author.id,
-        name=author.name,
-        bio=author.bio,
-        created_at=author.created_at,
-        book_count=book_count
-    )
+    return AuthorDetailResponse(**row)
 
 
 @router.get("/{author_id}/books", response_model=BookListResponse)
@@ -244,51 +239,58 @@ async def get_author_books(
     author_id: UUID,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_ro_db)
 ):
     """Get all books by an author with pagination"""
-    # Verify author exists
-    author_result = await db.execute(
-        select(Author).where(Author.id == author_id)
-    )
-    author = author_result.scalar_one_or_none()
-    
-    if not author:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Author not found"
-        )
-    
-    # Build query for books by this author
+    # Page rows and grand total in one query via COUNT(*) OVER()
+    offset = (page - 1) * page_size
     query = (
-        select(Book)
-        .join(Book.authors)
-        .where(Author.id == author_id)
-        .options(
-            selectinload(Book.authors),
-            selectinload(Book.genres),
-            selectinload(Book.keywords)
-        )
+        select(Book, func.count().over().label("total"))
+        .join(book_authors, book_authors.c.book_id == Book.id)
+        .where(book_authors.c.author_id == author_id)
+        .options(*BOOK_EAGER)
         .order_by(Book.created_at.desc())
+        .offset(offset)
+        .limit(page_size)
     )
     
-    # Get total count
-    count_query = select(func.count(Book.id)).join(Book.authors).where(Author.id == author_id)
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
-    
-    # Apply pagination
-    offset = (page - 1) * page_size
-    query = query.offset(offset).limit(page_size)
-    
-    # Execute query
     result = await db.execute(query)
-    books = result.scalars().all()
+    rows = result.all()
+    
+    if rows:
+        # Rows joined through book_authors imply the author exists
+        books = [row.Book for row in rows]
+        total = rows[0].total
+    else:
+        # No rows: author may not exist, have no books, or the page is past the end
+        if page == 1:
+            # An empty first page means zero books; only existence is unknown
+            author_exists = await db.scalar(select(exists().where(Author.id == author_id)))
+            total = 0
+        else:
+            author_result = await db.execute(
+                author_with_book_count_query().where(Author.id == author_id)
+            )
+            author = author_result.mappings().one_or_none()
+            author_exists = author is not None
+            total = author["book_count"] if author else 0
+        
+        if not author_exists:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Author not found"
+            )
+        
+        books = []
     
-    return BookListResponse(
+    page_response = BookListResponse.model_construct(
         items=[BookResponse.model_validate(book) for book in books],
         total=total,
         page=page,
         page_size=page_size,
         total_pages=ceil(total / page_size) if total > 0 else 0
     )
+    
+    # Items are validated once above; serialize straight to JSON instead of
+    # letting FastAPI re-validate the page and run it through jsonable_encoder
+    return Response(content=page_response.model_dump_json(), media_type="application/json")
@@ -1,8 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, exists, lambda_stmt, bindparam
 from uuid import UUID
-from datetime import datetime, timedelta
 
 from app.database import get_db
 from app.models.book_copy import BookCopy, BorrowRecord
@@ -19,9 +18,57 @@ from app.schemas.book_copy import (
     BorrowStatus
 )
 from app.dependencies import get_current_user, require_librarian
+from app.utils.cache import cache
+from app.utils.upsert import insert_on_conflict
+from app.utils.utcnow import utcnow
 
 router = APIRouter(prefix="/book-copies", tags=["Book Copies"])
 
+# Hot single-row lookups, built once at import time (lambda statements are
+# cached by SQLAlchemy, so per-request expression construction is skipped)
+GET_COPY_BY_ID = lambda_stmt(lambda: select(BookCopy).where(BookCopy.id == bindparam("copy_id")))
+COPY_EXISTS = lambda_stmt(lambda: select(exists().where(BookCopy.id == bindparam("copy_id"))))
+COPY_STATUS = lambda_stmt(lambda: select(BookCopy.status).where(BookCopy.id == bindparam("copy_id")))
+BOOK_EXISTS = lambda_stmt(lambda: select(exists().where(Book.id == bindparam("book_id"))))
+
+# Read-only lookup fetching just the columns BookCopyResponse serializes
+GET_COPY_ROW_BY_ID = lambda_stmt(
+    lambda: select(
+        BookCopy.id,
+        BookCopy.book_id,
+        BookCopy.barcode,
+        BookCopy.status,
+        BookCopy.created_at,
+        BookCopy.updated_at
+    ).where(BookCopy.id == bindparam("copy_id"))
+)
+
+
+def _copy_response(copy: BookCopy) -> BookCopyResponse:
+    """Build the response from a freshly written copy without re-validation"""
+    return BookCopyResponse.model_construct(
+        id=copy.id,
+        book_id=copy.book_id,
+        barcode=copy.barcode,
+        status=CopyStatus(copy.status),
+        created_at=copy.created_at,
+        updated_at=copy.updated_at
+    )
+
+
+def _borrow_response(record: BorrowRecord) -> BorrowRecordResponse:
+    """Build the response from a freshly written borrow record without re-validation"""
+    return BorrowRecordResponse.model_construct(
+        id=record.id,
+        copy_id=record.copy_id,
+        user_id=record.user_id,
+        borrowed_at=record.borrowed_at,
+        due_date=record.due_date,
+        returned_at=record.returned_at,
+        status=BorrowStatus(record.status),
+        created_at=record.created_at
+    )
+
 
 @router.post("/", response_model=BookCopyResponse, status_code=status.HTTP_201_CREATED)
 async def create_book_copy(
@@ -32,34 +79,35 @@ async def create_book_copy(
     """Create a new book copy (librarian only)"""
     
     # Check if book exists
-    result = await db.execute(select(Book).where(Book.id == copy_data.book_id))
-    book = result.scalar_one_or_none()
-    
-    if not book:
+    if not await db.scalar(BOOK_EXISTS, {"book_id": copy_data.book_id}):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Book not found"
         )
     
-    # Check if barcode already exists
-    result = await db.execute(select(BookCopy).where(BookCopy.barcode == copy_data.barcode))
-    if result.scalar_one_or_none():
+    # Insert and check barcode uniqueness in one statement
+    result = await db.execute(
+        insert_on_conflict(db, BookCopy)
+        .values(
+            book_id=copy_data.book_id,
+            barcode=copy_data.barcode,
+            status=CopyStatus.AVAILABLE
+        )
+        .on_conflict_do_nothing(index_elements=["barcode"])
+        .returning(BookCopy)
+    )
+    new_copy = result.scalar_one_or_none()
+    
+    if not new_copy:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Barcode already exists"
         )
     
-    new_copy = BookCopy(
-        book_id=copy_data.book_id,
-        barcode=copy_data.barcode,
-        status=CopyStatus.AVAILABLE
-    )
-    
-    db.add(new_copy)
     await db.commit()
-    await db.refresh(new_copy)
+    cache.invalidate("books")
     
-    return BookCopyResponse.model_validate(new_copy)
+    return _copy_response(new_copy)
 
 
 @router.get("/{copy_id}", response_model=BookCopyResponse)
@@ -69,8 +117,8 @@ async def get_book_copy(
     db: AsyncSession = Depends(get_db)
 ):
     """Get a specific book copy by ID (librarian only)"""
-    result = await db.execute(select(BookCopy).where(BookCopy.id == copy_id))
-    copy = result.scalar_one_or_none()
+    result = await db.execute(GET_COPY_ROW_BY_ID, {"copy_id": copy_id})
+    copy = result.mappings().one_or_none()
     
     if not copy:
         raise HTTPException(
@@ -78,7 +126,7 @@ async def get_book_copy(
             detail="Book copy not found"
         )
     
-    return BookCopyResponse.model_validate(copy)
+    return BookCopyResponse(**copy)
 
 
 @router.put("/{copy_id}", response_model=BookCopyResponse)
@@ -90,7 +138,7 @@ async def update_book_copy(
 ):
     """Update a book copy (librarian only)"""
     
-    result = await db.execute(select(BookCopy).where(BookCopy.id == copy_id))
+    result = await db.execute(GET_COPY_BY_ID, {"copy_id": copy_id})
     copy = result.scalar_one_or_none()
     
     if not copy:
@@ -105,9 +153,10 @@ async def update_book_copy(
         setattr(copy, field, value)
     
     await db.commit()
+    cache.invalidate("books")
     await db.refresh(copy)
     
-    return BookCopyResponse.model_validate(copy)
+    return _copy_response(copy)
 
 
 @router.delete("/{copy_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -118,7 +167,7 @@ async def delete_book_copy(
 ):
     """Delete a book copy (librarian only)"""
     
-    result = await db.execute(select(BookCopy).where(BookCopy.id == copy_id))
+    result = await db.execute(GET_COPY_BY_ID, {"copy_id": copy_id})
     copy = result.scalar_one_or_none()
     
     if not copy:
@@ -136,6 +185,7 @@ async def delete_book_copy(
     
     await db.delete(copy)
     await db.commit()
+    cache.invalidate("books")
     
     return None
 
@@ -149,21 +199,25 @@ async def borrow_book(
 ):
     """Borrow a book copy"""
     
-    # Get book copy
-    result = await db.execute(select(BookCopy).where(BookCopy.id == copy_id))
-    copy = result.scalar_one_or_none()
-    
-    if not copy:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Book copy not found"
-        )
+    # Claim the copy only if it is still available; concurrent borrowers
+    # cannot both win because the status check happens inside the UPDATE
+    result = await db.execute(
+        update(BookCopy)
+        .where(BookCopy.id == copy_id, BookCopy.status == CopyStatus.AVAILABLE)
+        .values(status=CopyStatus.BORROWED)
+        .returning(BookCopy.id)
+    )
     
-    # Check if copy is available
-    if copy.status != CopyStatus.AVAILABLE:
+    if result.scalar_one_or_none() is None:
+        current_status = await db.scalar(COPY_STATUS, {"copy_id": copy_id})
+        if current_status is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Book copy not found"
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Book copy is not available (current status: {copy.status})"
+            detail=f"Book copy is not available (current status: {current_status})"
         )
     
     # Create borrow record
@@ -174,14 +228,11 @@ async def borrow_book(
         status=BorrowStatus.ACTIVE
     )
     
-    # Update copy status
-    copy.status = CopyStatus.BORROWED
-    
     db.add(borrow_record)
     await db.commit()
-    await db.refresh(borrow_record)
+    cache.invalidate("books")
     
-    return BorrowRecordResponse.model_validate(borrow_record)
+    return _borrow_response(borrow_record)
 
 
 @router.post("/{copy_id}/return", response_model=BorrowRecordResponse)
@@ -192,58 +243,61 @@ async def return_book(
 ):
     """Return a borrowed book copy"""
     
-    # Get book copy
-    result = await db.execute(select(BookCopy).where(BookCopy.id == copy_id))
-    copy = result.scalar_one_or_none()
-    
-    if not copy:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Book copy not found"
-        )
-    
-    # Get active borrow record
+    # Close the user's active borrow record; the return time is set by the database
     result = await db.execute(
-        select(BorrowRecord)
-        .where(BorrowRecord.copy_id == copy_id)
-        .where(BorrowRecord.user_id == current_user.id)
-        .where(BorrowRecord.status == BorrowStatus.ACTIVE)
+        update(BorrowRecord)
+        .where(
+            BorrowRecord.copy_id == copy_id,
+            BorrowRecord.user_id == current_user.id,
+            BorrowRecord.status == BorrowStatus.ACTIVE
+        )
+        .values(returned_at=utcnow(), status=BorrowStatus.RETURNED)
+        .returning(BorrowRecord)
     )
     borrow_record = result.scalar_one_or_none()
     
     if not borrow_record:
+        if not await db.scalar(COPY_EXISTS, {"copy_id": copy_id}):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Book copy not found"
+            )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No active borrow record found for this book copy"
         )
     
-    # Update borrow record
-    borrow_record.returned_at = datetime.utcnow()
-    borrow_record.status = BorrowStatus.RETURNED
-    
     # Update copy status
-    copy.status = CopyStatus.AVAILABLE
-    
-    # Check for pending reservations for this book
-    reservation_result = await db.execute(
-        select(Reservation)
-        .where(Reservation.book_id == copy.book_id)
+    result = await db.execute(
+        update(BookCopy)
+        .where(BookCopy.id == copy_id)
+        .values(status=CopyStatus.AVAILABLE)
+        .returning(BookCopy.book_id)
+    )
+    book_id = result.scalar_one()
+    
+    # Fulfill the oldest non-expired pending reservation for this book in one
+    # statement; SKIP LOCKED (PostgreSQL only) lets concurrent returns of other
+    # copies pick the next reservation instead of waiting on this one
+    next_reservation = (
+        select(Reservation.id)
+        .where(Reservation.book_id == book_id)
         .where(Reservation.status == "PENDING")
+        .where(Reservation.expires_at > utcnow())
         .order_by(Reservation.reserved_at.asc())  # FIFO - first in, first out
         .limit(1)
+        .with_for_update(skip_locked=True)
     )
-    first_reservation = reservation_result.scalar_one_or_none()
-    
-    # If there's a pending reservation, fulfill it
-    if first_reservation:
-        # Check if reservation has not expired
-        if not first_reservation.is_expired:
-            first_reservation.status = "FULFILLED"
-            first_reservation.fulfilled_at = datetime.utcnow()
-            # Note: In a real system, you would send an email/notification here
+    await db.execute(
+        update(Reservation)
+        .where(Reservation.id == next_reservation.scalar_subquery())
+        .values(status="FULFILLED", fulfilled_at=utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    # Note: In a real system, you would send an email/notification here
     
     await db.commit()
-    await db.refresh(borrow_record)
+    cache.invalidate("books")
     
-    return BorrowRecordResponse.model_validate(borrow_record)
+    return _borrow_response(borrow_record)
 
@@ -1,57 +1,231 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_
-from sqlalchemy.orm import selectinload
-from typing import Optional, List
+from sqlalchemy import select, insert, func, or_, exists, literal_column, tuple_
+from sqlalchemy.orm import selectinload, joinedload
+from typing import Optional, List, Tuple
 from uuid import UUID
 from math import ceil
+from contextvars import ContextVar
+import hashlib
+import os
+import uuid
 
 from app.database import get_db
 from app.models.book import Book, Author, Genre, Keyword
-from app.models.book_copy import BookCopy
+from app.models.book_copy import BookCopy, CopyStatus
 from app.models.user import User
 from app.schemas.book import (
     BookCreate,
     BookUpdate,
     BookResponse,
     BookListResponse,
-    BookStats,
-    LocationSchema
+    BookStats
 )
 from app.schemas.book_copy import BookCopyResponse
+from app.utils.cache import cache
+from app.utils.upsert import insert_on_conflict
+from app.utils.cursor import encode_cursor, decode_cursor
 from app.dependencies import get_current_user, require_librarian
 
 router = APIRouter(prefix="/books", tags=["Books"])
 
+# Eager-load options for building BookResponse: one batched IN-query per
+# relationship instead of lazy loads (which fail under AsyncSession)
+BOOK_EAGER = (
+    selectinload(Book.authors),
+    selectinload(Book.genres),
+    selectinload(Book.keywords),
+)
+
+# Single-book variant: the parent is one row, so joining the (small)
+# taxonomies into the same SELECT beats one extra round trip per relationship
+BOOK_DETAIL_EAGER = (
+    joinedload(Book.authors),
+    joinedload(Book.genres),
+    joinedload(Book.keywords),
+)
+
+
+def book_search_filter(db: AsyncSession, term: str):
+    """
+    Build the WHERE clause for free-text book search.
+
+    On PostgreSQL the GIN-indexed ``books.search_tsv`` column (title,
+    description, ISBN) is matched with websearch_to_tsquery. Terms containing
+    LIKE wildcards, and other dialects, use substring ILIKE matching.
+    """
+    if db.get_bind().dialect.name == "postgresql" and not any(c in term for c in "%_"):
+        return literal_column("books.search_tsv").op("@@")(
+            func.websearch_to_tsquery("simple", term)
+        )
+    
+    search_pattern = f"%{term}%"
+    return or_(
+        Book.title.ilike(search_pattern),
+        Book.description.ilike(search_pattern),
+        Book.isbn.ilike(search_pattern)
+    )
+
+
+# Per-request memo of resolved taxonomy rows, keyed by (model, name).
+# None outside requests that opted in through taxonomy_cache_scope.
+_taxonomy_cache: ContextVar[Optional[dict]] = ContextVar("taxonomy_cache", default=None)
+
+
+async def taxonomy_cache_scope() -> None:
+    """Dependency giving the current request its own taxonomy memo"""
+    _taxonomy_cache.set({})
+
+
+async def _get_or_create_by_name(db: AsyncSession, model, names: List[str]) -> list:
+    """
+    Resolve names to rows of a name-keyed taxonomy table in bulk.
+
+    Names already resolved in this request are served from the request's
+    taxonomy memo. The rest are fetched with one IN query and the missing
+    ones are inserted in one INSERT ... ON CONFLICT DO NOTHING RETURNING
+    statement. Duplicate names are collapsed; rows are returned in input order.
+    """
+    unique_names = list(dict.fromkeys(names))
+    if not unique_names:
+        return []
+
+    memo = _taxonomy_cache.get()
+    by_name = {}
+    if memo is not None:
+        by_name = {name: memo[model, name] for name in unique_names if (model, name) in memo}
+
+    lookup = [name for name in unique_names if name not in by_name]
+    if lookup:
+        result = await db.execute(select(model).where(model.name.in_(lookup)))
+        by_name.update({obj.name: obj for obj in result.scalars()})
+
+    missing = [name for name in lookup if name not in by_name]
+    if missing:
+        result = await db.execute(
+            insert_on_conflict(db, model)
+            .values([{"name": name} for name in missing])
+            .on_conflict_do_nothing(index_elements=["name"])
+            .returning(model)
+        )
+        by_name.update({obj.name: obj for obj in result.scalars()})
+
+        # Rows created by a concurrent request in between were skipped above
+        raced = [name for name in missing if name not in by_name]
+        if raced:
+            result = await db.execute(select(model).where(model.name.in_(raced)))
+            by_name.update({obj.name: obj for obj in result.scalars()})
+
+    if memo is not None:
+        memo.update({(model, name): obj for name, obj in by_name.items()})
+
+    return [by_name[name] for name in unique_names]
+
 
-async def get_or_create_author(db: AsyncSession, name: str) -> Author:
-    """Get existing author or create new one"""
-    result = await db.execute(select(Author).where(Author.name == name))
-    author = result.scalar_one_or_none()
-    if not author:
-        author = Author(name=name)
-        db.add(author)
-    return author
+def _batch_uuid4(count: int) -> List[uuid.UUID]:
+    """Random (version 4) UUIDs drawn from a single os.urandom call"""
+    raw = os.urandom(16 * count)
+    return [uuid.UUID(bytes=raw[i * 16:(i + 1) * 16], version=4) for i in range(count)]
 
 
-async def get_or_create_genre(db: AsyncSession, name: str) -> Genre:
-    """Get existing genre or create new one"""
-    result = await db.execute(select(Genre).where(Genre.name == name))
-    genre = result.scalar_one_or_none()
-    if not genre:
-        genre = Genre(name=name)
-        db.add(genre)
-    return genre
+def initial_copy_rows(book: Book, count: int) -> List[dict]:
+    """
+    Build BookCopy rows for a new book's initial copies.
+
+    Barcodes are ISBN-SEQ, or LIB-<book id prefix>-SEQ-<random suffix> when
+    the book has no ISBN. Copy ids are pre-generated in one batch, and the
+    rows are meant for one bulk INSERT.
+    """
+    ids = _batch_uuid4(count + 1)
+    
+    if book.isbn:
+        barcodes = [f"{book.isbn}-{i + 1}" for i in range(count)]
+    else:
+        prefix = book.id.hex[:4].upper()
+        suffix = ids[count].hex[:4].upper()
+        barcodes = [f"LIB-{prefix}-{i + 1}-{suffix}" for i in range(count)]
+    
+    return [
+        {"id": copy_id, "book_id": book.id, "barcode": barcode, "status": CopyStatus.AVAILABLE}
+        for copy_id, barcode in zip(ids, barcodes)
+    ]
+
+
+async def get_or_create_authors(db: AsyncSession, names: List[str]) -> List[Author]:
+    """Get existing authors or create missing ones"""
+    return await _get_or_create_by_name(db, Author, names)
+
+
+async def get_or_create_genres(db: AsyncSession, names: List[str]) -> List[Genre]:
+    """Get existing genres or create missing ones"""
+    return await _get_or_create_by_name(db, Genre, names)
+
+
+async def get_or_create_keywords(db: AsyncSession, names: List[str]) -> List[Keyword]:
+    """Get existing keywords or create missing ones"""
+    return await _get_or_create_by_name(db, Keyword, names)
+
+
+async def _replace_by_name(db: AsyncSession, model, current: list, names: List[str]) -> list:
+    """
+    Resolve the new contents of a book's taxonomy collection.
 
+    Rows already attached to the book are reused, so only names new to the
+    book are looked up. Assigning the result lets the ORM write just the
+    association rows that were added or removed.
+    """
+    unique_names = list(dict.fromkeys(names))
+    by_name = {obj.name: obj for obj in current if obj.name in unique_names}
+
+    missing = [name for name in unique_names if name not in by_name]
+    if missing:
+        by_name.update(zip(missing, await _get_or_create_by_name(db, model, missing)))
+
+    return [by_name[name] for name in unique_names]
+
+
+async def _set_authors(db: AsyncSession, book: Book, names: List[str]) -> None:
+    book.authors = await _replace_by_name(db, Author, book.authors, names)
+
+
+async def _set_genres(db: AsyncSession, book: Book, names: List[str]) -> None:
+    book.genres = await _replace_by_name(db, Genre, book.genres, names)
 
-async def get_or_create_keyword(db: AsyncSession, name: str) -> Keyword:
-    """Get existing keyword or create new one"""
-    result = await db.execute(select(Keyword).where(Keyword.name == name))
-    keyword = result.scalar_one_or_none()
-    if not keyword:
-        keyword = Keyword(name=name)
-        db.add(keyword)
-    return keyword
+
+async def _set_keywords(db: AsyncSession, book: Book, names: List[str]) -> None:
+    book.keywords = await _replace_by_name(db, Keyword, book.keywords, names)
+
+
+async def _set_location(db: AsyncSession, book: Book, location: dict) -> None:
+    book.floor = location["floor"]
+    book.shelf = location["shelf"]
+    book.row = location["row"]
+
+
+# Fields needing more than setattr; a None value leaves them unchanged
+_UPDATE_HANDLERS = {
+    "authors": _set_authors,
+    "genres": _set_genres,
+    "keywords": _set_keywords,
+    "location": _set_location,
+}
+
+# Plain column fields a book update may set directly
+_SCALAR_FIELDS = frozenset({
+    "title", "description", "isbn", "publisher", "publication_year",
+    "pages", "deposit_fee", "cover_url", "floor", "shelf", "row",
+})
+
+
+async def apply_book_update(db: AsyncSession, book: Book, update_data: dict) -> None:
+    """Apply a partial update (field name -> new value) to a book"""
+    for field, value in update_data.items():
+        handler = _UPDATE_HANDLERS.get(field)
+        if handler:
+            if value is not None:
+                await handler(db, book, value)
+        elif field in _SCALAR_FIELDS:
+            setattr(book, field, value)
 
 
 @router.get("/", response_model=BookListResponse)
@@ -64,6 +238,7 @@ async def get_books(
     only_available: Optional[bool] = None,
     min_rating: Optional[float] = Query(None, ge=0, le=5),
     sort: Optional[str] = Query(None, description="Sort by: rating_desc, created_at_desc, title_asc"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor (next_cursor of the previous page)"),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -71,6 +246,8 @@ async def get_books(
     
     - **page**: Page number (starts from 1)
     - **page_size**: Number of items per page
+    - **cursor**: Continue after the page that returned this next_cursor
+      (newest-first sort only; takes precedence over page)
     - **search**: Search in title, description, ISBN
     - **genre**: Filter by genre name
     - **author**: Filter by author name
@@ -78,102 +255,101 @@ async def get_books(
     - **min_rating**: Filter to show only books with rating >= this value
     - **sort**: Sort order (rating_desc, created_at_desc, title_asc)
     """
-    # Base query
-    query = select(Book).options(
-        selectinload(Book.authors),
-        selectinload(Book.genres),
-        selectinload(Book.keywords),
-        selectinload(Book.copies)
-    )
+    cache_key = ("list", page, page_size, search, genre, author, only_available, min_rating, sort, cursor)
+    cached = cache.get("books", cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
+    # Build filters once; relationship filters are EXISTS semi-joins so
+    # neither the count nor the page query needs joins or DISTINCT
+    filters = []
     
-    # Apply filters
     if search:
-        search_filter = or_(
-            Book.title.ilike(f"%{search}%"),
-            Book.description.ilike(f"%{search}%"),
-            Book.isbn.ilike(f"%{search}%")
-        )
-        query = query.where(search_filter)
+        filters.append(book_search_filter(db, search))
     
     if genre:
-        query = query.join(Book.genres).where(Genre.name == genre)
+        filters.append(Book.genres.any(Genre.name == genre))
     
     if author:
-        query = query.join(Book.authors).where(Author.name == author)
+        filters.append(Book.authors.any(Author.name == author))
     
     if only_available:
         # Filter books that have at least one available copy
-        from app.models.book_copy import CopyStatus
-        query = query.join(Book.copies).where(BookCopy.status == CopyStatus.AVAILABLE).distinct()
+        filters.append(Book.available_copies > 0)
     
     if min_rating is not None:
-        query = query.where(Book.average_rating >= min_rating)
+        filters.append(Book.average_rating >= min_rating)
+    
+    # Base query; copy counts come from the denormalized columns, so copies
+    # are not loaded (populate_existing refreshes counters of cached rows).
+    # COUNT(*) OVER() carries the filtered total on every page row.
+    query = (
+        select(Book, func.count().over().label("total"))
+        .options(*BOOK_EAGER)
+        .where(*filters)
+        .execution_options(populate_existing=True)
+    )
     
     # Apply sorting
+    keyset = sort in (None, "created_at_desc")
+    seek = bool(cursor) and keyset
     if sort == "rating_desc":
         query = query.order_by(Book.average_rating.desc().nullslast())
-    elif sort == "created_at_desc":
-        query = query.order_by(Book.created_at.desc())
     elif sort == "title_asc":
         query = query.order_by(Book.title.asc())
     else:
-        # Default sort by created_at desc
-        query = query.order_by(Book.created_at.desc())
+        # Default sort by created_at desc (id breaks ties for keyset paging)
+        query = query.order_by(Book.created_at.desc(), Book.id.desc())
     
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
-    
-    # Apply pagination
-    offset = (page - 1) * page_size
-    query = query.offset(offset).limit(page_size)
+    # Apply pagination: seek past the cursor, or fall back to OFFSET
+    if seek:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        query = query.where(tuple_(Book.created_at, Book.id) < tuple_(cursor_created_at, cursor_id))
+    else:
+        query = query.offset((page - 1) * page_size)
+    query = query.limit(page_size + 1)
     
     # Execute query
     result = await db.execute(query)
-    books = result.scalars().all()
-    
-    # Convert to response format
-    book_responses = []
-    for book in books:
-        book_responses.append(BookResponse.model_validate({
-            **{k: getattr(book, k) for k in ['id', 'title', 'description', 'isbn', 'publisher', 'publication_year', 'pages', 'deposit_fee', 'cover_url', 'created_at', 'updated_at', 'average_rating', 'total_reviews']},
-            'authors': book.authors,
-            'genres': book.genres,
-            'keywords': book.keywords,
-            'total_copies': len(book.copies),
-            'available_copies': sum(1 for c in book.copies if c.status == 'AVAILABLE'),
-            'location': LocationSchema(
-                floor=book.floor or '',
-                shelf=book.shelf or '',
-                row=book.row or ''
-            )
-        }))
+    rows = result.all()
     
-    return BookListResponse(
-        items=book_responses,
+    if rows and not seek:
+        total = rows[0].total
+    else:
+        # Past the last page, or the window only saw rows after the cursor
+        total = await db.scalar(select(func.count(Book.id)).where(*filters))
+    
+    # The extra row only tells whether another page follows
+    has_more = len(rows) > page_size
+    books = [row.Book for row in rows[:page_size]]
+    next_cursor = encode_cursor(books[-1]) if keyset and has_more else None
+    
+    body = BookListResponse(
+        items=[BookResponse.model_validate(book) for book in books],
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=ceil(total / page_size) if total > 0 else 0
-    )
+        total_pages=ceil(total / page_size) if total > 0 else 0,
+        next_cursor=next_cursor
+    ).model_dump_json()
+    cache.set("books", cache_key, body)
+    
+    return Response(content=body, media_type="application/json")
 
 
-@router.get("/{book_id}", response_model=BookResponse)
-async def get_book(
-    book_id: UUID,
-    db: AsyncSession = Depends(get_db)
-):
-    """Get a specific book by ID"""
-    query = select(Book).options(
-        selectinload(Book.authors),
-        selectinload(Book.genres),
-        selectinload(Book.keywords),
-        selectinload(Book.copies)
-    ).where(Book.id == book_id)
+async def _load_book_detail(db: AsyncSession, book_id: UUID) -> Tuple[str, str]:
+    """Serialized BookResponse for a book and its ETag"""
+    # Copy counts come from the denormalized columns (populate_existing
+    # refreshes them if the row is already in the session)
+    query = (
+        select(Book)
+        .options(*BOOK_DETAIL_EAGER)
+        .where(Book.id == book_id)
+        .execution_options(populate_existing=True)
+    )
     
     result = await db.execute(query)
-    book = result.scalar_one_or_none()
+    book = result.unique().scalar_one_or_none()
     
     if not book:
         raise HTTPException(
@@ -181,22 +357,37 @@ async def get_book(
             detail="Book not found"
         )
     
-    return BookResponse.model_validate({
-        **{k: getattr(book, k) for k in ['id', 'title', 'description', 'isbn', 'publisher', 'publication_year', 'pages', 'deposit_fee', 'cover_url', 'created_at', 'updated_at', 'average_rating', 'total_reviews']},
-        'authors': book.authors,
-        'genres': book.genres,
-        'keywords': book.keywords,
-        'total_copies': len(book.copies),
-        'available_copies': sum(1 for c in book.copies if c.status == 'AVAILABLE'),
-        'location': LocationSchema(
-            floor=book.floor or '',
-            shelf=book.shelf or '',
-            row=book.row or ''
-        )
-    })
+    body = BookResponse.model_validate(book).model_dump_json()
+    etag = f'"{hashlib.sha256(body.encode()).hexdigest()}"'
+    
+    return body, etag
 
 
-@router.post("/", response_model=BookResponse, status_code=status.HTTP_201_CREATED)
+@router.get("/{book_id}", response_model=BookResponse)
+async def get_book(
+    book_id: UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get a specific book by ID (supports If-None-Match revalidation)"""
+    cached = cache.get("books", ("item", book_id))
+    if cached is None:
+        cached = await _load_book_detail(db, book_id)
+        cache.set("books", ("item", book_id), cached, ttl=300)
+    
+    body, etag = cached
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+@router.post(
+    "/",
+    response_model=BookResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(taxonomy_cache_scope)]
+)
 async def create_book(
     book_data: BookCreate,
     current_user: User = Depends(require_librarian),
@@ -206,8 +397,7 @@ async def create_book(
     
     # Check if ISBN already exists
     if book_data.isbn:
-        result = await db.execute(select(Book).where(Book.isbn == book_data.isbn))
-        if result.scalar_one_or_none():
+        if await db.scalar(select(exists().where(Book.isbn == book_data.isbn))):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Book with this ISBN already exists"
@@ -229,64 +419,30 @@ async def create_book(
         created_by=current_user.id
     )
     
-    # Add authors
-    for author_name in book_data.authors:
-        author = await get_or_create_author(db, author_name)
-        new_book.authors.append(author)
+    # Add authors, genres and keywords
+    new_book.authors.extend(await get_or_create_authors(db, book_data.authors))
+    new_book.genres.extend(await get_or_create_genres(db, book_data.genres))
+    new_book.keywords.extend(await get_or_create_keywords(db, book_data.keywords))
     
-    # Add genres
-    for genre_name in book_data.genres:
-        genre = await get_or_create_genre(db, genre_name)
-        new_book.genres.append(genre)
+    db.add(new_book)
     
-    # Add keywords
-    # Add keywords
-    for keyword_name in book_data.keywords:
-        keyword = await get_or_create_keyword(db, keyword_name)
-        new_book.keywords.append(keyword)
+    # Create initial copies if requested, in the same transaction
+    if book_data.initial_copies and book_data.initial_copies > 0:
+        await db.flush()  # insert the book row and assign its id first
+        await db.execute(insert(BookCopy), initial_copy_rows(new_book, book_data.initial_copies))
     
-    db.add(new_book)
     await db.commit()
-    await db.refresh(new_book, ['authors', 'genres', 'keywords'])
-
-    # Create initial copies if requested
-    if book_data.initial_copies and book_data.initial_copies > 0:
-        from app.models.book_copy import BookCopy, CopyStatus
-        import uuid
-
-        for i in range(book_data.initial_copies):
-            # Generate a unique barcode
-            # Format: ISBN-SEQ or BOOKID-SEQ or UUID
-            barcode = f"{new_book.isbn}-{i+1}" if new_book.isbn else f"LIB-{str(uuid.uuid4())[:8].upper()}-{i+1}"
-            
-            # Ensure barcode is unique (simple check, might need more robust handling in production)
-            # For now, using UUID part to ensure uniqueness if ISBN is missing or duplicated logic
-            if not new_book.isbn:
-                 barcode = f"LIB-{new_book.id.hex[:4].upper()}-{i+1}-{str(uuid.uuid4())[:4].upper()}"
-
-            new_copy = BookCopy(
-                book_id=new_book.id,
-                barcode=barcode,
-                status=CopyStatus.AVAILABLE
-            )
-            db.add(new_copy)
-        
-        await db.commit()
-    
-    return BookResponse.model_validate({
-        **{k: getattr(new_book, k) for k in ['id', 'title', 'description', 'isbn', 'publisher', 'publication_year', 'pages', 'deposit_fee', 'cover_url', 'created_at', 'updated_at', 'average_rating', 'total_reviews']},
-        'authors': new_book.authors,
-        'genres': new_book.genres,
-        'keywords': new_book.keywords,
-        'location': LocationSchema(
-            floor=new_book.floor or '',
-            shelf=new_book.shelf or '',
-            row=new_book.row or ''
-        )
-    })
+    cache.invalidate("authors", "books")
+    await db.refresh(new_book, ['authors', 'genres', 'keywords', 'total_copies', 'available_copies'])
+    
+    return BookResponse.model_validate(new_book)
 
 
-@router.put("/{book_id}", response_model=BookResponse)
+@router.put(
+    "/{book_id}",
+    response_model=BookResponse,
+    dependencies=[Depends(taxonomy_cache_scope)]
+)
 async def update_book(
     book_id: UUID,
     book_data: BookUpdate,
@@ -296,11 +452,7 @@ async def update_book(
     """Update a book (librarian only)"""
     
     # Get book
-    query = select(Book).options(
-        selectinload(Book.authors),
-        selectinload(Book.genres),
-        selectinload(Book.keywords)
-    ).where(Book.id == book_id)
+    query = select(Book).options(*BOOK_EAGER).where(Book.id == book_id)
     
     result = await db.execute(query)
     book = result.scalar_one_or_none()
@@ -312,45 +464,13 @@ async def update_book(
         )
     
     # Update fields
-    update_data = book_data.model_dump(exclude_unset=True)
-    
-    for field, value in update_data.items():
-        if field == 'authors' and value is not None:
-            book.authors.clear()
-            for author_name in value:
-                author = await get_or_create_author(db, author_name)
-                book.authors.append(author)
-        elif field == 'genres' and value is not None:
-            book.genres.clear()
-            for genre_name in value:
-                genre = await get_or_create_genre(db, genre_name)
-                book.genres.append(genre)
-        elif field == 'keywords' and value is not None:
-            book.keywords.clear()
-            for keyword_name in value:
-                keyword = await get_or_create_keyword(db, keyword_name)
-                book.keywords.append(keyword)
-        elif field == 'location' and value is not None:
-            book.floor = value.floor
-            book.shelf = value.shelf
-            book.row = value.row
-        elif field not in ['authors', 'genres', 'keywords', 'location']:
-            setattr(book, field, value)
+    await apply_book_update(db, book, book_data.model_dump(exclude_unset=True))
     
     await db.commit()
+    cache.invalidate("authors", "books")
     await db.refresh(book, ['authors', 'genres', 'keywords'])
     
-    return BookResponse.model_validate({
-        **{k: getattr(book, k) for k in ['id', 'title', 'description', 'isbn', 'publisher', 'publication_year', 'pages', 'deposit_fee', 'cover_url', 'created_at', 'updated_at', 'average_rating', 'total_reviews']},
-        'authors': book.authors,
-        'genres': book.genres,
-        'keywords': book.keywords,
-        'location': LocationSchema(
-            floor=book.floor or '',
-            shelf=book.shelf or '',
-            row=book.row or ''
-        )
-    })
+    return BookResponse.model_validate(book)
 
 
 @router.delete("/{book_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -372,6 +492,7 @@ async def delete_book(
     
     await db.delete(book)
     await db.commit()
+    cache.invalidate("authors", "books")
     
     return None
 
@@ -384,25 +505,24 @@ async def get_book_stats(
     """Get statistics for a specific book"""
     
     # Check if book exists
-    result = await db.execute(select(Book).where(Book.id == book_id))
-    book = result.scalar_one_or_none()
-    
-    if not book:
+    if not await db.scalar(select(exists().where(Book.id == book_id))):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Book not found"
         )
     
-    # Get copy statistics
-    copies_query = select(BookCopy).where(BookCopy.book_id == book_id)
-    copies_result = await db.execute(copies_query)
-    copies = copies_result.scalars().all()
+    # Get copy statistics, one row per status
+    counts = dict((await db.execute(
+        select(BookCopy.status, func.count())
+        .where(BookCopy.book_id == book_id)
+        .group_by(BookCopy.status)
+    )).all())
     
     stats = {
-        'total_copies': len(copies),
-        'available': sum(1 for c in copies if c.status == 'AVAILABLE'),
-        'borrowed': sum(1 for c in copies if c.status == 'BORROWED'),
-        'lost': sum(1 for c in copies if c.status == 'LOST')
+        'total_copies': sum(counts.values()),
+        'available': counts.get(CopyStatus.AVAILABLE, 0),
+        'borrowed': counts.get(CopyStatus.BORROWED, 0),
+        'lost': counts.get(CopyStatus.LOST, 0)
     }
 
     return BookStats(**stats)
@@ -416,18 +536,23 @@ async def get_book_copies(
     """Get all copies for a specific book"""
 
     # Check if book exists
-    result = await db.execute(select(Book).where(Book.id == book_id))
-    book = result.scalar_one_or_none()
+    book_exists = await db.scalar(select(exists().where(Book.id == book_id)))
 
-    if not book:
+    if not book_exists:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Book not found"
         )
 
-    # Get all copies
-    copies_query = select(BookCopy).where(BookCopy.book_id == book_id)
+    # Get all copies (only the columns the response needs)
+    copies_query = select(
+        BookCopy.id,
+        BookCopy.book_id,
+        BookCopy.barcode,
+        BookCopy.status,
+        BookCopy.created_at,
+        BookCopy.updated_at
+    ).where(BookCopy.book_id == book_id)
     copies_result = await db.execute(copies_query)
-    copies = copies_result.scalars().all()
 
-    return [BookCopyResponse.model_validate(copy) for copy in copies]
+    return [BookCopyResponse(**copy) for copy in copies_result.mappings()]
@@ -1,23 +1,51 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, insert, exists
+from pydantic import TypeAdapter, ValidationError
 from typing import Optional, List
 from uuid import UUID
-import json
 
 from app.database import get_db
 from app.models.book import Book
+from app.models.book_copy import BookCopy
 from app.models.user import User
-from app.schemas.book import BookResponse, LocationSchema
+from app.schemas.book import BookResponse
 from app.dependencies import require_librarian
+from app.utils.cache import cache
 from app.utils.file_handler import save_upload_file, validate_image_file
-from app.api.v1.books import get_or_create_author, get_or_create_genre, get_or_create_keyword
+from app.api.v1.books import (
+    BOOK_EAGER,
+    initial_copy_rows,
+    apply_book_update,
+    get_or_create_authors,
+    get_or_create_genres,
+    get_or_create_keywords,
+    taxonomy_cache_scope
+)
 
 router = APIRouter(prefix="/books-with-upload", tags=["Books with Upload"])
 
+# Parses and type-checks a JSON array of names in one pydantic-core pass
+_NAME_LIST = TypeAdapter(List[str])
 
-@router.post("/", response_model=BookResponse, status_code=status.HTTP_201_CREATED)
+
+def _parse_name_list(raw: str, field: str) -> List[str]:
+    """Decode a form field holding a JSON array of names"""
+    try:
+        return _NAME_LIST.validate_json(raw)
+    except ValidationError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{field} must be a JSON array of strings"
+        )
+
+
+@router.post(
+    "/",
+    response_model=BookResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(taxonomy_cache_scope)]
+)
 async def create_book_with_cover(
     # Book data as form fields
     title: str = Form(...),
@@ -47,24 +75,18 @@ async def create_book_with_cover(
     """
     
     # Parse JSON arrays
-    try:
-        authors_list = json.loads(authors)
-        genres_list = json.loads(genres)
-        keywords_list = json.loads(keywords)
-    except json.JSONDecodeError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="authors, genres, and keywords must be valid JSON arrays"
-        )
+    authors_list = _parse_name_list(authors, "authors")
+    genres_list = _parse_name_list(genres, "genres")
+    keywords_list = _parse_name_list(keywords, "keywords")
     
     # Validate arrays
-    if not isinstance(authors_list, list) or not authors_list:
+    if not authors_list:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="authors must be a non-empty array"
         )
     
-    if not isinstance(genres_list, list) or not genres_list:
+    if not genres_list:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="genres must be a non-empty array"
@@ -72,8 +94,7 @@ async def create_book_with_cover(
     
     # Check if ISBN already exists
     if isbn:
-        result = await db.execute(select(Book).where(Book.isbn == isbn))
-        if result.scalar_one_or_none():
+        if await db.scalar(select(exists().where(Book.isbn == isbn))):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Book with this ISBN already exists"
@@ -109,76 +130,41 @@ async def create_book_with_cover(
         created_by=current_user.id
     )
     
-    # Add authors
-    for author_name in authors_list:
-        author = await get_or_create_author(db, author_name)
-        new_book.authors.append(author)
-    
-    # Add genres
-    for genre_name in genres_list:
-        genre = await get_or_create_genre(db, genre_name)
-        new_book.genres.append(genre)
-    
-    # Add keywords
-    for keyword_name in keywords_list:
-        keyword = await get_or_create_keyword(db, keyword_name)
-        new_book.keywords.append(keyword)
+    # Add authors, genres and keywords
+    new_book.authors.extend(await get_or_create_authors(db, authors_list))
+    new_book.genres.extend(await get_or_create_genres(db, genres_list))
+    new_book.keywords.extend(await get_or_create_keywords(db, keywords_list))
     
     db.add(new_book)
-    await db.commit()
-    await db.refresh(new_book, ['authors', 'genres', 'keywords'])
 
-    # Create initial copies if requested
+    # Create initial copies if requested, in the same transaction
     if initial_copies and initial_copies > 0:
-        from app.models.book_copy import BookCopy, CopyStatus
-        import uuid
-
-        for i in range(initial_copies):
-            # Generate a unique barcode
-            # Format: ISBN-SEQ or BOOKID-SEQ or UUID
-            barcode = f"{new_book.isbn}-{i+1}" if new_book.isbn else f"LIB-{str(uuid.uuid4())[:8].upper()}-{i+1}"
-
-            # Ensure barcode is unique (simple check, might need more robust handling in production)
-            if not new_book.isbn:
-                 barcode = f"LIB-{new_book.id.hex[:4].upper()}-{i+1}-{str(uuid.uuid4())[:4].upper()}"
+        await db.flush()  # insert the book row and assign its id first
+        await db.execute(insert(BookCopy), initial_copy_rows(new_book, initial_copies))
 
-            new_copy = BookCopy(
-                book_id=new_book.id,
-                barcode=barcode,
-                status=CopyStatus.AVAILABLE
-            )
-            db.add(new_copy)
-
-        await db.commit()
-        await db.refresh(new_book, ['copies'])
+    await db.commit()
+    cache.invalidate("authors", "books")
 
     # Reload the book with all relationships to avoid lazy loading issues
-    query = select(Book).options(
-        selectinload(Book.authors),
-        selectinload(Book.genres),
-        selectinload(Book.keywords),
-        selectinload(Book.copies)
-    ).where(Book.id == new_book.id)
+    # (populate_existing picks up the trigger-maintained copy counters)
+    query = (
+        select(Book)
+        .options(*BOOK_EAGER)
+        .where(Book.id == new_book.id)
+        .execution_options(populate_existing=True)
+    )
 
     result = await db.execute(query)
     new_book = result.scalar_one()
 
-    return BookResponse.model_validate({
-        **{k: getattr(new_book, k) for k in ['id', 'title', 'description', 'isbn', 'publisher', 'publication_year', 'pages', 'deposit_fee', 'cover_url', 'created_at', 'updated_at']},
-        'authors': new_book.authors,
-        'genres': new_book.genres,
-        'keywords': new_book.keywords,
-        'total_copies': len(new_book.copies),
-        'available_copies': sum(1 for c in new_book.copies if c.status == 'AVAILABLE'),
-        'location': LocationSchema(
-            floor=new_book.floor or '',
-            shelf=new_book.shelf or '',
-            row=new_book.row or ''
-        )
-    })
+    return BookResponse.model_validate(new_book)
 
 
-@router.put("/{book_id}", response_model=BookResponse)
+@router.put(
+    "/{book_id}",
+    response_model=BookResponse,
+    dependencies=[Depends(taxonomy_cache_scope)]
+)
 async def update_book_with_cover(
     book_id: UUID,
     # Book data as form fields
@@ -208,12 +194,7 @@ async def update_book_with_cover(
     """
     
     # Get book
-    query = select(Book).options(
-        selectinload(Book.authors),
-        selectinload(Book.genres),
-        selectinload(Book.keywords),
-        selectinload(Book.copies)
-    ).where(Book.id == book_id)
+    query = select(Book).options(*BOOK_EAGER).where(Book.id == book_id)
     
     result = await db.execute(query)
     book = result.scalar_one_or_none()
@@ -225,30 +206,9 @@ async def update_book_with_cover(
         )
 
     # Parse JSON arrays if provided
-    authors_list = None
-    genres_list = None
-    keywords_list = None
-
-    try:
-        if authors is not None:
-            authors_list = json.loads(authors)
-            if not isinstance(authors_list, list):
-                raise HTTPException(status_code=400, detail="authors must be a list")
-                
-        if genres is not None:
-            genres_list = json.loads(genres)
-            if not isinstance(genres_list, list):
-                raise HTTPException(status_code=400, detail="genres must be a list")
-                
-        if keywords is not None:
-            keywords_list = json.loads(keywords)
-            if not isinstance(keywords_list, list):
-                raise HTTPException(status_code=400, detail="keywords must be a list")
-    except json.JSONDecodeError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="authors, genres, and keywords must be valid JSON arrays"
-        )
+    authors_list = _parse_name_list(authors, "authors") if authors is not None else None
+    genres_list = _parse_name_list(genres, "genres") if genres is not None else None
+    keywords_list = _parse_name_list(keywords, "keywords") if keywords is not None else None
     
     # Handle cover upload if provided
     if cover:
@@ -268,50 +228,28 @@ async def update_book_with_cover(
                 detail=f"Failed to upload cover: {str(e)}"
             )
     
-    # Update fields
-    if title is not None: book.title = title
-    if description is not None: book.description = description
-    if isbn is not None: book.isbn = isbn
-    if publisher is not None: book.publisher = publisher
-    if publication_year is not None: book.publication_year = publication_year
-    if pages is not None: book.pages = pages
-    if deposit_fee is not None: book.deposit_fee = deposit_fee
-    if floor is not None: book.floor = floor
-    if shelf is not None: book.shelf = shelf
-    if row is not None: book.row = row
-    
-    # Update relationships
-    if authors_list is not None:
-        book.authors.clear()
-        for author_name in authors_list:
-            author = await get_or_create_author(db, author_name)
-            book.authors.append(author)
-            
-    if genres_list is not None:
-        book.genres.clear()
-        for genre_name in genres_list:
-            genre = await get_or_create_genre(db, genre_name)
-            book.genres.append(genre)
-            
-    if keywords_list is not None:
-        book.keywords.clear()
-        for keyword_name in keywords_list:
-            keyword = await get_or_create_keyword(db, keyword_name)
-            book.keywords.append(keyword)
+    # Update fields and relationships (form fields left empty are unchanged)
+    update_data = {
+        "title": title,
+        "description": description,
+        "isbn": isbn,
+        "publisher": publisher,
+        "publication_year": publication_year,
+        "pages": pages,
+        "deposit_fee": deposit_fee,
+        "floor": floor,
+        "shelf": shelf,
+        "row": row,
+        "authors": authors_list,
+        "genres": genres_list,
+        "keywords": keywords_list,
+    }
+    await apply_book_update(
+        db, book, {field: value for field, value in update_data.items() if value is not None}
+    )
     
     await db.commit()
-    await db.refresh(book, ['authors', 'genres', 'keywords', 'copies'])
+    cache.invalidate("authors", "books")
+    await db.refresh(book, ['authors', 'genres', 'keywords'])
     
-    return BookResponse.model_validate({
-        **{k: getattr(book, k) for k in ['id', 'title', 'description', 'isbn', 'publisher', 'publication_year', 'pages', 'deposit_fee', 'cover_url', 'created_at', 'updated_at']},
-        'authors': book.authors,
-        'genres': book.genres,
-        'keywords': book.keywords,
-        'total_copies': len(book.copies),
-        'available_copies': sum(1 for c in book.copies if c.status == 'AVAILABLE'),
-        'location': LocationSchema(
-            floor=book.floor or '',
-            shelf=book.shelf or '',
-            row=book.row or ''
-        )
-    })
+    return BookResponse.model_validate(book)
@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, desc
+from sqlalchemy import select, desc, tuple_
 from sqlalchemy.orm import selectinload
 from typing import List, Optional
 from uuid import UUID
@@ -9,8 +9,10 @@ from datetime import datetime
 from app.database import get_db
 from app.models.user import User
 from app.models.book_copy import BorrowRecord, BorrowStatus, BookCopy
-from app.models.book import Book
+from app.models.book import Book, Author, book_authors
 from app.dependencies import get_current_user, require_librarian
+from app.utils.cache import cache
+from app.utils.cursor import encode_cursor, decode_cursor
 from app.schemas.book import BookResponse, LocationSchema
 from pydantic import BaseModel
 
@@ -33,6 +35,62 @@ class BorrowRecordResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+# Flat projection of the columns BorrowRecordResponse needs (no ORM objects)
+BORROW_ROW = (
+    select(
+        BorrowRecord.id,
+        BorrowRecord.created_at,
+        BorrowRecord.borrowed_at,
+        BorrowRecord.due_date,
+        BorrowRecord.returned_at,
+        BorrowRecord.status,
+        BookCopy.barcode,
+        BookCopy.book_id,
+        Book.title,
+        Book.cover_url,
+        Book.deposit_fee,
+        User.full_name,
+        User.email,
+    )
+    .join(BookCopy, BookCopy.id == BorrowRecord.copy_id)
+    .join(Book, Book.id == BookCopy.book_id)
+    .join(User, User.id == BorrowRecord.user_id)
+)
+
+
+async def _borrow_responses(db: AsyncSession, rows, with_user: bool) -> List[BorrowRecordResponse]:
+    """Build responses from BORROW_ROW rows, fetching author names in one query"""
+    authors = {}
+    book_ids = {row.book_id for row in rows}
+    if book_ids:
+        author_rows = await db.execute(
+            select(book_authors.c.book_id, Author.name)
+            .join(Author, Author.id == book_authors.c.author_id)
+            .where(book_authors.c.book_id.in_(book_ids))
+        )
+        for book_id, name in author_rows:
+            authors.setdefault(book_id, []).append(name)
+
+    # Rows are trusted database values: construct without re-validating
+    return [
+        BorrowRecordResponse.model_construct(
+            id=row.id,
+            book_title=row.title,
+            book_cover=row.cover_url,
+            book_authors=authors.get(row.book_id, []),
+            copy_barcode=row.barcode,
+            borrowed_at=row.borrowed_at,
+            due_date=row.due_date,
+            returned_at=row.returned_at,
+            status=BorrowStatus(row.status),
+            deposit_fee=row.deposit_fee or 0,
+            user_full_name=row.full_name if with_user else None,
+            user_email=row.email if with_user else None
+        )
+        for row in rows
+    ]
+
 @router.get("/my-history", response_model=List[BorrowRecordResponse])
 async def get_my_borrow_history(
     status: Optional[BorrowStatus] = None,
@@ -43,10 +101,7 @@ async def get_my_borrow_history(
     Get borrow history for current user
     """
     query = (
-        select(BorrowRecord)
-        .options(
-            selectinload(BorrowRecord.copy).selectinload(BookCopy.book).selectinload(Book.authors)
-        )
+        BORROW_ROW
         .where(BorrowRecord.user_id == current_user.id)
         .order_by(desc(BorrowRecord.created_at))
     )
@@ -55,25 +110,8 @@ async def get_my_borrow_history(
         query = query.where(BorrowRecord.status == status)
 
     result = await db.execute(query)
-    records = result.scalars().all()
-
-    response = []
-    for record in records:
-        book = record.copy.book
-        response.append(BorrowRecordResponse(
-            id=record.id,
-            book_title=book.title,
-            book_cover=book.cover_url,
-            book_authors=[a.name for a in book.authors],
-            copy_barcode=record.copy.barcode,
-            borrowed_at=record.borrowed_at,
-            due_date=record.due_date,
-            returned_at=record.returned_at,
-            status=record.status,
-            deposit_fee=book.deposit_fee or 0
-        ))
     
-    return response
+    return await _borrow_responses(db, result.all(), with_user=False)
 
 @router.post("/{record_id}/confirm-pickup", status_code=status.HTTP_200_OK)
 async def confirm_pickup(
@@ -135,40 +173,39 @@ async def return_book(
         record.copy.status = CopyStatus.AVAILABLE
 
     await db.commit()
+    cache.invalidate("books")
     
     return {"message": "Book returned successfully"}
 
 
 @router.get("/all", response_model=List[BorrowRecordResponse])
 async def get_all_borrows(
+    http_response: Response,
     status: Optional[BorrowStatus] = None,
     search: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value of the previous page"),
     current_user: User = Depends(require_librarian),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get all borrow records (Librarian only)
+
+    Pages by ``skip``/``limit``, or seeks past ``cursor`` when given. The
+    cursor for the next page is returned in the X-Next-Cursor header.
     """
     query = (
-        select(BorrowRecord)
-        .options(
-            selectinload(BorrowRecord.copy).selectinload(BookCopy.book).selectinload(Book.authors),
-            selectinload(BorrowRecord.user)
-        )
-        .order_by(desc(BorrowRecord.created_at))
+        BORROW_ROW
+        # id breaks ties for keyset paging
+        .order_by(desc(BorrowRecord.created_at), desc(BorrowRecord.id))
     )
 
     if status:
         query = query.where(BorrowRecord.status == status)
         
     if search:
-        # Search by book title, user name, or barcode
-        # Explicitly join tables for filtering to avoid MissingGreenlet or Cartesian products
-        # We use outerjoin to be safe, though inner join should be fine here as records must have copy/user
-        query = query.join(BorrowRecord.copy).join(BookCopy.book).join(BorrowRecord.user)
-        
+        # Search by book title, user name, or barcode (tables already joined)
         from sqlalchemy import or_
         query = query.where(
             or_(
@@ -179,31 +216,25 @@ async def get_all_borrows(
             )
         )
 
-    # Apply pagination
-    query = query.offset(skip).limit(limit)
+    # Apply pagination: seek past the cursor, or fall back to OFFSET
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        query = query.where(
+            tuple_(BorrowRecord.created_at, BorrowRecord.id) < tuple_(cursor_created_at, cursor_id)
+        )
+    else:
+        query = query.offset(skip)
+    query = query.limit(limit + 1)
 
     result = await db.execute(query)
-    records = result.scalars().all()
-
-    response = []
-    for record in records:
-        book = record.copy.book
-        response.append(BorrowRecordResponse(
-            id=record.id,
-            book_title=book.title,
-            book_cover=book.cover_url,
-            book_authors=[a.name for a in book.authors],
-            copy_barcode=record.copy.barcode,
-            borrowed_at=record.borrowed_at,
-            due_date=record.due_date,
-            returned_at=record.returned_at,
-            status=record.status,
-            deposit_fee=book.deposit_fee or 0,
-            user_full_name=record.user.full_name,
-            user_email=record.user.email
-        ))
-    
-    return response
+    rows = result.all()
+
+    # The extra row only tells whether another page follows
+    if len(rows) > limit:
+        rows = rows[:limit]
+        http_response.headers["X-Next-Cursor"] = encode_cursor(rows[-1])
+
+    return await _borrow_responses(db, rows, with_user=True)
 
 
 @router.get("/stats", response_model=dict)
@@ -216,31 +247,27 @@ async def get_borrow_stats(
     """
     from sqlalchemy import func
     
-    # Total active borrows
-    active_count = await db.scalar(
-        select(func.count(BorrowRecord.id)).where(BorrowRecord.status == BorrowStatus.ACTIVE)
-    )
-    
-    # Total overdue
-    overdue_count = await db.scalar(
-        select(func.count(BorrowRecord.id)).where(BorrowRecord.status == BorrowStatus.OVERDUE)
-    )
-    
-    # Pending pickups
-    pending_count = await db.scalar(
-        select(func.count(BorrowRecord.id)).where(BorrowRecord.status == BorrowStatus.PENDING)
-    )
-    
-    # Returned today
+    # All four counts from one scan of borrow_records
     today = datetime.utcnow().date()
-    returned_today = await db.scalar(
-        select(func.count(BorrowRecord.id)).where(
-            and_(
+    counts = (await db.execute(
+        select(
+            # Total active borrows
+            func.count().filter(BorrowRecord.status == BorrowStatus.ACTIVE).label("active"),
+            # Total overdue
+            func.count().filter(BorrowRecord.status == BorrowStatus.OVERDUE).label("overdue"),
+            # Pending pickups
+            func.count().filter(BorrowRecord.status == BorrowStatus.PENDING).label("pending"),
+            # Returned today
+            func.count().filter(
                 BorrowRecord.status == BorrowStatus.RETURNED,
                 func.date(BorrowRecord.returned_at) == today
-            )
-        )
-    )
+            ).label("returned_today"),
+        ).select_from(BorrowRecord)
+    )).one()
+    active_count = counts.active
+    overdue_count = counts.overdue
+    pending_count = counts.pending
+    returned_today = counts.returned_today
     
     return {
         "active_borrows": active_count,
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func, or_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, insert, delete, update, exists
+from sqlalchemy.orm import selectinload, raiseload
+from sqlalchemy.orm.attributes import set_committed_value
 from typing import Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 from datetime import datetime, timedelta
 
 from app.database import get_db
@@ -19,7 +20,10 @@ from app.schemas.cart import (
     CheckoutResponse
 )
 from app.schemas.book_copy import BorrowRecordResponse
+from app.api.v1.books import BOOK_EAGER
 from app.dependencies import get_current_user
+from app.utils.cache import cache
+from app.utils.upsert import insert_on_conflict
 
 router = APIRouter(prefix="/cart", tags=["Cart"])
 
@@ -32,15 +36,17 @@ async def get_cart(
     """
     Get current user's cart with all items and book details
     """
-    # Get or create cart for user
+    # Get or create cart for user. Copy counts are columns on Book, so copies
+    # are never loaded; raiseload turns any other relationship access into an
+    # error instead of a hidden query.
     result = await db.execute(
         select(Cart)
         .where(Cart.user_id == current_user.id)
         .options(
-            selectinload(Cart.items).selectinload(CartItem.book).selectinload(Book.authors),
-            selectinload(Cart.items).selectinload(CartItem.book).selectinload(Book.genres),
-            selectinload(Cart.items).selectinload(CartItem.book).selectinload(Book.keywords),
-            selectinload(Cart.items).selectinload(CartItem.book).selectinload(Book.copies)
+            selectinload(Cart.items)
+            .selectinload(CartItem.book)
+            .options(*BOOK_EAGER, raiseload("*")),
+            raiseload("*")
         )
     )
     cart = result.scalar_one_or_none()
@@ -52,41 +58,8 @@ async def get_cart(
         await db.commit()
         await db.refresh(cart, ['items'])
     
-    # Manually construct response with book details
-    cart_items = []
-    for item in cart.items:
-        if item.book:
-            from app.schemas.book import BookResponse, LocationSchema
-            book_response = BookResponse.model_validate({
-                **{k: getattr(item.book, k) for k in ['id', 'title', 'description', 'isbn', 'publisher', 'publication_year', 'pages', 'deposit_fee', 'cover_url', 'created_at', 'updated_at', 'average_rating', 'total_reviews']},
-                'authors': item.book.authors,
-                'genres': item.book.genres,
-                'keywords': item.book.keywords,
-                'total_copies': len(item.book.copies),
-                'available_copies': sum(1 for c in item.book.copies if c.status == 'AVAILABLE'),
-                'location': LocationSchema(
-                    floor=item.book.floor or '',
-                    shelf=item.book.shelf or '',
-                    row=item.book.row or ''
-                )
-            })
-            cart_items.append(CartItemResponse(
-                id=item.id,
-                cart_id=item.cart_id,
-                book_id=item.book_id,
-                added_at=item.added_at,
-                book=book_response
-            ))
-        else:
-            cart_items.append(CartItemResponse.model_validate(item))
-    
-    return CartResponse(
-        id=cart.id,
-        user_id=cart.user_id,
-        created_at=cart.created_at,
-        updated_at=cart.updated_at,
-        items=cart_items
-    )
+    # One from_attributes pass over the loaded cart, items and books
+    return CartResponse.model_validate(cart)
 
 
 @router.post("/items", response_model=CartItemResponse, status_code=status.HTTP_201_CREATED)
@@ -104,93 +77,74 @@ async def add_to_cart(
     - Book must exist
     - Book must have at least one available copy
     """
-    # Check if book exists
-    book_result = await db.execute(
-        select(Book).where(Book.id == item_data.book_id)
-    )
-    book = book_result.scalar_one_or_none()
-    
-    if not book:
+    book_id = item_data.book_id
+    
+    # Evaluate every business rule in one round-trip
+    checks = (await db.execute(select(
+        # Book exists
+        exists().where(Book.id == book_id).label("book_exists"),
+        # Book has an available copy
+        exists().where(
+            BookCopy.book_id == book_id,
+            BookCopy.status == CopyStatus.AVAILABLE
+        ).label("has_copy"),
+        # User already has an active or pending borrow for this book
+        exists().where(
+            BorrowRecord.copy_id == BookCopy.id,
+            BookCopy.book_id == book_id,
+            BorrowRecord.user_id == current_user.id,
+            BorrowRecord.status.in_([BorrowStatus.ACTIVE, BorrowStatus.PENDING])
+        ).label("has_borrow"),
+        # Book already in the user's cart
+        exists().where(
+            CartItem.cart_id == Cart.id,
+            Cart.user_id == current_user.id,
+            CartItem.book_id == book_id
+        ).label("in_cart"),
+    ))).one()
+    
+    if not checks.book_exists:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Book not found"
         )
     
-    # Check if book has available copies
-    available_copies = await db.execute(
-        select(func.count())
-        .where(
-            and_(
-                BookCopy.book_id == item_data.book_id,
-                BookCopy.status == CopyStatus.AVAILABLE
-            )
-        )
-    )
-    if available_copies.scalar() == 0:
+    if not checks.has_copy:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No available copies of this book"
         )
     
-    # Check if user already has active or pending borrow for this book
-    active_borrow = await db.execute(
-        select(BorrowRecord)
-        .join(BookCopy)
-        .where(
-            and_(
-                BookCopy.book_id == item_data.book_id,
-                BorrowRecord.user_id == current_user.id,
-                or_(
-                    BorrowRecord.status == BorrowStatus.ACTIVE,
-                    BorrowRecord.status == BorrowStatus.PENDING
-                )
-            )
-        )
-    )
-    if active_borrow.scalars().first():
+    if checks.has_borrow:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="You already have an active or pending borrow for this book"
         )
     
-    # Get or create cart
-    cart_result = await db.execute(
-        select(Cart).where(Cart.user_id == current_user.id)
-    )
-    cart = cart_result.scalar_one_or_none()
-    
-    if not cart:
-        cart = Cart(user_id=current_user.id)
-        db.add(cart)
-        await db.flush()
-    
-    # Check if book already in cart
-    existing_item = await db.execute(
-        select(CartItem).where(
-            and_(
-                CartItem.cart_id == cart.id,
-                CartItem.book_id == item_data.book_id
-            )
-        )
-    )
-    if existing_item.scalar_one_or_none():
+    if checks.in_cart:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Book already in cart"
         )
     
+    # Get or create cart and update its timestamp in one statement
+    now = datetime.utcnow()
+    cart_id = await db.scalar(
+        insert_on_conflict(db, Cart)
+        .values(id=uuid4(), user_id=current_user.id, created_at=now, updated_at=now)
+        .on_conflict_do_update(index_elements=["user_id"], set_={"updated_at": now})
+        .returning(Cart.id)
+    )
+    
     # Add item to cart
     cart_item = CartItem(
-        cart_id=cart.id,
-        book_id=item_data.book_id
+        cart_id=cart_id,
+        book_id=book_id
     )
     db.add(cart_item)
     
-    # Update cart timestamp
-    cart.updated_at = datetime.utcnow()
-    
+    # id and added_at are client-side defaults, so no refresh is needed
     await db.commit()
-    await db.refresh(cart_item)
     
     # Return simple response without book details to avoid lazy loading issues
     return CartItemResponse(
@@ -211,45 +165,40 @@ async def remove_from_cart(
     """
     Remove a book from cart
     """
-    # Get user's cart
-    cart_result = await db.execute(
-        select(Cart).where(Cart.user_id == current_user.id)
-    )
-    cart = cart_result.scalar_one_or_none()
-    
-    if not cart:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Cart not found"
-        )
+    user_cart = select(Cart.id).where(Cart.user_id == current_user.id)
     
-    # Find and delete cart item
-    item_result = await db.execute(
-        select(CartItem).where(
-            and_(
-                CartItem.cart_id == cart.id,
-                CartItem.book_id == book_id
-            )
+    # Delete the item straight through the user's cart id
+    removed = await db.scalar(
+        delete(CartItem)
+        .where(
+            CartItem.cart_id.in_(user_cart),
+            CartItem.book_id == book_id
         )
+        .returning(CartItem.id)
+        .execution_options(synchronize_session=False)
     )
-    item = item_result.scalar_one_or_none()
     
-    if not item:
+    if not removed:
+        # Nothing deleted: tell a missing cart from a missing item
+        if not await db.scalar(select(exists().where(Cart.user_id == current_user.id))):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Cart not found"
+            )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Book not found in cart"
         )
     
-    await db.delete(item)
-    
     # Update cart timestamp
-    cart.updated_at = datetime.utcnow()
+    await db.execute(
+        update(Cart)
+        .where(Cart.user_id == current_user.id)
+        .values(updated_at=datetime.utcnow())
+    )
     
     await db.commit()
     
-    # Clear session cache to prevent stale data
-    db.expire_all()
-    
     return None
 
 
@@ -261,23 +210,19 @@ async def clear_cart(
     """
     Clear all items from cart
     """
-    # Get user's cart
-    cart_result = await db.execute(
-        select(Cart).where(Cart.user_id == current_user.id)
+    # Delete all items of the user's cart (a no-op when there is no cart)
+    await db.execute(
+        delete(CartItem)
+        .where(CartItem.cart_id.in_(select(Cart.id).where(Cart.user_id == current_user.id)))
+        .execution_options(synchronize_session=False)
     )
-    cart = cart_result.scalar_one_or_none()
     
-    if not cart:
-        return None
-    
-    # Delete all cart items using delete statement
-    from sqlalchemy import delete
     await db.execute(
-        delete(CartItem).where(CartItem.cart_id == cart.id)
+        update(Cart)
+        .where(Cart.user_id == current_user.id)
+        .values(updated_at=datetime.utcnow())
     )
     
-    cart.updated_at = datetime.utcnow()
-    
     await db.commit()
     
     return None
@@ -295,16 +240,16 @@ async def checkout_cart(
     This is an atomic operation - either all books are borrowed or none are.
     If any book fails (e.g., no available copy), the entire checkout fails.
     """
-    # Get user's cart with items
+    # Lock the user's cart and read its book ids (no CartItem objects needed)
     cart_result = await db.execute(
-        select(Cart)
+        select(Cart.id, CartItem.book_id)
+        .join(CartItem, CartItem.cart_id == Cart.id)
         .where(Cart.user_id == current_user.id)
-        .options(selectinload(Cart.items))
-        .with_for_update()
+        .with_for_update(of=Cart)
     )
-    cart = cart_result.scalar_one_or_none()
+    cart_rows = cart_result.all()
     
-    if not cart or not cart.items:
+    if not cart_rows:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cart is empty"
@@ -313,69 +258,57 @@ async def checkout_cart(
     # Set default due date if not provided (14 days from now)
     due_date = checkout_data.due_date or (datetime.utcnow() + timedelta(days=14))
     
-    borrow_records = []
-    failed_books = []
-    
-    # Process each item in cart
-    for cart_item in cart.items:
-        try:
-            # Find an available copy for this book with locking
-            # Eager load book to ensure it's available for response
-            copy_result = await db.execute(
-                select(BookCopy)
-                .where(
-                    and_(
-                        BookCopy.book_id == cart_item.book_id,
-                        BookCopy.status == CopyStatus.AVAILABLE
-                    )
-                )
-                .options(selectinload(BookCopy.book).selectinload(Book.authors))
-                .limit(1)
-                .with_for_update()
-            )
-            copy = copy_result.scalar_one_or_none()
-            
-            if not copy:
-                # Get book title
-                book_result = await db.execute(select(Book).where(Book.id == cart_item.book_id))
-                book = book_result.scalar_one_or_none()
-                failed_books.append({
-                    "book_id": str(cart_item.book_id),
-                    "book_title": book.title if book else "Unknown",
-                    "reason": "No available copies"
-                })
-                continue
-            
-            # Create borrow record
-            borrow_record = BorrowRecord(
-                copy_id=copy.id,
-                user_id=current_user.id,
-                due_date=due_date,
-                status=BorrowStatus.PENDING
-            )
-            
-            # Update copy status
-            copy.status = CopyStatus.BORROWED
-            
-            # Manually attach copy to borrow record so it's available for response without reload
-            borrow_record.copy = copy
-            
-            db.add(borrow_record)
-            borrow_records.append(borrow_record)
-            
-        except Exception as e:
-            # Get book title
-            book_result = await db.execute(select(Book).where(Book.id == cart_item.book_id))
-            book = book_result.scalar_one_or_none()
-            failed_books.append({
-                "book_id": str(cart_item.book_id),
-                "book_title": book.title if book else "Unknown",
-                "reason": str(e)
-            })
+    cart_id = cart_rows[0].id
+    book_ids = [row.book_id for row in cart_rows]
+    
+    # Lock every available copy of the cart's books, skipping copies a
+    # concurrent checkout or borrow already holds, and claim the first locked
+    # copy (by id) of each book. Locking all candidates means one held copy
+    # never hides the book's other available copies.
+    locked_result = await db.execute(
+        select(BookCopy.id, BookCopy.book_id)
+        .where(
+            BookCopy.book_id.in_(book_ids),
+            BookCopy.status == CopyStatus.AVAILABLE
+        )
+        .order_by(BookCopy.id)
+        .with_for_update(skip_locked=True)
+    )
+    claim_ids = {}
+    for copy_id, book_id in locked_result:
+        claim_ids.setdefault(book_id, copy_id)
+    
+    # Flip the claimed copies to BORROWED and read them back in one statement
+    copy_result = await db.execute(
+        update(BookCopy)
+        .where(
+            BookCopy.id.in_(list(claim_ids.values())),
+            BookCopy.status == CopyStatus.AVAILABLE
+        )
+        .values(status=CopyStatus.BORROWED)
+        .returning(BookCopy)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    copies = {copy.book_id: copy for copy in copy_result.scalars()}
+    
+    failed_books = [book_id for book_id in book_ids if book_id not in copies]
     
     # If any book failed, rollback everything
     if failed_books:
         await db.rollback()
+        
+        # Get book titles for every failure at once
+        titles = dict((await db.execute(
+            select(Book.id, Book.title).where(Book.id.in_(failed_books))
+        )).all())
+        failed_books = [
+            {
+                "book_id": str(book_id),
+                "book_title": titles.get(book_id, "Unknown"),
+                "reason": "No available copies"
+            }
+            for book_id in failed_books
+        ]
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail={
@@ -384,37 +317,59 @@ async def checkout_cart(
             }
         )
     
+    # Create every borrow record with one multi-row INSERT ... RETURNING
+    records_result = await db.execute(
+        insert(BorrowRecord).returning(BorrowRecord),
+        [
+            {
+                "copy_id": copies[book_id].id,
+                "user_id": current_user.id,
+                "due_date": due_date,
+                "status": BorrowStatus.PENDING
+            }
+            for book_id in book_ids
+        ]
+    )
+    borrow_records = records_result.scalars().all()
+    
+    # Attach copy and user so the response needs no reload
+    copies_by_id = {copy.id: copy for copy in copies.values()}
+    for record in borrow_records:
+        set_committed_value(record, "copy", copies_by_id[record.copy_id])
+        set_committed_value(record, "user", current_user)
+    
     # Clear cart after successful checkout using delete statement
-    from sqlalchemy import delete
     await db.execute(
-        delete(CartItem).where(CartItem.cart_id == cart.id)
+        delete(CartItem).where(CartItem.cart_id == cart_id)
+    )
+    await db.execute(
+        update(Cart)
+        .where(Cart.id == cart_id)
+        .values(updated_at=datetime.utcnow())
     )
-    
-    cart.updated_at = datetime.utcnow()
     
     # Commit all changes
     await db.commit()
-    
-    # Expire all to ensure fresh data on next query
-    # db.expire_all() # Commented out to keep objects attached
-    
-    # Refresh borrow records
-    for record in borrow_records:
-        await db.refresh(record)
-        # Ensure copy and book are attached
-        if not record.copy:
-             # This shouldn't happen if we didn't expire, but if we did, we'd need to reload
-             pass
+    cache.invalidate("books")
     
     # We need to import BorrowRecordDetailResponse here to avoid circular imports if any
     from app.schemas.book_copy import BorrowRecordDetailResponse
     from app.schemas.book import BookResponse
     
+    # Load the borrowed books once (populate_existing picks up the
+    # trigger-maintained copy counters)
+    books_result = await db.execute(
+        select(Book)
+        .options(*BOOK_EAGER)
+        .where(Book.id.in_(copies))
+        .execution_options(populate_existing=True)
+    )
+    books = {book.id: book for book in books_result.scalars()}
+    
     response_records = []
     for r in borrow_records:
         item = BorrowRecordDetailResponse.model_validate(r)
-        if r.copy and r.copy.book:
-            item.book = BookResponse.model_validate(r.copy.book)
+        item.book = BookResponse.model_validate(books[r.copy.book_id])
         response_records.append(item)
     
     return CheckoutResponse(
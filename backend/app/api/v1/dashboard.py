@@ -1,15 +1,18 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_, cast, Date
-from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy import select, func, true, cast, type_coerce, literal_column, Date
+from datetime import datetime, time, timedelta
 from typing import List, Dict, Any
+import asyncio
 
-from app.database import get_db
+from app.database import get_db, get_ro_session_factory
 from app.models.user import User
 from app.models.book import Book
 from app.models.book_copy import BorrowRecord, BookCopy, BorrowStatus
 from app.models.review import Review
 from app.dependencies import require_librarian
+from app.config import settings
+from app.utils.cache import cache
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
@@ -17,77 +20,97 @@ router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 @router.get("/stats", response_model=Dict[str, Any])
 async def get_dashboard_stats(
     current_user: User = Depends(require_librarian),
-    db: AsyncSession = Depends(get_db)
+    session_factory: async_sessionmaker = Depends(get_ro_session_factory)
 ):
     """
     Get comprehensive dashboard statistics for librarians/admins
     """
+    # Near-real-time is enough here: serve from cache for CACHE_TTL_SECONDS
+    cached = cache.get("dashboard", ("stats",))
+    if cached is not None:
+        return cached
 
-    # Total books
-    total_books_query = select(func.count()).select_from(Book)
-    total_books = await db.scalar(total_books_query) or 0
-
-    # Total book copies
-    total_copies_query = select(func.count()).select_from(BookCopy)
-    total_copies = await db.scalar(total_copies_query) or 0
-
-    # Available copies
-    available_copies_query = select(func.count()).select_from(BookCopy).where(
-        BookCopy.status == 'AVAILABLE'
-    )
-    available_copies = await db.scalar(available_copies_query) or 0
-
-    # Total users
-    total_users_query = select(func.count()).select_from(User)
-    total_users = await db.scalar(total_users_query) or 0
-
-    # Active borrows (ACTIVE + PENDING)
-    active_borrows_query = select(func.count()).select_from(BorrowRecord).where(
-        or_(BorrowRecord.status == BorrowStatus.ACTIVE, BorrowRecord.status == BorrowStatus.PENDING)
-    )
-    active_borrows = await db.scalar(active_borrows_query) or 0
-
-    # Overdue books
     today = datetime.now()
-    overdue_query = select(func.count()).select_from(BorrowRecord).where(
-        and_(
+    first_day_of_month = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+    # One aggregate per source table, each FILTER counting a different
+    # subset, so every table is scanned once
+    book_stats = select(
+        # Total books
+        func.count().label("total_books"),
+        # Average book rating (avg skips unrated books)
+        func.avg(Book.average_rating).label("avg_rating"),
+    ).select_from(Book).subquery()
+
+    copy_stats = select(
+        # Total book copies
+        func.count().label("total_copies"),
+        # Available copies
+        func.count().filter(BookCopy.status == 'AVAILABLE').label("available_copies"),
+    ).select_from(BookCopy).subquery()
+
+    user_stats = select(
+        # Total users
+        func.count().label("total_users"),
+        # New users this month
+        func.count().filter(User.created_at >= first_day_of_month).label("new_users_this_month"),
+    ).select_from(User).subquery()
+
+    borrow_stats = select(
+        # Active borrows (ACTIVE + PENDING)
+        func.count().filter(
+            BorrowRecord.status.in_([BorrowStatus.ACTIVE, BorrowStatus.PENDING])
+        ).label("active_borrows"),
+        # Overdue books
+        func.count().filter(
             BorrowRecord.status == BorrowStatus.ACTIVE,
             BorrowRecord.due_date < today
-        )
-    )
-    overdue_count = await db.scalar(overdue_query) or 0
-
-    # Pending pickups
-    pending_pickups_query = select(func.count()).select_from(BorrowRecord).where(
-        BorrowRecord.status == BorrowStatus.PENDING
-    )
-    pending_pickups = await db.scalar(pending_pickups_query) or 0
-
-    # Returned this month
-    first_day_of_month = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    returned_this_month_query = select(func.count()).select_from(BorrowRecord).where(
-        and_(
+        ).label("overdue_count"),
+        # Pending pickups
+        func.count().filter(BorrowRecord.status == BorrowStatus.PENDING).label("pending_pickups"),
+        # Returned this month
+        func.count().filter(
             BorrowRecord.status == BorrowStatus.RETURNED,
             BorrowRecord.returned_at >= first_day_of_month
-        )
-    )
-    returned_this_month = await db.scalar(returned_this_month_query) or 0
-
-    # New users this month
-    new_users_this_month_query = select(func.count()).select_from(User).where(
-        User.created_at >= first_day_of_month
+        ).label("returned_this_month"),
+    ).select_from(BorrowRecord).subquery()
+
+    review_stats = select(
+        # Total reviews
+        func.count().label("total_reviews"),
+    ).select_from(Review).subquery()
+
+    async def fetch(*aggregates):
+        # Each group runs on its own pooled connection; the single-row
+        # aggregates within a group are cross joined into one row
+        joined = aggregates[0]
+        for aggregate in aggregates[1:]:
+            joined = joined.join(aggregate, true())
+        async with session_factory() as session:
+            return (await session.execute(select(*aggregates).select_from(joined))).one()
+
+    # The three independent groups run concurrently: latency is the
+    # slowest group instead of the sum
+    library_row, borrow_row, people_row = await asyncio.gather(
+        fetch(book_stats, copy_stats),
+        fetch(borrow_stats),
+        fetch(user_stats, review_stats),
     )
-    new_users_this_month = await db.scalar(new_users_this_month_query) or 0
-
-    # Total reviews
-    total_reviews_query = select(func.count()).select_from(Review)
-    total_reviews = await db.scalar(total_reviews_query) or 0
-
-    # Average book rating
-    avg_rating_query = select(func.avg(Book.average_rating)).where(Book.average_rating.isnot(None))
-    avg_rating = await db.scalar(avg_rating_query) or 0
-
-    return {
+    stats = {**library_row._mapping, **borrow_row._mapping, **people_row._mapping}
+
+    total_books = stats["total_books"] or 0
+    total_copies = stats["total_copies"] or 0
+    available_copies = stats["available_copies"] or 0
+    total_users = stats["total_users"] or 0
+    active_borrows = stats["active_borrows"] or 0
+    overdue_count = stats["overdue_count"] or 0
+    pending_pickups = stats["pending_pickups"] or 0
+    returned_this_month = stats["returned_this_month"] or 0
+    new_users_this_month = stats["new_users_this_month"] or 0
+    total_reviews = stats["total_reviews"] or 0
+    avg_rating = stats["avg_rating"] or 0
+
+    dashboard_stats = {
         "library_stats": {
             "total_books": total_books,
             "total_copies": total_copies,
@@ -109,6 +132,9 @@ async def get_dashboard_stats(
             "average_rating": round(float(avg_rating), 2) if avg_rating else 0,
         }
     }
+    cache.set("dashboard", ("stats",), dashboard_stats)
+
+    return dashboard_stats
 
 
 @router.get("/borrow-trends", response_model=List[Dict[str, Any]])
@@ -123,19 +149,50 @@ async def get_borrow_trends(
     today = datetime.now().date()
     start_date = today - timedelta(days=days)
 
+    # Range on the raw column (a timestamp bound, not a date) so the
+    # borrowed_at index serves it
+    start_ts = datetime.combine(start_date, time.min)
+
+    postgres = db.get_bind().dialect.name == "postgresql"
+
+    # Calendar day of each borrow; SQLite has no DATE type, so its
+    # 'YYYY-MM-DD' text is read back as a date
+    if postgres:
+        day = cast(BorrowRecord.borrowed_at, Date)
+    else:
+        day = type_coerce(func.date(BorrowRecord.borrowed_at), Date)
+    day = day.label('date')
+
     # Query borrow records grouped by date
     query = select(
-        cast(BorrowRecord.borrowed_at, Date).label('date'),
+        day,
         func.count().label('count')
     ).where(
-        BorrowRecord.borrowed_at >= start_date
+        BorrowRecord.borrowed_at >= start_ts
     ).group_by(
-        cast(BorrowRecord.borrowed_at, Date)
-    ).order_by(
-        cast(BorrowRecord.borrowed_at, Date)
+        day
     )
 
-    result = await db.execute(query)
+    if postgres:
+        # Zero-fill on the server: every day of the window from
+        # generate_series, left joined to the daily counts
+        daily = query.subquery()
+        series = func.generate_series(
+            start_ts, datetime.combine(today, time.min), literal_column("interval '1 day'")
+        ).table_valued("d").render_derived()
+        series_day = cast(series.c.d, Date)
+
+        result = await db.execute(
+            select(
+                series_day.label('date'),
+                func.coalesce(daily.c.count, 0).label('count')
+            ).select_from(
+                series.outerjoin(daily, daily.c.date == series_day)
+            ).order_by(series_day)
+        )
+        return [{"date": row.date.isoformat(), "count": row.count} for row in result]
+
+    result = await db.execute(query.order_by(day))
     rows = result.all()
 
     # Create a dict for quick lookup
@@ -163,6 +220,10 @@ async def get_popular_books(
     """
     Get most borrowed books
     """
+    cached = cache.get("dashboard", ("popular_books", limit))
+    if cached is not None:
+        return cached
+
     query = select(
         Book.id,
         Book.title,
@@ -181,7 +242,7 @@ async def get_popular_books(
     result = await db.execute(query)
     rows = result.all()
 
-    return [
+    ranking = [
         {
             "id": str(row.id),
             "title": row.title,
@@ -190,6 +251,9 @@ async def get_popular_books(
         }
         for row in rows
     ]
+    cache.set("dashboard", ("popular_books", limit), ranking, ttl=settings.ANALYTICS_CACHE_TTL_SECONDS)
+
+    return ranking
 
 
 @router.get("/popular-genres", response_model=List[Dict[str, Any]])
@@ -201,6 +265,10 @@ async def get_popular_genres(
     """
     Get most popular genres based on borrows
     """
+    cached = cache.get("dashboard", ("popular_genres", limit))
+    if cached is not None:
+        return cached
+
     from app.models.book import Genre, book_genres
 
     query = select(
@@ -224,7 +292,7 @@ async def get_popular_genres(
     result = await db.execute(query)
     rows = result.all()
 
-    return [
+    ranking = [
         {
             "id": str(row.id),
             "name": row.name,
@@ -232,6 +300,9 @@ async def get_popular_genres(
         }
         for row in rows
     ]
+    cache.set("dashboard", ("popular_genres", limit), ranking, ttl=settings.ANALYTICS_CACHE_TTL_SECONDS)
+
+    return ranking
 
 
 @router.get("/active-users", response_model=List[Dict[str, Any]])
@@ -243,6 +314,10 @@ async def get_active_users(
     """
     Get most active users (by borrow count)
     """
+    cached = cache.get("dashboard", ("active_users", limit))
+    if cached is not None:
+        return cached
+
     query = select(
         User.id,
         User.username,
@@ -260,7 +335,7 @@ async def get_active_users(
     result = await db.execute(query)
     rows = result.all()
 
-    return [
+    ranking = [
         {
             "id": str(row.id),
             "username": row.username,
@@ -270,3 +345,6 @@ async def get_active_users(
         }
         for row in rows
     ]
+    cache.set("dashboard", ("active_users", limit), ranking, ttl=settings.ANALYTICS_CACHE_TTL_SECONDS)
+
+    return ranking
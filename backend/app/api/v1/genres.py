@@ -1,48 +1,70 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy import select, update, delete, exists, func, or_, lambda_stmt, bindparam
+from sqlalchemy.orm import aliased
+from pydantic import TypeAdapter
 from typing import List, Optional
 from uuid import UUID
 from math import ceil
+import asyncio
 
-from app.database import get_db
-from app.models.book import Genre
+from app.database import get_db, get_ro_session_factory
+from app.models.book import Genre, book_genres
 from app.models.user import User
 from app.schemas.book import GenreCreate, GenreUpdate, GenreResponse
-from app.schemas.common import PaginatedResponse
+from app.schemas.common import PaginatedResponse, orm_to_schema
 from app.dependencies import require_librarian
+from app.utils.cache import cache
+from app.utils.count import in_own_session
+from app.utils.upsert import insert_on_conflict
 
 router = APIRouter(prefix="/genres", tags=["Genres"])
 
+# Hot single-row lookup, built once at import time (lambda statements are
+# cached by SQLAlchemy, so per-request expression construction is skipped)
+GENRE_EXISTS = lambda_stmt(lambda: select(exists().where(Genre.id == bindparam("genre_id"))))
+
+# Rows fetched and serialized per step when streaming all genres
+GENRE_STREAM_BATCH = 500
+_GENRE_LIST = TypeAdapter(List[GenreResponse])
+
 @router.get("/", response_model=PaginatedResponse[GenreResponse])
 async def get_genres(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     search: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    session_factory: async_sessionmaker = Depends(get_ro_session_factory)
 ):
     """Get all genres with pagination and search"""
-    query = select(Genre)
+    filters = []
     
     if search:
-        query = query.where(Genre.name.ilike(f"%{search}%"))
+        filters.append(Genre.name.ilike(f"%{search}%"))
         
-    query = query.order_by(Genre.name.asc())
+    query = select(Genre).where(*filters).order_by(Genre.name.asc())
     
-    # Calculate total
-    total_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(total_query) or 0
+    # Total (flat count: no ORDER BY or subquery to materialize)
+    total_query = select(func.count()).select_from(Genre).where(*filters)
     
     # Pagination
     query = query.offset((page - 1) * page_size).limit(page_size)
     
-    result = await db.execute(query)
+    # The count and the page run concurrently on separate connections
+    total, result = await asyncio.gather(
+        in_own_session(session_factory, lambda session: session.scalar(total_query)),
+        db.execute(query)
+    )
+    total = total or 0
     genres = result.scalars().all()
     
     total_pages = ceil(total / page_size) if total > 0 else 0
     
-    return PaginatedResponse(
-        items=[GenreResponse.model_validate(g) for g in genres],
+    # Build the exact response_model class so FastAPI passes it straight
+    # to the JSON serializer instead of revalidating it
+    return PaginatedResponse[GenreResponse](
+        items=[orm_to_schema(GenreResponse, g) for g in genres],
         total=total,
         page=page,
         page_size=page_size,
@@ -53,11 +75,30 @@ async def get_genres(
 async def get_all_genres(
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all genres without pagination (for dropdowns)"""
-    query = select(Genre).order_by(Genre.name.asc())
-    result = await db.execute(query)
-    genres = result.scalars().all()
-    return [GenreResponse.model_validate(g) for g in genres]
+    """
+    Get all genres without pagination (for dropdowns)
+
+    The JSON array is streamed in batches of plain rows, so a large catalog
+    is never materialized (as ORM objects or one big list) at once.
+    """
+    query = (
+        select(Genre.id, Genre.name, Genre.created_at)
+        .order_by(Genre.name.asc())
+        .execution_options(yield_per=GENRE_STREAM_BATCH)
+    )
+    result = await db.stream(query)
+
+    async def body():
+        yield b"["
+        separator = b""
+        async for rows in result.mappings().partitions():
+            # Dump each batch as an array and splice its items into the stream
+            batch = _GENRE_LIST.dump_json([GenreResponse.model_construct(**row) for row in rows])
+            yield separator + batch[1:-1]
+            separator = b","
+        yield b"]"
+
+    return StreamingResponse(body(), media_type="application/json")
 
 @router.post("/", response_model=GenreResponse, status_code=status.HTTP_201_CREATED)
 async def create_genre(
@@ -66,18 +107,22 @@ async def create_genre(
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new genre (librarian only)"""
-    # Check if exists
-    result = await db.execute(select(Genre).where(Genre.name == genre_data.name))
-    if result.scalar_one_or_none():
+    # Insert and check name uniqueness in one statement; no row back means it already exists
+    result = await db.execute(
+        insert_on_conflict(db, Genre)
+        .values(name=genre_data.name)
+        .on_conflict_do_nothing(index_elements=["name"])
+        .returning(Genre)
+    )
+    genre = result.scalar_one_or_none()
+    
+    if not genre:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Genre with this name already exists"
         )
     
-    genre = Genre(name=genre_data.name)
-    db.add(genre)
     await db.commit()
-    await db.refresh(genre)
     return GenreResponse.model_validate(genre)
 
 @router.put("/{genre_id}", response_model=GenreResponse)
@@ -88,27 +133,35 @@ async def update_genre(
     db: AsyncSession = Depends(get_db)
 ):
     """Update a genre (librarian only)"""
-    result = await db.execute(select(Genre).where(Genre.id == genre_id))
+    # Rename only if no other genre has the name, returning the updated row
+    other = aliased(Genre)
+    result = await db.execute(
+        update(Genre)
+        .where(
+            Genre.id == genre_id,
+            ~exists().where(other.name == genre_data.name, other.id != genre_id)
+        )
+        .values(name=genre_data.name)
+        .returning(Genre)
+        .execution_options(synchronize_session=False)
+    )
     genre = result.scalar_one_or_none()
     
     if not genre:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Genre not found"
-        )
-        
-    # Check name uniqueness if changed
-    if genre_data.name != genre.name:
-        existing = await db.execute(select(Genre).where(Genre.name == genre_data.name))
-        if existing.scalar_one_or_none():
+        # Nothing updated: tell a missing genre from a name conflict
+        if not await db.scalar(GENRE_EXISTS, {"genre_id": genre_id}):
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Genre with this name already exists"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Genre not found"
             )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Genre with this name already exists"
+        )
     
-    genre.name = genre_data.name
     await db.commit()
-    await db.refresh(genre)
+    # Book list pages and details embed genre names
+    cache.invalidate("books")
     return GenreResponse.model_validate(genre)
 
 @router.delete("/{genre_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -118,19 +171,23 @@ async def delete_genre(
     db: AsyncSession = Depends(get_db)
 ):
     """Delete a genre (librarian only)"""
-    result = await db.execute(select(Genre).where(Genre.id == genre_id))
-    genre = result.scalar_one_or_none()
+    # Deletion is allowed while books use the genre. The association rows
+    # are removed explicitly in the same transaction rather than relying on
+    # the foreign key cascade (SQLite does not enforce it by default).
+    await db.execute(delete(book_genres).where(book_genres.c.genre_id == genre_id))
     
-    if not genre:
+    # No row back means there was no such genre
+    result = await db.execute(
+        delete(Genre).where(Genre.id == genre_id).returning(Genre.id)
+    )
+    
+    if result.scalar_one_or_none() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Genre not found"
         )
     
-    # Check if used by any books?
-    # SQLAlchemy cascade might handle it, or we might want to prevent deletion if used.
-    # For now, let's allow deletion (cascade in model definition handles association table)
-    
-    await db.delete(genre)
     await db.commit()
+    # Book list pages and details embed genre names
+    cache.invalidate("books")
     return None
@@ -1,100 +1,158 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, desc
-from sqlalchemy.orm import joinedload
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy import select, func, desc, tuple_
+from sqlalchemy.orm import contains_eager, selectinload, raiseload
 from typing import Optional
+import asyncio
 
-from app.database import get_db
+from app.database import get_db, get_ro_session_factory
 from app.models.book_copy import BorrowRecord, BookCopy, BorrowStatus
 from app.models.book import Book
 from app.models.user import User
+from app.schemas.book import BookResponse
 from app.schemas.book_copy import BorrowRecordResponse, BorrowRecordDetailResponse
 from app.dependencies import require_librarian
 from app.schemas.common import PaginatedResponse
+from app.utils.count import in_own_session
+from app.utils.cursor import encode_cursor, decode_cursor
+from app.utils.utcnow import utcnow
 
 router = APIRouter(prefix="/loans", tags=["Loans"])
 
+# Book relationships a loan listing can include (see ``fields``)
+_BOOK_RELATIONS = ("authors", "genres", "keywords")
+
 @router.get("/", response_model=PaginatedResponse[BorrowRecordDetailResponse])
 async def get_loans(
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
     status: Optional[BorrowStatus] = None,
     search: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="Keyset cursor (next_cursor of the previous page)"),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated book relationships to include: authors, genres, keywords (default: all)"
+    ),
     current_user: User = Depends(require_librarian),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    session_factory: async_sessionmaker = Depends(get_ro_session_factory)
 ):
-    """Get all loans (librarian only)"""
+    """
+    Get all loans (librarian only)
+
+    Pages by ``page``, or seeks past ``cursor`` when given (cheaper on deep
+    pages; ``page`` is kept for the librarian UI). ``fields`` limits the
+    book relationships loaded and returned (e.g. ``fields=authors``, or
+    ``fields=`` for none).
+    """
+    if fields is None:
+        book_relations = _BOOK_RELATIONS
+    else:
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = requested.difference(_BOOK_RELATIONS)
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+            )
+        book_relations = tuple(name for name in _BOOK_RELATIONS if name in requested)
     
-    # Eager load relationships
-    # Eager load relationships
-    # Use selectinload for async compatibility and deep loading
-    from sqlalchemy.orm import selectinload
-    query = select(BorrowRecord).options(
-        selectinload(BorrowRecord.user),
-        selectinload(BorrowRecord.copy).selectinload(BookCopy.book).selectinload(Book.authors),
-        selectinload(BorrowRecord.copy).selectinload(BookCopy.book).selectinload(Book.genres),
-        selectinload(BorrowRecord.copy).selectinload(BookCopy.book).selectinload(Book.keywords),
-        selectinload(BorrowRecord.copy).selectinload(BookCopy.book).selectinload(Book.copies)
-    ).join(User).join(BookCopy).join(Book)
+    # User, copy and book come from the joins the filters need anyway; only
+    # the requested book taxonomies take extra (selectin) queries. Anything
+    # else the response would touch raises instead of lazy loading.
+    query = select(BorrowRecord).join(BorrowRecord.user).join(BorrowRecord.copy).join(BookCopy.book).options(
+        contains_eager(BorrowRecord.user),
+        contains_eager(BorrowRecord.copy).contains_eager(BookCopy.book).options(
+            *(selectinload(getattr(Book, name)) for name in book_relations)
+        ),
+        raiseload("*")
+    )
+    total_query = select(func.count()).select_from(BorrowRecord)
+    
+    filters = []
     
     if status:
-        query = query.where(BorrowRecord.status == status)
+        filters.append(BorrowRecord.status == status)
         
     if search:
         # Search by user name, book title, or barcode
-        search_filter = (
+        filters.append(
             User.full_name.ilike(f"%{search}%") |
             User.email.ilike(f"%{search}%") |
             Book.title.ilike(f"%{search}%") |
             BookCopy.barcode.ilike(f"%{search}%")
         )
-        query = query.where(search_filter)
+        # Only the search needs the joined tables for counting
+        total_query = total_query.join(BorrowRecord.user).join(BorrowRecord.copy).join(BookCopy.book)
         
-    # Calculate total
-    total_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(total_query) or 0
+    query = query.where(*filters)
     
-    # Pagination
-    query = query.order_by(desc(BorrowRecord.borrowed_at))
-    query = query.offset((page - 1) * page_size).limit(page_size)
+    # Total (flat count: no ORDER BY or subquery to materialize)
+    total_query = total_query.where(*filters)
     
-    result = await db.execute(query)
-    loans = result.scalars().all()
+    # Pagination: seek past the cursor, or fall back to OFFSET
+    # (id breaks ties for keyset paging)
+    query = query.order_by(desc(BorrowRecord.borrowed_at), desc(BorrowRecord.id))
+    if cursor:
+        cursor_borrowed_at, cursor_id = decode_cursor(cursor)
+        query = query.where(
+            tuple_(BorrowRecord.borrowed_at, BorrowRecord.id) < tuple_(cursor_borrowed_at, cursor_id)
+        )
+    else:
+        query = query.offset((page - 1) * page_size)
+    query = query.limit(page_size + 1)
     
-    total_pages = (total + page_size - 1) // page_size
+    # The count and the page run concurrently on separate connections
+    total, result = await asyncio.gather(
+        in_own_session(session_factory, lambda session: session.scalar(total_query)),
+        db.execute(query)
+    )
+    total = total or 0
+    loans = result.scalars().all()
     
-    # We need to manually construct the response if auto-mapping doesn't work deep enough, 
-    # but Pydantic's from_attributes (orm_mode) usually handles it if relationships are loaded.
-    # However, BorrowRecord model needs to have 'book' property if we want to map it directly to BorrowRecordDetailResponse.book
-    # But BorrowRecord has 'copy' which has 'book'.
-    # BorrowRecordDetailResponse expects 'book' at top level?
-    # Let's check BorrowRecordDetailResponse definition again.
-    # class BorrowRecordDetailResponse(BorrowRecordResponse):
-    #     book: Optional[BookResponse] = None
-    #     user: Optional[UserResponse] = None
-    #     copy: Optional[BookCopyResponse] = None
+    # The extra row only tells whether another page follows
+    next_cursor = None
+    if len(loans) > page_size:
+        loans = loans[:page_size]
+        next_cursor = encode_cursor(loans[-1], "borrowed_at")
     
-    # The SQLAlchemy model BorrowRecord has 'copy' and 'user'. 'copy' has 'book'.
-    # So 'book' is not directly on BorrowRecord.
-    # We might need to manually map it.
+    total_pages = (total + page_size - 1) // page_size
     
+    # BorrowRecord has no 'book'; the response takes it from copy.book.
+    # Relationships left out by ``fields`` are not loaded: fill them in
+    # empty for validation and drop them from the output below.
+    # A popular book shows up in many loans; validate each book once.
+    skipped = [name for name in _BOOK_RELATIONS if name not in book_relations]
+    books = {}
     items = []
     for loan in loans:
         item = BorrowRecordDetailResponse.model_validate(loan)
-        # Manually populate book from copy.book if available
-        if loan.copy and loan.copy.book:
-             # We need to validate book to BookResponse
-             from app.schemas.book import BookResponse
-             item.book = BookResponse.model_validate(loan.copy.book)
+        book = loan.copy.book
+        if book.id not in books:
+            books[book.id] = BookResponse.model_validate(
+                {name: [] if name in skipped else getattr(book, name) for name in BookResponse.model_fields},
+                from_attributes=True
+            )
+        item.book = books[book.id]
         items.append(item)
     
-    return PaginatedResponse(
+    # Build the exact response_model class so FastAPI passes it straight
+    # to the JSON serializer instead of revalidating it
+    body = PaginatedResponse[BorrowRecordDetailResponse](
         items=items,
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=total_pages
+        total_pages=total_pages,
+        next_cursor=next_cursor
     )
+    if skipped:
+        return Response(
+            content=body.model_dump_json(
+                by_alias=True, exclude={"items": {"__all__": {"book": set(skipped)}}}
+            ),
+            media_type="application/json"
+        )
+    return body
 
 @router.get("/stats")
 async def get_loan_stats(
@@ -103,17 +161,20 @@ async def get_loan_stats(
 ):
     """Get loan statistics"""
     
-    # Total active loans
-    active_loans = await db.scalar(
-        select(func.count()).where(BorrowRecord.status == BorrowStatus.ACTIVE)
-    ) or 0
-    
-    # Overdue loans (active and due_date < now)
-    overdue_loans = await db.scalar(
-        select(func.count())
+    # Both counts from one scan of the active rows (which the partial
+    # ix_borrow_records_active_due index covers)
+    counts = (await db.execute(
+        select(
+            # Total active loans
+            func.count().label("active"),
+            # Overdue loans (active and due_date < now)
+            func.count().filter(BorrowRecord.due_date < utcnow()).label("overdue"),
+        )
+        .select_from(BorrowRecord)
         .where(BorrowRecord.status == BorrowStatus.ACTIVE)
-        .where(BorrowRecord.due_date < func.now())
-    ) or 0
+    )).one()
+    active_loans = counts.active
+    overdue_loans = counts.overdue
     
     # Returned this week (simple count for now)
     # ...
@@ -1,12 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy import select, insert, update, delete, case, func, tuple_, lambda_stmt, bindparam
 from typing import Optional
 from uuid import UUID
 from math import ceil
-from datetime import datetime
+import asyncio
 
-from app.database import get_db
+from app.database import get_db, get_ro_session_factory
 from app.models.news import News
 from app.models.user import User
 from app.schemas.news import (
@@ -15,17 +15,27 @@ from app.schemas.news import (
     NewsResponse,
     NewsListResponse
 )
+from app.utils.cache import cache
+from app.utils.count import paginated_total, in_own_session
+from app.utils.cursor import encode_cursor, decode_cursor
+from app.utils.utcnow import utcnow
 from app.dependencies import get_current_user, require_librarian
 
 router = APIRouter(prefix="/news", tags=["News"])
 
+# Hot single-row lookup, built once at import time (lambda statements are
+# cached by SQLAlchemy, so per-request expression construction is skipped)
+GET_NEWS_BY_ID = lambda_stmt(lambda: select(News).where(News.id == bindparam("news_id")))
+
 
 @router.get("/", response_model=NewsListResponse)
 async def get_news_list(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     published_only: bool = Query(True),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Keyset cursor (next_cursor of the previous page)"),
+    db: AsyncSession = Depends(get_db),
+    session_factory: async_sessionmaker = Depends(get_ro_session_factory)
 ):
     """
     Get paginated list of news
@@ -33,37 +43,70 @@ async def get_news_list(
     - **page**: Page number (starts from 1)
     - **page_size**: Number of items per page
     - **published_only**: Show only published news (default: True)
+    - **cursor**: Continue after the page that returned this next_cursor
+      (published news only; takes precedence over page)
     """
-    # Base query
-    query = select(News)
+    # Pages change only when news are written, which drops the namespace
+    cache_key = ("list", page, page_size, published_only, cursor)
+    cached = cache.get("news", cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
+    filters = []
     
     # Filter published news for public access
     if published_only:
-        query = query.where(News.published == True)
-    
-    # Order by published date (newest first)
-    query = query.order_by(News.published_at.desc().nullslast(), News.created_at.desc())
+        filters.append(News.published == True)
     
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+    # Base query, ordered by published date (newest first). Published news
+    # always carry published_at (create, update and publish all keep it
+    # set), so that list can page by keyset on (published_at, id); drafts
+    # have none and keep the created_at order.
+    query = select(News).where(*filters)
+    keyset = published_only
+    if keyset:
+        query = query.order_by(News.published_at.desc(), News.id.desc())
+    else:
+        query = query.order_by(News.published_at.desc().nullslast(), News.created_at.desc())
     
-    # Apply pagination
-    offset = (page - 1) * page_size
-    query = query.offset(offset).limit(page_size)
+    # Apply pagination: seek past the cursor, or fall back to OFFSET
+    if cursor and keyset:
+        cursor_published_at, cursor_id = decode_cursor(cursor)
+        query = query.where(
+            tuple_(News.published_at, News.id) < tuple_(cursor_published_at, cursor_id)
+        )
+    else:
+        query = query.offset((page - 1) * page_size)
+    query = query.limit(page_size + 1)
     
-    # Execute query
-    result = await db.execute(query)
+    # Execute query; the total (estimated once the published list is
+    # large) is counted concurrently on a separate connection
+    total, result = await asyncio.gather(
+        in_own_session(session_factory, lambda session: paginated_total(session, News, filters)),
+        db.execute(query)
+    )
     news_items = result.scalars().all()
     
-    return NewsListResponse(
+    # The extra row only tells whether another page follows
+    next_cursor = None
+    if len(news_items) > page_size:
+        news_items = news_items[:page_size]
+        # A row without published_at (written before it was enforced) has
+        # no position to seek from; OFFSET paging still reaches past it
+        if keyset and news_items[-1].published_at is not None:
+            next_cursor = encode_cursor(news_items[-1], "published_at")
+    
+    body = NewsListResponse(
         items=[NewsResponse.model_validate(news) for news in news_items],
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=ceil(total / page_size) if total > 0 else 0
-    )
+        total_pages=ceil(total / page_size) if total > 0 else 0,
+        next_cursor=next_cursor
+    ).model_dump_json()
+    cache.set("news", cache_key, body)
+    
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/{news_id}", response_model=NewsResponse)
@@ -72,7 +115,7 @@ async def get_news(
     db: AsyncSession = Depends(get_db)
 ):
     """Get a specific news article by ID"""
-    result = await db.execute(select(News).where(News.id == news_id))
+    result = await db.execute(GET_NEWS_BY_ID, {"news_id": news_id})
     news = result.scalar_one_or_none()
     
     if not news:
@@ -89,7 +132,11 @@ async def get_news(
             detail="News not found"
         )
     
-    return NewsResponse.model_validate(news)
+    # Serialize here; FastAPI passes a Response through untouched
+    return Response(
+        content=NewsResponse.model_validate(news).model_dump_json(),
+        media_type="application/json"
+    )
 
 
 @router.post("/", response_model=NewsResponse, status_code=status.HTTP_201_CREATED)
@@ -100,23 +147,28 @@ async def create_news(
 ):
     """Create a new news article (librarian only)"""
 
-    # Use provided published_at or default to current time if published
-    published_at = news_data.published_at if news_data.published_at else (datetime.utcnow() if news_data.published else None)
-
-    new_news = News(
-        title=news_data.title,
-        content=news_data.content,
-        summary=news_data.summary,
-        cover_image=news_data.cover_image,
-        category=news_data.category,
-        author_id=current_user.id,
-        published=news_data.published,
-        published_at=published_at
+    # Use provided published_at or default to the database's current time if published
+    published_at = news_data.published_at if news_data.published_at else (utcnow() if news_data.published else None)
+
+    # Insert and read the row back (including DB-set timestamps) in one statement
+    result = await db.execute(
+        insert(News)
+        .values(
+            title=news_data.title,
+            content=news_data.content,
+            summary=news_data.summary,
+            cover_image=news_data.cover_image,
+            category=news_data.category,
+            author_id=current_user.id,
+            published=news_data.published,
+            published_at=published_at
+        )
+        .returning(News)
     )
+    new_news = result.scalar_one()
 
-    db.add(new_news)
     await db.commit()
-    await db.refresh(new_news)
+    cache.invalidate("news")
 
     return NewsResponse.model_validate(new_news)
 
@@ -130,7 +182,27 @@ async def update_news(
 ):
     """Update a news article (librarian only)"""
     
-    result = await db.execute(select(News).where(News.id == news_id))
+    # Update fields
+    update_data = news_data.model_dump(exclude_unset=True)
+    
+    if update_data.get('published_at') is None:
+        # A published news always carries published_at (the public list
+        # pages by it): publishing for the first time stamps it, and an
+        # explicit null only clears it on a draft
+        kept = func.coalesce(News.published_at, utcnow())
+        if update_data.get('published'):
+            update_data['published_at'] = case((News.published.is_(True), kept), else_=utcnow())
+        elif 'published_at' in update_data and update_data.get('published') is None:
+            update_data['published_at'] = case((News.published.is_(True), kept), else_=None)
+    
+    # Update and read the row back in one statement; no row means no such news
+    result = await db.execute(
+        update(News)
+        .where(News.id == news_id)
+        .values(**update_data)
+        .returning(News)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
     news = result.scalar_one_or_none()
     
     if not news:
@@ -139,17 +211,8 @@ async def update_news(
             detail="News not found"
         )
     
-    # Update fields
-    update_data = news_data.model_dump(exclude_unset=True)
-    
-    for field, value in update_data.items():
-        if field == 'published' and value and not news.published:
-            # Publishing for the first time
-            news.published_at = datetime.utcnow()
-        setattr(news, field, value)
-    
     await db.commit()
-    await db.refresh(news)
+    cache.invalidate("news")
     
     return NewsResponse.model_validate(news)
 
@@ -162,17 +225,19 @@ async def delete_news(
 ):
     """Delete a news article (librarian only)"""
     
-    result = await db.execute(select(News).where(News.id == news_id))
-    news = result.scalar_one_or_none()
+    # Delete in one statement; no row back means there was no such news
+    result = await db.execute(
+        delete(News).where(News.id == news_id).returning(News.id)
+    )
     
-    if not news:
+    if result.scalar_one_or_none() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="News not found"
         )
     
-    await db.delete(news)
     await db.commit()
+    cache.invalidate("news")
     
     return None
 
@@ -185,7 +250,18 @@ async def toggle_publish_news(
 ):
     """Toggle publish status of a news article (librarian only)"""
 
-    result = await db.execute(select(News).where(News.id == news_id))
+    # Toggle in one statement: unpublishing clears published_at, publishing
+    # stamps it. SET expressions see the row's values from before the update.
+    result = await db.execute(
+        update(News)
+        .where(News.id == news_id)
+        .values(
+            published=News.published.is_not(True),
+            published_at=case((News.published.is_(True), None), else_=utcnow())
+        )
+        .returning(News)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
     news = result.scalar_one_or_none()
 
     if not news:
@@ -193,18 +269,8 @@ async def toggle_publish_news(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="News not found"
         )
-
-    # Toggle published status
-    if news.published:
-        # Unpublish
-        news.published = False
-        news.published_at = None
-    else:
-        # Publish
-        news.published = True
-        news.published_at = datetime.utcnow()
     
     await db.commit()
-    await db.refresh(news)
+    cache.invalidate("news")
     
     return NewsResponse.model_validate(news)
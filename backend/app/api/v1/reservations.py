@@ -1,13 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy import select, update, func, exists, case, lambda_stmt, bindparam
 from sqlalchemy.orm import selectinload
 from typing import Optional
 from uuid import UUID
 from math import ceil
 from datetime import datetime, timedelta
+import asyncio
 
-from app.database import get_db
+from app.database import get_db, get_ro_session_factory
 from app.models.user import User
 from app.models.book import Book
 from app.models.book_copy import BookCopy
@@ -19,10 +20,22 @@ from app.schemas.reservation import (
     ReservationWithDetails,
     ReservationStatus
 )
+from app.utils.count import in_own_session
+from app.utils.utcnow import utcnow
 from app.dependencies import get_current_user, require_librarian
 
 router = APIRouter(prefix="/reservations", tags=["Reservations"])
 
+# Hot single-row lookups, built once at import time (lambda statements are
+# cached by SQLAlchemy, so per-request expression construction is skipped)
+GET_RESERVATION_BY_ID = lambda_stmt(
+    lambda: select(Reservation).where(Reservation.id == bindparam("reservation_id"))
+)
+RESERVATION_STATUS = lambda_stmt(
+    lambda: select(Reservation.status).where(Reservation.id == bindparam("reservation_id"))
+)
+BOOK_EXISTS = lambda_stmt(lambda: select(exists().where(Book.id == bindparam("book_id"))))
+
 
 @router.post("/", response_model=ReservationResponse, status_code=status.HTTP_201_CREATED)
 async def create_reservation(
@@ -36,61 +49,63 @@ async def create_reservation(
     Users can reserve a book when all copies are currently borrowed.
     Reservations expire after 48 hours.
     """
-    # Check if book exists
-    result = await db.execute(select(Book).where(Book.id == reservation_data.book_id))
-    book = result.scalar_one_or_none()
-    
-    if not book:
+    book_id = reservation_data.book_id
+    
+    # Evaluate every business rule in one round-trip
+    checks = (await db.execute(select(
+        # Book exists
+        exists().where(Book.id == book_id).label("book_exists"),
+        # User already has an active reservation for this book
+        exists().where(
+            Reservation.user_id == current_user.id,
+            Reservation.book_id == book_id,
+            Reservation.status == ReservationStatus.PENDING
+        ).label("has_reservation"),
+        # Book has an available copy
+        exists().where(
+            BookCopy.book_id == book_id,
+            BookCopy.status == "AVAILABLE"
+        ).label("has_copy"),
+    ))).one()
+    
+    if not checks.book_exists:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Book not found"
         )
     
-    # Check if user already has an active reservation for this book
-    existing_reservation = await db.execute(
-        select(Reservation).where(
-            and_(
-                Reservation.user_id == current_user.id,
-                Reservation.book_id == reservation_data.book_id,
-                Reservation.status == ReservationStatus.PENDING
-            )
-        )
-    )
-    if existing_reservation.scalar_one_or_none():
+    if checks.has_reservation:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="You already have an active reservation for this book"
         )
     
-    # Check if there are any available copies
-    available_copies = await db.execute(
-        select(func.count()).where(
-            and_(
-                BookCopy.book_id == reservation_data.book_id,
-                BookCopy.status == "AVAILABLE"
-            )
-        )
-    )
-    if available_copies.scalar() > 0:
+    if checks.has_copy:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Book has available copies. Please borrow directly instead of reserving."
         )
     
     # Create reservation
+    now = datetime.utcnow()
     new_reservation = Reservation(
         user_id=current_user.id,
-        book_id=reservation_data.book_id,
+        book_id=book_id,
         status=ReservationStatus.PENDING,
-        reserved_at=datetime.utcnow(),
-        expires_at=datetime.utcnow() + timedelta(hours=48)
+        reserved_at=now,
+        expires_at=now + timedelta(hours=48)
     )
     
     db.add(new_reservation)
+    
+    # id and created_at are client-side defaults, so no refresh is needed
     await db.commit()
-    await db.refresh(new_reservation)
     
-    return ReservationResponse.model_validate(new_reservation)
+    return Response(
+        content=ReservationResponse.model_validate(new_reservation).model_dump_json(),
+        status_code=status.HTTP_201_CREATED,
+        media_type="application/json"
+    )
 
 
 @router.get("/", response_model=ReservationListResponse)
@@ -99,7 +114,8 @@ async def get_user_reservations(
     page_size: int = Query(20, ge=1, le=100),
     status_filter: Optional[ReservationStatus] = None,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    session_factory: async_sessionmaker = Depends(get_ro_session_factory)
 ):
     """
     Get current user's reservations
@@ -108,36 +124,40 @@ async def get_user_reservations(
     - **page_size**: Number of items per page
     - **status_filter**: Filter by status (PENDING, FULFILLED, CANCELLED, EXPIRED)
     """
-    # Base query
-    query = select(Reservation).where(Reservation.user_id == current_user.id)
+    filters = [Reservation.user_id == current_user.id]
     
     # Apply status filter
     if status_filter:
-        query = query.where(Reservation.status == status_filter)
-    
-    # Order by reserved_at (newest first)
-    query = query.order_by(Reservation.reserved_at.desc())
+        filters.append(Reservation.status == status_filter)
     
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+    # Base query, ordered by reserved_at (newest first)
+    query = select(Reservation).where(*filters).order_by(Reservation.reserved_at.desc())
     
     # Apply pagination
     offset = (page - 1) * page_size
     query = query.offset(offset).limit(page_size)
     
-    # Execute query
-    result = await db.execute(query)
+    # Count total. A user's own list stays small, so an exact count beats
+    # an EXPLAIN round trip and a cached estimate per user
+    count_query = select(func.count()).select_from(Reservation).where(*filters)
+    
+    # Execute query; the count runs concurrently on a separate connection
+    total, result = await asyncio.gather(
+        in_own_session(session_factory, lambda session: session.scalar(count_query)),
+        db.execute(query)
+    )
+    total = total or 0
     reservations = result.scalars().all()
     
-    return ReservationListResponse(
+    # Serialize here; FastAPI passes a Response through untouched
+    body = ReservationListResponse(
         items=[ReservationResponse.model_validate(r) for r in reservations],
         total=total,
         page=page,
         page_size=page_size,
         total_pages=ceil(total / page_size) if total > 0 else 0
-    )
+    ).model_dump_json()
+    return Response(content=body, media_type="application/json")
 
 
 @router.delete("/{reservation_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -147,10 +167,25 @@ async def cancel_reservation(
     db: AsyncSession = Depends(get_db)
 ):
     """Cancel own reservation (user)"""
-    # Get reservation
+    # Cancel in one statement; ownership and status are enforced by the WHERE
     result = await db.execute(
-        select(Reservation).where(Reservation.id == reservation_id)
+        update(Reservation)
+        .where(
+            Reservation.id == reservation_id,
+            Reservation.user_id == current_user.id,
+            Reservation.status == ReservationStatus.PENDING
+        )
+        .values(status=ReservationStatus.CANCELLED)
+        .returning(Reservation.id)
+        .execution_options(synchronize_session=False)
     )
+    
+    if result.scalar_one_or_none() is not None:
+        await db.commit()
+        return None
+    
+    # Nothing updated: find out why
+    result = await db.execute(GET_RESERVATION_BY_ID, {"reservation_id": reservation_id})
     reservation = result.scalar_one_or_none()
     
     if not reservation:
@@ -166,18 +201,11 @@ async def cancel_reservation(
             detail="You can only cancel your own reservations"
         )
     
-    # Check if reservation is pending
-    if reservation.status != ReservationStatus.PENDING:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Cannot cancel reservation with status: {reservation.status}"
-        )
-    
-    # Cancel reservation
-    reservation.status = ReservationStatus.CANCELLED
-    await db.commit()
-    
-    return None
+    # Own reservation that is no longer pending
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Cannot cancel reservation with status: {reservation.status}"
+    )
 
 
 @router.get("/book/{book_id}", response_model=ReservationListResponse)
@@ -186,7 +214,8 @@ async def get_book_reservations(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     current_user: User = Depends(require_librarian),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    session_factory: async_sessionmaker = Depends(get_ro_session_factory)
 ):
     """
     Get all reservations for a book (librarian only)
@@ -194,51 +223,44 @@ async def get_book_reservations(
     Reservations are ordered by reserved_at (FIFO queue)
     """
     # Check if book exists
-    result = await db.execute(select(Book).where(Book.id == book_id))
-    book = result.scalar_one_or_none()
-    
-    if not book:
+    if not await db.scalar(BOOK_EXISTS, {"book_id": book_id}):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Book not found"
         )
     
-    # Base query - get pending reservations
-    query = select(Reservation).where(
-        and_(
-            Reservation.book_id == book_id,
-            Reservation.status == ReservationStatus.PENDING
-        )
-    )
+    # Pending reservations of the book
+    filters = [
+        Reservation.book_id == book_id,
+        Reservation.status == ReservationStatus.PENDING
+    ]
     
-    # Order by reserved_at (FIFO - first in, first out)
-    query = query.order_by(Reservation.reserved_at.asc())
+    # Base query, ordered by reserved_at (FIFO - first in, first out)
+    query = select(Reservation).where(*filters).order_by(Reservation.reserved_at.asc())
     
-    # Get total count
-    count_query = select(func.count()).where(
-        and_(
-            Reservation.book_id == book_id,
-            Reservation.status == ReservationStatus.PENDING
-        )
-    )
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+    # Total count
+    count_query = select(func.count()).select_from(Reservation).where(*filters)
     
     # Apply pagination
     offset = (page - 1) * page_size
     query = query.offset(offset).limit(page_size)
     
-    # Execute query
-    result = await db.execute(query)
+    # Execute query; the count runs concurrently on a separate connection
+    total, result = await asyncio.gather(
+        in_own_session(session_factory, lambda session: session.scalar(count_query)),
+        db.execute(query)
+    )
     reservations = result.scalars().all()
     
-    return ReservationListResponse(
+    # Serialize here; FastAPI passes a Response through untouched
+    body = ReservationListResponse(
         items=[ReservationResponse.model_validate(r) for r in reservations],
         total=total,
         page=page,
         page_size=page_size,
         total_pages=ceil(total / page_size) if total > 0 else 0
-    )
+    ).model_dump_json()
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("/{reservation_id}/fulfill", response_model=ReservationResponse)
@@ -252,38 +274,50 @@ async def fulfill_reservation(
     
     Used when librarian manually assigns a book to a user with reservation
     """
-    # Get reservation
+    # Transition a pending reservation in one statement: expired ones
+    # become EXPIRED, the rest FULFILLED (both against the database clock)
+    now = utcnow()
+    expired = Reservation.expires_at < now
     result = await db.execute(
-        select(Reservation).where(Reservation.id == reservation_id)
+        update(Reservation)
+        .where(
+            Reservation.id == reservation_id,
+            Reservation.status == ReservationStatus.PENDING
+        )
+        .values(
+            status=case(
+                (expired, ReservationStatus.EXPIRED),
+                else_=ReservationStatus.FULFILLED
+            ),
+            fulfilled_at=case((expired, None), else_=now)
+        )
+        .returning(Reservation)
+        .execution_options(synchronize_session=False, populate_existing=True)
     )
     reservation = result.scalar_one_or_none()
     
     if not reservation:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Reservation not found"
-        )
-    
-    # Check if reservation is pending
-    if reservation.status != ReservationStatus.PENDING:
+        # Nothing updated: missing, or no longer pending
+        current_status = await db.scalar(RESERVATION_STATUS, {"reservation_id": reservation_id})
+        if current_status is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Reservation not found"
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Cannot fulfill reservation with status: {reservation.status}"
+            detail=f"Cannot fulfill reservation with status: {current_status}"
         )
     
-    # Check if reservation has expired
-    if reservation.is_expired:
-        reservation.status = ReservationStatus.EXPIRED
-        await db.commit()
+    await db.commit()
+    
+    if reservation.status == ReservationStatus.EXPIRED:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Reservation has expired"
         )
     
-    # Mark as fulfilled
-    reservation.status = ReservationStatus.FULFILLED
-    reservation.fulfilled_at = datetime.utcnow()
-    await db.commit()
-    await db.refresh(reservation)
-    
-    return ReservationResponse.model_validate(reservation)
+    return Response(
+        content=ReservationResponse.model_validate(reservation).model_dump_json(),
+        media_type="application/json"
+    )
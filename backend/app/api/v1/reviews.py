@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
-from typing import Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy import select, func, exists, lambda_stmt, bindparam
+from sqlalchemy.orm import raiseload
+from pydantic import TypeAdapter
+from typing import List, Optional
 from uuid import UUID
 from math import ceil
 
-from app.database import get_db
+from app.config import settings
+from app.database import get_db, get_session_factory
 from app.models.user import User
 from app.models.book import Book
 from app.models.review import Review
@@ -18,30 +21,50 @@ from app.schemas.review import (
     BookRatingStats
 )
 from app.dependencies import get_current_user
-from app.utils.rating_calculator import update_book_rating, get_rating_distribution
+from app.utils.cache import cache
+from app.utils.rating_calculator import refresh_book_rating, get_rating_distribution
 
 router = APIRouter(tags=["Reviews"])
 
+# Existence probes select a boolean instead of loading the row
+BOOK_EXISTS = lambda_stmt(lambda: select(exists().where(Book.id == bindparam("book_id"))))
+
+# Validates a whole page of reviews in one call
+_REVIEW_LIST = TypeAdapter(List[ReviewResponse])
+
+
+async def _ensure_book_exists(db: AsyncSession, book_id: UUID) -> None:
+    """
+    Raise 404 unless the book exists.
+
+    Positive answers are cached briefly in the "books" namespace, which
+    every book write (including deletion) invalidates.
+    """
+    if cache.get("books", ("exists", book_id)):
+        return
+
+    if not await db.scalar(BOOK_EXISTS, {"book_id": book_id}):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Book not found"
+        )
+    cache.set("books", ("exists", book_id), True, ttl=30)
+
 
 @router.post("/books/{book_id}/reviews", response_model=ReviewResponse, status_code=status.HTTP_201_CREATED)
 async def create_review(
     book_id: UUID,
     review_data: ReviewCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    session_factory: async_sessionmaker = Depends(get_session_factory)
 ):
     """
     Create a review for a book (any authenticated user can review)
     """
     # Check if book exists
-    book_result = await db.execute(select(Book).where(Book.id == book_id))
-    book = book_result.scalar_one_or_none()
-
-    if not book:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Book not found"
-        )
+    await _ensure_book_exists(db, book_id)
 
     # Note: Removed borrow requirement - any authenticated user can review
     # # Check if user has borrowed this book before
@@ -70,15 +93,11 @@ async def create_review(
     #     )
     
     # Check if user already reviewed this book
-    existing_review = await db.execute(
-        select(Review).where(
-            and_(
-                Review.user_id == current_user.id,
-                Review.book_id == book_id
-            )
-        )
-    )
-    if existing_review.scalar_one_or_none():
+    already_reviewed = await db.scalar(select(exists().where(
+        Review.user_id == current_user.id,
+        Review.book_id == book_id
+    )))
+    if already_reviewed:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="You have already reviewed this book. Use PUT to update your review."
@@ -96,8 +115,8 @@ async def create_review(
     await db.commit()
     await db.refresh(new_review)
     
-    # Update book's average rating
-    await update_book_rating(db, book_id)
+    # Recompute the book's average rating after the response is sent
+    background_tasks.add_task(refresh_book_rating, session_factory, book_id)
     
     return ReviewResponse.model_validate(new_review)
 
@@ -116,15 +135,17 @@ async def get_book_reviews(
     - **sort_by**: newest, oldest, highest (rating), lowest (rating)
     """
     # Check if book exists
-    book_result = await db.execute(select(Book).where(Book.id == book_id))
-    if not book_result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Book not found"
-        )
-    
-    # Base query
-    query = select(Review).where(Review.book_id == book_id)
+    await _ensure_book_exists(db, book_id)
+    
+    # Base query, with the reviewer's name joined in; COUNT(*) OVER()
+    # carries the total on every page row. Review relationships are never
+    # needed, so raiseload turns an accidental lazy load into an error.
+    query = (
+        select(Review, User.username, User.full_name, func.count().over().label("total"))
+        .join(User, Review.user_id == User.id)
+        .where(Review.book_id == book_id)
+        .options(raiseload("*"))
+    )
     
     # Apply sorting
     if sort_by == "newest":
@@ -136,30 +157,25 @@ async def get_book_reviews(
     elif sort_by == "lowest":
         query = query.order_by(Review.rating.asc(), Review.created_at.desc())
     
-    # Get total count
-    count_query = select(func.count()).where(Review.book_id == book_id)
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
-    
     # Apply pagination
     offset = (page - 1) * page_size
     query = query.offset(offset).limit(page_size)
     
     # Execute query
     result = await db.execute(query)
-    reviews = result.scalars().all()
-    
-    # Enrich with user info
-    review_responses = []
-    for review in reviews:
-        user_result = await db.execute(select(User).where(User.id == review.user_id))
-        user = user_result.scalar_one_or_none()
-        
-        review_dict = ReviewResponse.model_validate(review).model_dump()
-        if user:
-            review_dict['user_username'] = user.username
-            review_dict['user_full_name'] = user.full_name
-        review_responses.append(ReviewResponse(**review_dict))
+    rows = result.all()
+    
+    if rows:
+        total = rows[0].total
+    else:
+        # Past the last page the window has no rows to report the total on
+        total = await db.scalar(select(func.count()).where(Review.book_id == book_id))
+    
+    # Validate the page at once, then enrich with user info from the same rows
+    review_responses = _REVIEW_LIST.validate_python([row.Review for row in rows], from_attributes=True)
+    for item, row in zip(review_responses, rows):
+        item.user_username = row.username
+        item.user_full_name = row.full_name
     
     return ReviewListResponse(
         items=review_responses,
@@ -174,8 +190,10 @@ async def get_book_reviews(
 async def update_review(
     review_id: UUID,
     review_data: ReviewUpdate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    session_factory: async_sessionmaker = Depends(get_session_factory)
 ):
     """Update own review"""
     # Get review
@@ -203,8 +221,8 @@ async def update_review(
     await db.commit()
     await db.refresh(review)
     
-    # Update book's average rating
-    await update_book_rating(db, review.book_id)
+    # Recompute the book's average rating after the response is sent
+    background_tasks.add_task(refresh_book_rating, session_factory, review.book_id)
     
     return ReviewResponse.model_validate(review)
 
@@ -212,8 +230,10 @@ async def update_review(
 @router.delete("/reviews/{review_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_review(
     review_id: UUID,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    session_factory: async_sessionmaker = Depends(get_session_factory)
 ):
     """Delete own review"""
     # Get review
@@ -238,8 +258,8 @@ async def delete_review(
     await db.delete(review)
     await db.commit()
     
-    # Update book's average rating
-    await update_book_rating(db, book_id)
+    # Recompute the book's average rating after the response is sent
+    background_tasks.add_task(refresh_book_rating, session_factory, book_id)
     
     return None
 
@@ -252,14 +272,14 @@ async def get_my_reviews(
     db: AsyncSession = Depends(get_db)
 ):
     """Get current user's reviews"""
-    # Base query
-    query = select(Review).where(Review.user_id == current_user.id)
-    query = query.order_by(Review.created_at.desc())
-    
-    # Get total count
-    count_query = select(func.count()).where(Review.user_id == current_user.id)
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+    # Base query; COUNT(*) OVER() carries the total on every page row
+    # (no relationships are needed: raiseload guards against lazy loads)
+    query = (
+        select(Review, func.count().over().label("total"))
+        .where(Review.user_id == current_user.id)
+        .options(raiseload("*"))
+        .order_by(Review.created_at.desc())
+    )
     
     # Apply pagination
     offset = (page - 1) * page_size
@@ -267,10 +287,17 @@ async def get_my_reviews(
     
     # Execute query
     result = await db.execute(query)
-    reviews = result.scalars().all()
+    rows = result.all()
+    
+    if rows:
+        total = rows[0].total
+    else:
+        # Past the last page the window has no rows to report the total on
+        total = await db.scalar(select(func.count()).where(Review.user_id == current_user.id))
+    reviews = [row.Review for row in rows]
     
     return ReviewListResponse(
-        items=[ReviewResponse.model_validate(r) for r in reviews],
+        items=_REVIEW_LIST.validate_python(reviews, from_attributes=True),
         total=total,
         page=page,
         page_size=page_size,
@@ -283,10 +310,21 @@ async def get_book_rating_stats(
     book_id: UUID,
     db: AsyncSession = Depends(get_db)
 ):
-    """Get rating statistics for a book"""
-    # Check if book exists
-    book_result = await db.execute(select(Book).where(Book.id == book_id))
-    book = book_result.scalar_one_or_none()
+    """
+    Get rating statistics for a book
+
+    Cached in the "books" namespace; review writes invalidate it through
+    update_book_rating.
+    """
+    cached = cache.get("books", ("rating_stats", book_id))
+    if cached is not None:
+        return cached
+    
+    # Check if book exists, loading only the cached rating columns
+    book_result = await db.execute(
+        select(Book.average_rating, Book.total_reviews).where(Book.id == book_id)
+    )
+    book = book_result.one_or_none()
     
     if not book:
         raise HTTPException(
@@ -297,8 +335,11 @@ async def get_book_rating_stats(
     # Get rating distribution
     distribution = await get_rating_distribution(db, book_id)
     
-    return BookRatingStats(
+    stats = BookRatingStats(
         average_rating=book.average_rating,
         total_reviews=book.total_reviews,
         rating_distribution=distribution
     )
+    cache.set("books", ("rating_stats", book_id), stats, ttl=settings.RATING_STATS_CACHE_TTL_SECONDS)
+    
+    return stats
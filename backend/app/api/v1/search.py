@@ -1,16 +1,25 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, and_, func
+from sqlalchemy import select, and_, func, case
+from sqlalchemy.orm import raiseload
+from pydantic import TypeAdapter
 from typing import Optional, List
+from uuid import UUID
 from math import ceil
 
+from app.config import settings
 from app.database import get_db
 from app.models.book import Book, Author, Genre
 from app.schemas.book import BookResponse, BookListResponse
 from app.services.elasticsearch_service import es_service
+from app.utils.cache import cache
+from app.api.v1.books import BOOK_EAGER, book_search_filter
 
 router = APIRouter(prefix="/search", tags=["Search"])
 
+# Validates a whole page of books in one call
+_BOOK_LIST = TypeAdapter(List[BookResponse])
+
 
 @router.get("/books", response_model=BookListResponse)
 async def search_books(
@@ -49,55 +58,42 @@ async def search_books(
         
         if es_result["total"] > 0 or q:  # Use ES results if available or if searching
             # Convert ES results to BookResponse
-            book_ids = [hit["id"] for hit in es_result["hits"]]
+            book_ids = [UUID(hit["id"]) for hit in es_result["hits"]]
             
             if book_ids:
-                # Fetch full book objects from database
-                from sqlalchemy.orm import selectinload
-                books_query = select(Book).options(
-                    selectinload(Book.authors),
-                    selectinload(Book.genres),
-                    selectinload(Book.keywords)
-                ).where(Book.id.in_(book_ids))
+                # Fetch full book objects from database, already in ES rank
+                # order (a portable CASE rather than PostgreSQL's array_position)
+                rank = case({book_id: i for i, book_id in enumerate(book_ids)}, value=Book.id)
+                books_query = (
+                    select(Book)
+                    .options(*BOOK_EAGER, raiseload("*"))
+                    .where(Book.id.in_(book_ids))
+                    .order_by(rank)
+                )
                 
                 result = await db.execute(books_query)
-                books = result.scalars().all()
-                
-                # Maintain ES order
-                books_dict = {str(book.id): book for book in books}
-                ordered_books = [books_dict[book_id] for book_id in book_ids if book_id in books_dict]
+                ordered_books = result.scalars().all()
             else:
                 ordered_books = []
             
             return BookListResponse(
-                items=[BookResponse.model_validate(book) for book in ordered_books],
+                items=_BOOK_LIST.validate_python(ordered_books, from_attributes=True),
                 total=es_result["total"],
                 page=page,
                 page_size=page_size,
                 total_pages=ceil(es_result["total"] / page_size) if es_result["total"] > 0 else 0
             )
     
-    # Fallback to database search
-    from sqlalchemy.orm import selectinload
-    
-    query = select(Book).options(
-        selectinload(Book.authors),
-        selectinload(Book.genres),
-        selectinload(Book.keywords)
-    )
+    # Fallback to database search; COUNT(*) OVER() carries the filtered
+    # total on every page row. Relationships outside BOOK_EAGER raise
+    # instead of lazy loading one query per book.
+    query = select(Book, func.count().over().label("total")).options(*BOOK_EAGER, raiseload("*"))
     
     filters = []
     
-    # Text search (simple LIKE)
+    # Text search (full-text on PostgreSQL, LIKE otherwise)
     if q:
-        search_pattern = f"%{q}%"
-        filters.append(
-            or_(
-                Book.title.ilike(search_pattern),
-                Book.description.ilike(search_pattern),
-                Book.isbn.ilike(search_pattern)
-            )
-        )
+        filters.append(book_search_filter(db, q))
     
     # Genre filter
     if genres:
@@ -128,11 +124,6 @@ async def search_books(
     if filters:
         query = query.where(and_(*filters))
     
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
-    
     # Apply pagination
     offset = (page - 1) * page_size
     query = query.offset(offset).limit(page_size)
@@ -140,10 +131,17 @@ async def search_books(
     
     # Execute
     result = await db.execute(query)
-    books = result.scalars().all()
+    rows = result.all()
+    
+    if rows:
+        total = rows[0].total
+    else:
+        # Past the last page the window has no rows to report the total on
+        total = await db.scalar(select(func.count(Book.id)).where(*filters))
+    books = [row.Book for row in rows]
     
     return BookListResponse(
-        items=[BookResponse.model_validate(book) for book in books],
+        items=_BOOK_LIST.validate_python(books, from_attributes=True),
         total=total,
         page=page,
         page_size=page_size,
@@ -158,9 +156,19 @@ async def suggest_books(
 ):
     """
     Autocomplete suggestions for book titles
+    
+    Many users type the same prefixes, so suggestions are cached briefly
+    per (prefix, size); completion matching is case-insensitive.
     """
     if es_service.enabled:
-        suggestions = await es_service.suggest_books(q, size)
+        cache_key = (q.lower(), size)
+        suggestions = cache.get("suggest", cache_key)
+        if suggestions is None:
+            suggestions = await es_service.suggest_books(q, size)
+            if suggestions is None:
+                # Lookup failed: answer empty, but don't cache the failure
+                return {"suggestions": []}
+            cache.set("suggest", cache_key, suggestions, ttl=settings.SUGGEST_CACHE_TTL_SECONDS)
         return {"suggestions": suggestions}
     
     # Fallback: return empty
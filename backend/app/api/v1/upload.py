@@ -1,14 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, update
 from uuid import UUID
 
 from app.database import get_db
 from app.models.book import Book
 from app.models.user import User
-from app.schemas.book import BookResponse, LocationSchema
+from app.schemas.book import BookResponse
+from app.api.v1.books import BOOK_EAGER
 from app.dependencies import require_librarian
+from app.utils.cache import cache
 from app.utils.file_handler import save_upload_file, delete_upload_file, validate_image_file
 
 router = APIRouter(prefix="/upload", tags=["File Upload"])
@@ -60,11 +61,7 @@ async def upload_book_cover(
     validate_image_file(file)
     
     # Get book
-    query = select(Book).options(
-        selectinload(Book.authors),
-        selectinload(Book.genres),
-        selectinload(Book.keywords)
-    ).where(Book.id == book_id)
+    query = select(Book).options(*BOOK_EAGER).where(Book.id == book_id)
     
     result = await db.execute(query)
     book = result.scalar_one_or_none()
@@ -85,19 +82,10 @@ async def upload_book_cover(
         book.cover_url = cover_path
         
         await db.commit()
+        cache.invalidate("books")
         await db.refresh(book, ['authors', 'genres', 'keywords'])
         
-        return BookResponse.model_validate({
-            **{k: getattr(book, k) for k in ['id', 'title', 'description', 'isbn', 'publisher', 'publication_year', 'pages', 'cover_url', 'created_at', 'updated_at']},
-            'authors': book.authors,
-            'genres': book.genres,
-            'keywords': book.keywords,
-            'location': LocationSchema(
-                floor=book.floor or '',
-                shelf=book.shelf or '',
-                row=book.row or ''
-            )
-        })
+        return BookResponse.model_validate(book)
     except HTTPException:
         raise
     except Exception as e:
@@ -118,9 +106,9 @@ async def delete_book_cover(
     
     - **book_id**: ID of the book
     """
-    # Get book
-    result = await db.execute(select(Book).where(Book.id == book_id))
-    book = result.scalar_one_or_none()
+    # Get the book's cover path (a missing row means no such book)
+    result = await db.execute(select(Book.cover_url).where(Book.id == book_id))
+    book = result.one_or_none()
     
     if not book:
         raise HTTPException(
@@ -138,8 +126,14 @@ async def delete_book_cover(
     await delete_upload_file(book.cover_url)
     
     # Update database
-    book.cover_url = None
+    await db.execute(
+        update(Book)
+        .where(Book.id == book_id)
+        .values(cover_url=None)
+        .execution_options(synchronize_session=False)
+    )
     await db.commit()
+    cache.invalidate("books")
     
     return None
 
@@ -162,9 +156,9 @@ async def upload_news_cover(
     # Validate file is an image
     validate_image_file(file)
     
-    # Get news
-    result = await db.execute(select(News).where(News.id == news_id))
-    news = result.scalar_one_or_none()
+    # Get the current cover path (a missing row means no such news)
+    result = await db.execute(select(News.cover_image).where(News.id == news_id))
+    news = result.one_or_none()
     
     if not news:
         raise HTTPException(
@@ -179,12 +173,21 @@ async def upload_news_cover(
     # Save new cover
     try:
         cover_path = await save_upload_file(file, subdirectory="news")
-        news.cover_image = cover_path
+        
+        # Store it and read the updated row back in one statement
+        result = await db.execute(
+            update(News)
+            .where(News.id == news_id)
+            .values(cover_image=cover_path)
+            .returning(News)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        updated = result.scalar_one()
         
         await db.commit()
-        await db.refresh(news)
+        cache.invalidate("news")
         
-        return NewsResponse.model_validate(news)
+        return NewsResponse.model_validate(updated)
     except HTTPException:
         raise
     except Exception as e:
@@ -13,6 +13,12 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True
+    DB_USE_NULL_POOL: bool = False  # Set to True behind PgBouncer (transaction pooling)
     
     # Security
     SECRET_KEY: str
@@ -40,6 +46,16 @@ class Settings(BaseSettings):
     # Background Task Scheduler
     NEWS_PUBLISH_INTERVAL_HOURS: int = 1  # Check for scheduled news every N hours (1 or 12)
     NEWS_SCHEDULER_ENABLED: bool = True  # Enable/disable background scheduler
+    RESERVATION_EXPIRY_INTERVAL_MINUTES: int = 5  # Expire stale reservations every N minutes
+    
+    # Response cache (in-process)
+    CACHE_ENABLED: bool = True
+    CACHE_TTL_SECONDS: int = 60
+    CACHE_MAX_ENTRIES: int = 1000  # Per namespace
+    ANALYTICS_CACHE_TTL_SECONDS: int = 900  # Dashboard rankings (popular books/genres, active users)
+    RATING_STATS_CACHE_TTL_SECONDS: int = 300  # Per-book rating distribution
+    SUGGEST_CACHE_TTL_SECONDS: int = 60  # Title autocomplete per prefix
+    COUNT_ESTIMATE_THRESHOLD: int = 10000  # List totals above this come from the planner estimate
     
     model_config = SettingsConfigDict(
         env_file=".env",
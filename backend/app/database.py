@@ -1,15 +1,30 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import NullPool
 from app.config import settings
 
+
+def _pool_options() -> dict:
+    """Connection pool options for the async engine"""
+    if settings.DB_USE_NULL_POOL:
+        # An external pooler (e.g. PgBouncer) multiplexes connections
+        return {"poolclass": NullPool}
+
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
     future=True,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+    **_pool_options()
 )
 
 # Create async session factory
@@ -21,6 +36,16 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False
 )
 
+# Session factory for read-only endpoints: AUTOCOMMIT skips the
+# BEGIN/COMMIT round trips around each request's SELECTs
+ReadOnlySessionLocal = async_sessionmaker(
+    engine.execution_options(isolation_level="AUTOCOMMIT"),
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False
+)
+
 # Base class for models
 Base = declarative_base()
 
@@ -41,6 +66,32 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
+async def get_ro_db() -> AsyncSession:
+    """
+    Dependency function to get a read-only database session.
+    Use for GET endpoints that never write; nothing is committed.
+    """
+    async with ReadOnlySessionLocal() as session:
+        yield session
+
+
+def get_ro_session_factory() -> async_sessionmaker:
+    """
+    Dependency returning the read-only session factory.
+    For endpoints that run independent queries concurrently, each on its
+    own session (an AsyncSession cannot run statements in parallel).
+    """
+    return ReadOnlySessionLocal
+
+
+def get_session_factory() -> async_sessionmaker:
+    """
+    Dependency returning the read-write session factory.
+    For background tasks that write after the request's session is closed.
+    """
+    return AsyncSessionLocal
+
+
 async def init_db():
     """Initialize database tables"""
     async with engine.begin() as conn:
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Text, ForeignKey, Table, DateTime
+from sqlalchemy import Column, String, Integer, Text, ForeignKey, Table, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -12,14 +12,18 @@ book_authors = Table(
     'book_authors',
     Base.metadata,
     Column('book_id', GUID(), ForeignKey('books.id', ondelete='CASCADE'), primary_key=True),
-    Column('author_id', GUID(), ForeignKey('authors.id', ondelete='CASCADE'), primary_key=True)
+    Column('author_id', GUID(), ForeignKey('authors.id', ondelete='CASCADE'), primary_key=True),
+    # The primary key leads with book_id; author -> books lookups use this one
+    Index('ix_book_authors_author_book', 'author_id', 'book_id')
 )
 
 book_genres = Table(
     'book_genres',
     Base.metadata,
     Column('book_id', GUID(), ForeignKey('books.id', ondelete='CASCADE'), primary_key=True),
-    Column('genre_id', GUID(), ForeignKey('genres.id', ondelete='CASCADE'), primary_key=True)
+    Column('genre_id', GUID(), ForeignKey('genres.id', ondelete='CASCADE'), primary_key=True),
+    # Genre -> books lookups (the primary key leads with book_id)
+    Index('ix_book_genres_genre_book', 'genre_id', 'book_id')
 )
 
 book_keywords = Table(
@@ -59,6 +63,25 @@ class Book(Base):
     average_rating = Column(Integer, nullable=True)  # Cached average rating (1-5)
     total_reviews = Column(Integer, default=0)
     
+    # Copy counters, maintained by database triggers on book_copies
+    total_copies = Column(Integer, nullable=False, default=0, server_default='0')
+    available_copies = Column(Integer, nullable=False, default=0, server_default='0')
+    
+    # Indexes backing the listing sort orders and title search
+    __table_args__ = (
+        Index('ix_books_created_at_id_desc', created_at.desc(), id.desc()),
+        # NULLS LAST in an index is PostgreSQL-only (SQLite rejects it)
+        Index(
+            'ix_books_rating_created_at', average_rating.desc().nullslast(), created_at.desc()
+        ).ddl_if(dialect='postgresql'),
+        # Trigram index so ILIKE '%term%' title search avoids a sequential scan (needs pg_trgm)
+        Index(
+            'ix_books_title_trgm', 'title',
+            postgresql_using='gin',
+            postgresql_ops={'title': 'gin_trgm_ops'}
+        ),
+    )
+    
     # Relationships
     authors = relationship('Author', secondary=book_authors, back_populates='books')
     genres = relationship('Genre', secondary=book_genres, back_populates='books')
@@ -68,6 +91,11 @@ class Book(Base):
     reservations = relationship('Reservation', back_populates='book', cascade='all, delete-orphan')
     reviews = relationship('Review', back_populates='book', cascade='all, delete-orphan')
     
+    @property
+    def location(self) -> dict:
+        """Shelf location as exposed by BookResponse"""
+        return {"floor": self.floor or '', "shelf": self.shelf or '', "row": self.row or ''}
+    
     def __repr__(self):
         return f"<Book {self.title}>"
 
@@ -82,6 +110,16 @@ class Author(Base):
     bio = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
     
+    # Indexes
+    __table_args__ = (
+        # Trigram index so ILIKE '%term%' name search avoids a sequential scan (needs pg_trgm)
+        Index(
+            'ix_authors_name_trgm', 'name',
+            postgresql_using='gin',
+            postgresql_ops={'name': 'gin_trgm_ops'}
+        ),
+    )
+    
     # Relationships
     books = relationship('Book', secondary=book_authors, back_populates='authors')
     
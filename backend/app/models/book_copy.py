@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime
+from sqlalchemy import Column, String, ForeignKey, DateTime, Index, DDL, event, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -32,6 +32,16 @@ class BookCopy(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Indexes
+    __table_args__ = (
+        # Trigram index so ILIKE '%term%' barcode search avoids a sequential scan (needs pg_trgm)
+        Index(
+            'ix_book_copies_barcode_trgm', 'barcode',
+            postgresql_using='gin',
+            postgresql_ops={'barcode': 'gin_trgm_ops'}
+        ),
+    )
+    
     # Relationships
     book = relationship('Book', back_populates='copies')
     borrow_records = relationship('BorrowRecord', back_populates='copy', cascade='all, delete-orphan')
@@ -54,9 +64,102 @@ class BorrowRecord(Base):
     status = Column(String(20), default='ACTIVE')  # ACTIVE, RETURNED, OVERDUE
     created_at = Column(DateTime, default=datetime.utcnow)
     
+    # Indexes
+    __table_args__ = (
+        Index('ix_borrow_records_copy_status_user', 'copy_id', 'status', 'user_id'),
+        # Newest-first listing with keyset pagination
+        Index('ix_borrow_records_created_at_id_desc', created_at.desc(), id.desc()),
+        # Date-range scans for dashboard borrow trends and the loans list
+        # (newest first, keyset paginated)
+        Index('ix_borrow_records_borrowed_at_id_desc', borrowed_at.desc(), id.desc()),
+        # A user's history, newest first, optionally filtered by status
+        Index('ix_borrow_records_user_status_created', 'user_id', 'status', created_at.desc()),
+        # Overdue counts (only active rows indexed)
+        Index(
+            'ix_borrow_records_active_due', 'due_date',
+            postgresql_where=text("status = 'ACTIVE'")
+        ),
+        # Returned-in-period counts (only returned rows indexed)
+        Index(
+            'ix_borrow_records_returned_at', 'returned_at',
+            postgresql_where=text("status = 'RETURNED'")
+        ),
+    )
+    
     # Relationships
     copy = relationship('BookCopy', back_populates='borrow_records')
     user = relationship('User', back_populates='borrow_records')
     
     def __repr__(self):
         return f"<BorrowRecord {self.id} ({self.status})>"
+
+
+# Keep books.total_copies / books.available_copies in sync with book_copies.
+# Triggers (not ORM events) so that bulk and Core UPDATEs are counted too.
+_AVAILABLE = "CASE WHEN {row}.status = 'AVAILABLE' THEN 1 ELSE 0 END"
+
+_POSTGRES_COPY_COUNT_DDL = [
+    f"""
+    CREATE OR REPLACE FUNCTION book_copies_update_counts() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE books
+            SET total_copies = total_copies - 1,
+                available_copies = available_copies - {_AVAILABLE.format(row="OLD")}
+            WHERE id = OLD.book_id;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            UPDATE books
+            SET total_copies = total_copies + 1,
+                available_copies = available_copies + {_AVAILABLE.format(row="NEW")}
+            WHERE id = NEW.book_id;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER trg_book_copies_counts
+    AFTER INSERT OR DELETE OR UPDATE OF book_id, status ON book_copies
+    FOR EACH ROW EXECUTE FUNCTION book_copies_update_counts()
+    """,
+]
+
+_SQLITE_COPY_COUNT_DDL = [
+    f"""
+    CREATE TRIGGER trg_book_copies_counts_insert AFTER INSERT ON book_copies
+    BEGIN
+        UPDATE books
+        SET total_copies = total_copies + 1,
+            available_copies = available_copies + {_AVAILABLE.format(row="NEW")}
+        WHERE id = NEW.book_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER trg_book_copies_counts_update AFTER UPDATE OF book_id, status ON book_copies
+    BEGIN
+        UPDATE books
+        SET total_copies = total_copies - 1,
+            available_copies = available_copies - {_AVAILABLE.format(row="OLD")}
+        WHERE id = OLD.book_id;
+        UPDATE books
+        SET total_copies = total_copies + 1,
+            available_copies = available_copies + {_AVAILABLE.format(row="NEW")}
+        WHERE id = NEW.book_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER trg_book_copies_counts_delete AFTER DELETE ON book_copies
+    BEGIN
+        UPDATE books
+        SET total_copies = total_copies - 1,
+            available_copies = available_copies - {_AVAILABLE.format(row="OLD")}
+        WHERE id = OLD.book_id;
+    END
+    """,
+]
+
+for _statement in _POSTGRES_COPY_COUNT_DDL:
+    event.listen(BookCopy.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+for _statement in _SQLITE_COPY_COUNT_DDL:
+    event.listen(BookCopy.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime
+from sqlalchemy import Column, String, ForeignKey, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -35,6 +35,12 @@ class CartItem(Base):
     book_id = Column(GUID(), ForeignKey('books.id', ondelete='CASCADE'), nullable=False)
     added_at = Column(DateTime, default=datetime.utcnow)
     
+    # Indexes
+    __table_args__ = (
+        # Cart contents and the book-already-in-cart check
+        Index('ix_cart_items_cart_book', 'cart_id', 'book_id'),
+    )
+    
     # Relationships
     cart = relationship('Cart', back_populates='items')
     book = relationship('Book')
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Boolean, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, String, Text, Boolean, ForeignKey, DateTime, Enum, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -32,6 +32,15 @@ class News(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Indexes
+    __table_args__ = (
+        # Public list: published news newest first, keyset paginated
+        Index(
+            'ix_news_published_at_id_desc', published_at.desc(), id.desc(),
+            postgresql_where=text('published')
+        ),
+    )
+    
     # Relationships
     author = relationship('User', back_populates='created_news', foreign_keys=[author_id])
     
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime
+from sqlalchemy import Column, String, ForeignKey, DateTime, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -21,6 +21,18 @@ class Reservation(Base):
     fulfilled_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     
+    # Indexes
+    __table_args__ = (
+        # FIFO queue of pending reservations per book (only pending rows indexed)
+        Index(
+            'ix_reservations_pending_fifo', 'book_id', 'reserved_at',
+            postgresql_where=text("status = 'PENDING'")
+        ),
+        # A user's reservations, newest first (optionally by status), and
+        # the duplicate-reservation check on create
+        Index('ix_reservations_user_reserved', 'user_id', reserved_at.desc()),
+    )
+    
     # Relationships
     user = relationship('User', back_populates='reservations')
     book = relationship('Book', back_populates='reservations')
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, DateTime
+from sqlalchemy import Column, String, Boolean, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -22,6 +22,21 @@ class User(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Indexes
+    __table_args__ = (
+        # Trigram indexes so the loans ILIKE '%term%' search avoids sequential scans (needs pg_trgm)
+        Index(
+            'ix_users_full_name_trgm', 'full_name',
+            postgresql_using='gin',
+            postgresql_ops={'full_name': 'gin_trgm_ops'}
+        ),
+        Index(
+            'ix_users_email_trgm', 'email',
+            postgresql_using='gin',
+            postgresql_ops={'email': 'gin_trgm_ops'}
+        ),
+    )
+    
     # Relationships
     created_books = relationship("Book", back_populates="creator", foreign_keys="Book.created_by")
     created_news = relationship("News", back_populates="author", foreign_keys="News.author_id")
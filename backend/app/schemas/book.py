@@ -125,22 +125,8 @@ class BookResponse(BookBase):
     created_at: datetime
     updated_at: datetime
     
+    # Read straight from Book: location and the copy counters are model attributes
     model_config = {"from_attributes": True}
-    
-    @classmethod
-    def model_validate(cls, obj, **kwargs):
-        """Custom validation to handle location"""
-        if hasattr(obj, 'floor'):
-            obj_dict = {
-                **{k: getattr(obj, k) for k in cls.model_fields.keys() if hasattr(obj, k) and k != 'location'},
-                'location': LocationSchema(
-                    floor=obj.floor or '',
-                    shelf=obj.shelf or '',
-                    row=obj.row or ''
-                )
-            }
-            return super().model_validate(obj_dict, **kwargs)
-        return super().model_validate(obj, **kwargs)
 
 
 class BookListResponse(BaseModel):
@@ -150,6 +136,7 @@ class BookListResponse(BaseModel):
     page: int
     page_size: int
     total_pages: int
+    next_cursor: Optional[str] = None
 
 
 class BookStats(BaseModel):
@@ -1,7 +1,8 @@
 from pydantic import BaseModel
-from typing import Generic, TypeVar, List
+from typing import Any, Generic, TypeVar, List, Optional, Type
 
 T = TypeVar("T")
+M = TypeVar("M", bound=BaseModel)
 
 class PaginatedResponse(BaseModel, Generic[T]):
     items: List[T]
@@ -9,3 +10,13 @@ class PaginatedResponse(BaseModel, Generic[T]):
     page: int
     page_size: int
     total_pages: int
+    next_cursor: Optional[str] = None
+
+
+def orm_to_schema(schema: Type[M], obj: Any) -> M:
+    """
+    Build a flat response schema from a trusted ORM object without validation.
+    Only for schemas whose fields are plain columns (no nested models or
+    enums: a raw column string in an enum field dumps with a warning).
+    """
+    return schema.model_construct(**{field: getattr(obj, field) for field in schema.model_fields})
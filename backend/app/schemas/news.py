@@ -57,3 +57,4 @@ class NewsListResponse(BaseModel):
     page: int
     page_size: int
     total_pages: int
+    next_cursor: Optional[str] = None
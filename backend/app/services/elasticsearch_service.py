@@ -250,8 +250,8 @@ class ElasticsearchService:
             logger.error(f"Search failed: {e}")
             return {"hits": [], "total": 0, "took": 0}
     
-    async def suggest_books(self, prefix: str, size: int = 10) -> List[str]:
-        """Autocomplete suggestions"""
+    async def suggest_books(self, prefix: str, size: int = 10) -> Optional[List[str]]:
+        """Autocomplete suggestions (None when the lookup failed)"""
         if not self.enabled or not self.client:
             return []
         
@@ -277,7 +277,7 @@ class ElasticsearchService:
             return suggestions
         except Exception as e:
             logger.error(f"Suggest failed: {e}")
-            return []
+            return None
 
 
 # Global instance
@@ -7,6 +7,7 @@ from sqlalchemy import select, update
 
 from app.config import settings
 from app.models.news import News
+from app.utils.cache import cache
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -72,6 +73,7 @@ async def _publish_news_in_session(db):
         item.published = True
     
     await db.commit()
+    cache.invalidate("news")
     
     logger.info(
         f"✅ Auto-published {len(news_items)} news item(s): "
@@ -144,9 +146,50 @@ async def _cancel_expired_pickups_in_session(db):
     await db.commit()
     
     if count > 0:
+        cache.invalidate("books")
         logger.info(f"🚫 Auto-cancelled {count} expired pickup request(s)")
 
 
+async def expire_stale_reservations(db=None):
+    """
+    Mark pending reservations past their expiry as EXPIRED in one bulk update,
+    so the FIFO queues and users' lists only show live reservations.
+    """
+    try:
+        # Use provided session or create a new one
+        if db is not None:
+            await _expire_reservations_in_session(db)
+        else:
+            from app.database import AsyncSessionLocal
+            async with AsyncSessionLocal() as session:
+                await _expire_reservations_in_session(session)
+            
+    except Exception as e:
+        logger.error(f"❌ Error in expire_stale_reservations: {str(e)}", exc_info=True)
+
+
+async def _expire_reservations_in_session(db):
+    """
+    Internal function to expire stale reservations within a given session.
+    """
+    from app.models.reservation import Reservation
+    from app.schemas.reservation import ReservationStatus
+    
+    result = await db.execute(
+        update(Reservation)
+        .where(
+            Reservation.status == ReservationStatus.PENDING,
+            Reservation.expires_at < datetime.utcnow()
+        )
+        .values(status=ReservationStatus.EXPIRED)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    
+    if result.rowcount:
+        logger.info(f"⌛ Expired {result.rowcount} stale reservation(s)")
+
+
 def start_scheduler():
     """
     Start the background task scheduler.
@@ -186,6 +229,16 @@ def start_scheduler():
             replace_existing=True,
             max_instances=1
         )
+
+        # Add job to expire stale reservations
+        scheduler.add_job(
+            expire_stale_reservations,
+            trigger=IntervalTrigger(minutes=settings.RESERVATION_EXPIRY_INTERVAL_MINUTES),
+            id="expire_stale_reservations",
+            name="Expire Stale Reservations",
+            replace_existing=True,
+            max_instances=1
+        )
         
         scheduler.start()
         
@@ -0,0 +1,71 @@
+"""
+In-process TTL cache for read-heavy API responses
+"""
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from app.config import settings
+
+
+class TTLCache:
+    """
+    Namespaced key/value cache with per-entry expiry.
+
+    Entries are grouped by namespace (e.g. "authors") so that a mutation can
+    drop every cached page of a resource at once with ``invalidate``.
+    The cache lives in the API process; with several workers each one keeps
+    its own copy and stale entries are bounded by the TTL.
+    """
+
+    def __init__(self, default_ttl: int, max_entries: int):
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self._store: Dict[str, Dict[Hashable, Tuple[float, Any]]] = {}
+
+    def get(self, namespace: str, key: Hashable) -> Optional[Any]:
+        """Return cached value or None if missing/expired"""
+        if not settings.CACHE_ENABLED:
+            return None
+
+        entries = self._store.get(namespace)
+        if not entries:
+            return None
+
+        entry = entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            entries.pop(key, None)
+            return None
+
+        return value
+
+    def set(self, namespace: str, key: Hashable, value: Any, ttl: Optional[int] = None) -> None:
+        """Store value under namespace/key for ttl seconds"""
+        if not settings.CACHE_ENABLED:
+            return
+
+        entries = self._store.setdefault(namespace, {})
+        if key not in entries and len(entries) >= self.max_entries:
+            # Evict the oldest entry (dicts keep insertion order)
+            entries.pop(next(iter(entries)))
+
+        entries[key] = (time.monotonic() + (ttl or self.default_ttl), value)
+
+    def invalidate(self, *namespaces: str) -> None:
+        """Drop all entries of the given namespaces"""
+        for namespace in namespaces:
+            self._store.pop(namespace, None)
+
+    def clear(self) -> None:
+        """Drop every cached entry"""
+        self._store.clear()
+
+
+# Global cache instance
+cache = TTLCache(
+    default_ttl=settings.CACHE_TTL_SECONDS,
+    max_entries=settings.CACHE_MAX_ENTRIES
+)
@@ -1,12 +1,30 @@
 import os
 import uuid
 import aiofiles
+import aiofiles.os
 from pathlib import Path
 from typing import Optional
 from fastapi import UploadFile, HTTPException, status
 
 from app.config import settings
 
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+def _file_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"File too large. Max size: {settings.MAX_UPLOAD_SIZE / 1024 / 1024}MB"
+    )
+
+
+async def _discard(file_path: Path) -> None:
+    """Remove a partially written upload, ignoring a missing file"""
+    try:
+        await aiofiles.os.remove(file_path)
+    except FileNotFoundError:
+        pass
+
 
 async def save_upload_file(upload_file: UploadFile, subdirectory: str = "covers") -> str:
     """
@@ -37,31 +55,33 @@ async def save_upload_file(upload_file: UploadFile, subdirectory: str = "covers"
             detail=f"File type not allowed. Allowed types: {', '.join(settings.allowed_extensions_list)}"
         )
     
-    # Check file size
-    contents = await upload_file.read()
-    if len(contents) > settings.MAX_UPLOAD_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File too large. Max size: {settings.MAX_UPLOAD_SIZE / 1024 / 1024}MB"
-        )
-    
-    # Reset file pointer
-    await upload_file.seek(0)
+    # Reject early when the client declared an oversized body
+    if upload_file.size is not None and upload_file.size > settings.MAX_UPLOAD_SIZE:
+        raise _file_too_large()
     
     # Generate unique filename
     unique_filename = f"{uuid.uuid4()}.{file_ext}"
     
-    # Create directory if not exists
+    # Create directory if not exists (off the event loop, like the writes)
     upload_dir = Path(settings.UPLOAD_DIR) / subdirectory
-    upload_dir.mkdir(parents=True, exist_ok=True)
+    await aiofiles.os.makedirs(upload_dir, exist_ok=True)
     
-    # Save file
+    # Save file in fixed-size chunks so memory use does not grow with the upload
     file_path = upload_dir / unique_filename
+    written = 0
     
     try:
         async with aiofiles.open(file_path, 'wb') as f:
-            await f.write(contents)
+            while chunk := await upload_file.read(UPLOAD_CHUNK_SIZE):
+                written += len(chunk)
+                if written > settings.MAX_UPLOAD_SIZE:
+                    raise _file_too_large()
+                await f.write(chunk)
+    except HTTPException:
+        await _discard(file_path)
+        raise
     except Exception as e:
+        await _discard(file_path)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to save file: {str(e)}"
@@ -81,18 +101,16 @@ async def delete_upload_file(file_path: str) -> bool:
     Returns:
         True if deleted successfully, False otherwise
     """
+    # Remove leading slash if present
+    if file_path.startswith('/'):
+        file_path = file_path[1:]
+    
+    # Filesystem calls run in a worker thread so a slow disk does not
+    # stall the event loop; missing files and directories both fail here
     try:
-        # Remove leading slash if present
-        if file_path.startswith('/'):
-            file_path = file_path[1:]
-        
-        full_path = Path(file_path)
-        
-        if full_path.exists() and full_path.is_file():
-            full_path.unlink()
-            return True
-        return False
-    except Exception:
+        await aiofiles.os.remove(file_path)
+        return True
+    except OSError:
         return False
 
 
@@ -1,10 +1,14 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+import logging
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy import select, update, func, cast, Integer
 from uuid import UUID
 from typing import Dict
 
 from app.models.review import Review
 from app.models.book import Book
+from app.utils.cache import cache
+
+logger = logging.getLogger(__name__)
 
 
 async def calculate_average_rating(db: AsyncSession, book_id: UUID) -> float:
@@ -30,30 +34,43 @@ async def update_book_rating(db: AsyncSession, book_id: UUID) -> None:
     """
     Update book's cached average rating and total reviews
     
+    Both aggregates are computed by the database inside a single UPDATE.
+    
     Args:
         db: Database session
         book_id: Book ID
     """
-    # Get average rating
-    avg_rating = await calculate_average_rating(db, book_id)
-    
-    # Get total reviews count
-    count_result = await db.execute(
-        select(func.count())
-        .where(Review.book_id == book_id)
+    reviews = select(Review.rating).where(Review.book_id == book_id).subquery()
+    await db.execute(
+        update(Book)
+        .where(Book.id == book_id)
+        .values(
+            average_rating=select(cast(func.round(func.avg(reviews.c.rating)), Integer)).scalar_subquery(),
+            total_reviews=select(func.count()).select_from(reviews).scalar_subquery()
+        )
+        .execution_options(synchronize_session=False)
     )
-    total_reviews = count_result.scalar()
+    await db.commit()
+    cache.invalidate("books")
+
+
+async def refresh_book_rating(session_factory: async_sessionmaker, book_id: UUID) -> None:
+    """
+    Background-task wrapper for update_book_rating
     
-    # Update book
-    book_result = await db.execute(
-        select(Book).where(Book.id == book_id)
-    )
-    book = book_result.scalar_one_or_none()
+    Runs after the response is sent, on its own session (the request's
+    session is closed by then). Errors are logged, not raised: the next
+    review write recomputes the rating from scratch.
     
-    if book:
-        book.average_rating = int(round(avg_rating)) if avg_rating else None
-        book.total_reviews = total_reviews
-        await db.commit()
+    Args:
+        session_factory: Session factory for a writable session
+        book_id: Book ID
+    """
+    try:
+        async with session_factory() as db:
+            await update_book_rating(db, book_id)
+    except Exception as e:
+        logger.error(f"Error refreshing rating of book {book_id}: {str(e)}", exc_info=True)
 
 
 async def get_rating_distribution(db: AsyncSession, book_id: UUID) -> Dict[str, int]:
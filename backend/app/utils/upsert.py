@@ -0,0 +1,24 @@
+"""
+Dialect-aware INSERT ... ON CONFLICT helper
+"""
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def insert_on_conflict(db: AsyncSession, entity):
+    """
+    Build an INSERT statement that supports ``on_conflict_do_nothing``.
+
+    PostgreSQL is used in production and SQLite in tests; both dialects
+    expose the same ON CONFLICT API on their own ``insert`` construct.
+
+    Args:
+        db: Database session (used to detect the dialect)
+        entity: Mapped class or Table to insert into
+
+    Returns:
+        Dialect-specific Insert construct
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(entity)
+    return sqlite.insert(entity)
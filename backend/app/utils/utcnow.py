@@ -0,0 +1,28 @@
+"""
+Database-side UTC timestamp for naive DateTime columns
+"""
+from sqlalchemy import DateTime
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class utcnow(FunctionElement):
+    """
+    Current UTC time evaluated by the database.
+
+    Columns are naive ``DateTime`` values written as UTC (``datetime.utcnow``),
+    so PostgreSQL's ``now()`` is converted to UTC regardless of the server
+    time zone. SQLite's CURRENT_TIMESTAMP is already UTC.
+    """
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow, "postgresql")
+def _pg_utcnow(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utcnow)
+def _default_utcnow(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
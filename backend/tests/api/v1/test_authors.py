@@ -72,3 +72,105 @@ async def test_delete_author(client: AsyncClient, librarian_headers):
     # Verify deleted
     get_res = await client.get(f"/api/v1/authors/{author_id}")
     assert get_res.status_code == 404
+
+@pytest.mark.asyncio
+async def test_get_authors_book_count(client: AsyncClient, librarian_headers, test_book):
+    # Author without books must still be listed with a zero count
+    await client.post(
+        "/api/v1/authors/",
+        json={"name": "Author Without Books"},
+        headers=librarian_headers
+    )
+
+    response = await client.get("/api/v1/authors/")
+    assert response.status_code == 200
+    counts = {a["name"]: a["book_count"] for a in response.json()}
+    assert counts["Test Author"] == 1
+    assert counts["Author Without Books"] == 0
+
+    recent = await client.get("/api/v1/authors/recent")
+    assert recent.status_code == 200
+    assert [a["book_count"] for a in recent.json()] == [1]
+
+@pytest.mark.asyncio
+async def test_delete_author_with_books_fails(client: AsyncClient, librarian_headers, test_book, test_author):
+    response = await client.delete(
+        f"/api/v1/authors/{test_author.id}",
+        headers=librarian_headers
+    )
+    assert response.status_code == 400
+    assert "1 books" in response.json()["detail"]
+
+@pytest.mark.asyncio
+async def test_create_duplicate_author_fails(client: AsyncClient, librarian_headers):
+    payload = {"name": "Duplicate Author"}
+    first = await client.post("/api/v1/authors/", json=payload, headers=librarian_headers)
+    assert first.status_code == 201
+
+    second = await client.post("/api/v1/authors/", json=payload, headers=librarian_headers)
+    assert second.status_code == 400
+    assert second.json()["detail"] == "Author with this name already exists"
+
+@pytest.mark.asyncio
+async def test_author_list_cache_invalidated_on_create(client: AsyncClient, librarian_headers):
+    first = await client.get("/api/v1/authors/")
+    assert first.status_code == 200
+    assert first.json() == []
+
+    await client.post(
+        "/api/v1/authors/",
+        json={"name": "Cached Author"},
+        headers=librarian_headers
+    )
+
+    second = await client.get("/api/v1/authors/")
+    assert [a["name"] for a in second.json()] == ["Cached Author"]
+
+@pytest.mark.asyncio
+async def test_get_author_books(client: AsyncClient, test_books_list, test_author):
+    # test_books_list assigns test_author to the 8 even-indexed books
+    response = await client.get(
+        f"/api/v1/authors/{test_author.id}/books",
+        params={"page": 2, "page_size": 5}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 8
+    assert data["total_pages"] == 2
+    assert len(data["items"]) == 3
+    assert all(
+        any(a["id"] == str(test_author.id) for a in item["authors"])
+        for item in data["items"]
+    )
+
+@pytest.mark.asyncio
+async def test_get_author_books_not_found(client: AsyncClient):
+    response = await client.get(
+        "/api/v1/authors/00000000-0000-0000-0000-000000000000/books"
+    )
+    assert response.status_code == 404
+
+@pytest.mark.asyncio
+async def test_get_author_books_empty(client: AsyncClient, test_author):
+    response = await client.get(f"/api/v1/authors/{test_author.id}/books")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["items"] == []
+    assert data["total"] == 0
+    assert data["total_pages"] == 0
+
+@pytest.mark.asyncio
+async def test_update_author_refreshes_cached_book(client: AsyncClient, librarian_headers, test_book, test_author):
+    # Cache the book detail, then rename its author
+    response = await client.get(f"/api/v1/books/{test_book.id}")
+    assert [a["name"] for a in response.json()["authors"]] == [test_author.name]
+
+    response = await client.put(
+        f"/api/v1/authors/{test_author.id}",
+        json={"name": "Renamed Author"},
+        headers=librarian_headers
+    )
+    assert response.status_code == 200
+
+    response = await client.get(f"/api/v1/books/{test_book.id}")
+    assert [a["name"] for a in response.json()["authors"]] == ["Renamed Author"]
@@ -64,6 +64,25 @@ async def test_update_genre(client: AsyncClient, librarian_headers):
     assert response.status_code == 200
     assert response.json()["name"] == "New Name"
 
+@pytest.mark.asyncio
+async def test_update_genre_name_conflict(client: AsyncClient, librarian_headers):
+    await client.post("/api/v1/genres/", json={"name": "Taken"}, headers=librarian_headers)
+    create_res = await client.post("/api/v1/genres/", json={"name": "Mine"}, headers=librarian_headers)
+    genre_id = create_res.json()["id"]
+    
+    # Renaming to another genre's name fails, keeping its own name succeeds
+    response = await client.put(f"/api/v1/genres/{genre_id}", json={"name": "Taken"}, headers=librarian_headers)
+    assert response.status_code == 400
+    
+    response = await client.put(f"/api/v1/genres/{genre_id}", json={"name": "Mine"}, headers=librarian_headers)
+    assert response.status_code == 200
+
+@pytest.mark.asyncio
+async def test_update_nonexistent_genre(client: AsyncClient, librarian_headers):
+    from uuid import uuid4
+    response = await client.put(f"/api/v1/genres/{uuid4()}", json={"name": "Nobody"}, headers=librarian_headers)
+    assert response.status_code == 404
+
 @pytest.mark.asyncio
 async def test_delete_genre(client: AsyncClient, librarian_headers):
     # Create genre
@@ -85,3 +104,51 @@ async def test_delete_genre(client: AsyncClient, librarian_headers):
     get_res = await client.get("/api/v1/genres/")
     items = get_res.json()["items"]
     assert not any(g["id"] == genre_id for g in items)
+
+@pytest.mark.asyncio
+async def test_get_all_genres_streamed_in_batches(client: AsyncClient, librarian_headers, monkeypatch):
+    from app.api.v1 import genres
+    monkeypatch.setattr(genres, "GENRE_STREAM_BATCH", 2)
+    
+    for name in ["Genre C", "Genre A", "Genre B"]:
+        await client.post("/api/v1/genres/", json={"name": name}, headers=librarian_headers)
+    
+    response = await client.get("/api/v1/genres/all")
+    assert response.status_code == 200
+    assert [g["name"] for g in response.json()] == ["Genre A", "Genre B", "Genre C"]
+
+@pytest.mark.asyncio
+async def test_update_genre_refreshes_cached_book(client: AsyncClient, librarian_headers, test_book, test_genre):
+    # Cache the book detail, then rename its genre
+    response = await client.get(f"/api/v1/books/{test_book.id}")
+    assert [g["name"] for g in response.json()["genres"]] == [test_genre.name]
+
+    response = await client.put(
+        f"/api/v1/genres/{test_genre.id}",
+        json={"name": "Renamed Genre"},
+        headers=librarian_headers
+    )
+    assert response.status_code == 200
+
+    response = await client.get(f"/api/v1/books/{test_book.id}")
+    assert [g["name"] for g in response.json()["genres"]] == ["Renamed Genre"]
+
+@pytest.mark.asyncio
+async def test_delete_genre_in_use(client: AsyncClient, librarian_headers, db_session: AsyncSession, test_book, test_genre):
+    from sqlalchemy import select, func
+    from app.models.book import book_genres
+
+    # Cache the book detail, then delete its genre
+    response = await client.get(f"/api/v1/books/{test_book.id}")
+    assert len(response.json()["genres"]) == 1
+
+    response = await client.delete(f"/api/v1/genres/{test_genre.id}", headers=librarian_headers)
+    assert response.status_code == 204
+
+    remaining = await db_session.scalar(
+        select(func.count()).select_from(book_genres).where(book_genres.c.genre_id == test_genre.id)
+    )
+    assert remaining == 0
+
+    response = await client.get(f"/api/v1/books/{test_book.id}")
+    assert response.json()["genres"] == []
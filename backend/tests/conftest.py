@@ -16,7 +16,8 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.pool import NullPool
 
 from app.main import app
-from app.database import Base, get_db
+from app.database import Base, get_db, get_ro_db, get_ro_session_factory, get_session_factory
+from app.utils.cache import cache
 from app.models.user import User
 from app.utils.security import hash_password, create_access_token
 
@@ -62,6 +63,9 @@ async def setup_db():
     async with test_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     
+    # Cached responses must not leak between test databases
+    cache.clear()
+    
     yield
     
     # Drop tables and clean up
@@ -99,6 +103,9 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
         yield db_session
     
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_ro_db] = override_get_db
+    app.dependency_overrides[get_ro_session_factory] = lambda: TestSessionLocal
+    app.dependency_overrides[get_session_factory] = lambda: TestSessionLocal
     
     async with AsyncClient(
         transport=ASGITransport(app=app),
@@ -159,6 +159,54 @@ class TestBooksListing:
         data = response.json()
         assert len(data["items"]) == 0  # No items on page 999
 
+    @pytest.mark.asyncio
+    async def test_cursor_pagination(
+        self,
+        client: AsyncClient,
+        test_books_list: list[Book]
+    ):
+        """Test walking every page with next_cursor"""
+        seen = []
+        response = await client.get("/api/v1/books/?page_size=4")
+        while True:
+            assert response.status_code == 200
+            data = response.json()
+            seen.extend(item["id"] for item in data["items"])
+            if not data["next_cursor"]:
+                break
+            response = await client.get(
+                f"/api/v1/books/?page_size=4&cursor={data['next_cursor']}"
+            )
+
+        assert len(seen) == 15
+        assert len(set(seen)) == 15
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor(self, client: AsyncClient):
+        """Test malformed cursor is rejected"""
+        response = await client.get("/api/v1/books/?cursor=not-a-cursor")
+
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_get_books_copy_counts(
+        self,
+        client: AsyncClient,
+        test_book: Book,
+        test_book_copy,
+        test_borrowed_copy_by_user
+    ):
+        """Test copy counters in the listing track inserted copies"""
+        response = await client.get("/api/v1/books/")
+
+        assert response.status_code == 200
+        item = response.json()["items"][0]
+        assert item["total_copies"] == 2
+        assert item["available_copies"] == 1
+
+        only_available = await client.get("/api/v1/books/?only_available=true")
+        assert only_available.json()["total"] == 1
+
 
 class TestGetBook:
     """Test getting single book"""
@@ -205,6 +253,29 @@ class TestGetBook:
         assert len(data["authors"]) > 0
         assert len(data["genres"]) > 0
 
+    @pytest.mark.asyncio
+    async def test_get_book_etag_revalidation(
+        self,
+        client: AsyncClient,
+        test_book: Book
+    ):
+        """Test that a matching If-None-Match returns 304"""
+        response = await client.get(f"/api/v1/books/{test_book.id}")
+        etag = response.headers["etag"]
+
+        revalidated = await client.get(
+            f"/api/v1/books/{test_book.id}",
+            headers={"If-None-Match": etag}
+        )
+        assert revalidated.status_code == 304
+        assert revalidated.headers["etag"] == etag
+
+        stale = await client.get(
+            f"/api/v1/books/{test_book.id}",
+            headers={"If-None-Match": '"stale"'}
+        )
+        assert stale.status_code == 200
+
 
 class TestCreateBook:
     """Test creating books (librarian only)"""
@@ -275,7 +346,76 @@ class TestCreateBook:
         assert response.status_code == 201
         data = response.json()
         assert any(author["name"] == "Brand New Author" for author in data["authors"])
-    
+
+    @pytest.mark.asyncio
+    async def test_create_book_with_mixed_and_duplicate_authors(
+        self,
+        client: AsyncClient,
+        librarian_headers: dict,
+        test_author: Author
+    ):
+        """Test existing, new and repeated author names resolve to one row each"""
+        book_data = {
+            "title": "Book with Mixed Authors",
+            "isbn": "978-0-333333-33-3",
+            "authors": ["Another New Author", test_author.name, "Another New Author"],
+            "genres": ["Fiction"],
+            "keywords": ["mixed", "authors"],
+            "location": {
+                "floor": "1",
+                "shelf": "B",
+                "row": "3"
+            }
+        }
+
+        response = await client.post(
+            "/api/v1/books/",
+            json=book_data,
+            headers=librarian_headers
+        )
+
+        assert response.status_code == 201
+        data = response.json()
+        assert sorted(author["name"] for author in data["authors"]) == sorted(
+            ["Another New Author", test_author.name]
+        )
+        assert any(author["id"] == str(test_author.id) for author in data["authors"])
+        assert sorted(keyword["name"] for keyword in data["keywords"]) == ["authors", "mixed"]
+
+    @pytest.mark.asyncio
+    async def test_create_book_with_initial_copies(
+        self,
+        client: AsyncClient,
+        librarian_headers: dict
+    ):
+        """Test initial copies are created with ISBN-based barcodes"""
+        book_data = {
+            "title": "Book with Copies",
+            "isbn": "978-0-444444-44-4",
+            "authors": ["Copy Author"],
+            "genres": ["Fiction"],
+            "keywords": [],
+            "location": {"floor": "1", "shelf": "C", "row": "1"},
+            "initial_copies": 3
+        }
+
+        response = await client.post(
+            "/api/v1/books/",
+            json=book_data,
+            headers=librarian_headers
+        )
+        assert response.status_code == 201
+        assert response.json()["total_copies"] == 3
+        book_id = response.json()["id"]
+
+        copies = await client.get(
+            f"/api/v1/books/{book_id}/copies",
+            headers=librarian_headers
+        )
+        assert sorted(c["barcode"] for c in copies.json()) == [
+            "978-0-444444-44-4-1", "978-0-444444-44-4-2", "978-0-444444-44-4-3"
+        ]
+
     @pytest.mark.asyncio
     async def test_create_book_unauthorized(
         self,
@@ -369,7 +509,73 @@ class TestUpdateBook:
         assert response.status_code == 200
         data = response.json()
         assert data["title"] == "Updated Title"
-    
+
+    @pytest.mark.asyncio
+    async def test_update_book_location_and_authors(
+        self,
+        client: AsyncClient,
+        librarian_headers: dict,
+        test_book: Book
+    ):
+        """Test updating location and replacing the author list"""
+        response = await client.put(
+            f"/api/v1/books/{test_book.id}",
+            json={
+                "location": {"floor": "3", "shelf": "Z", "row": "9"},
+                "authors": ["Replacement Author"]
+            },
+            headers=librarian_headers
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["location"] == {"floor": "3", "shelf": "Z", "row": "9"}
+        assert [a["name"] for a in data["authors"]] == ["Replacement Author"]
+
+    @pytest.mark.asyncio
+    async def test_update_book_keeps_existing_authors(
+        self,
+        client: AsyncClient,
+        librarian_headers: dict,
+        test_book: Book,
+        test_author
+    ):
+        """Test that adding an author keeps the ones already attached"""
+        response = await client.put(
+            f"/api/v1/books/{test_book.id}",
+            json={"authors": [test_author.name, "Second Author"]},
+            headers=librarian_headers
+        )
+
+        assert response.status_code == 200
+        authors = response.json()["authors"]
+        assert sorted(a["name"] for a in authors) == sorted([test_author.name, "Second Author"])
+        assert str(test_author.id) in [a["id"] for a in authors]
+
+    @pytest.mark.asyncio
+    async def test_update_book_refreshes_cached_reads(
+        self,
+        client: AsyncClient,
+        librarian_headers: dict,
+        test_book: Book
+    ):
+        """Test that cached detail and list responses are dropped on update"""
+        # Warm the caches
+        await client.get(f"/api/v1/books/{test_book.id}")
+        await client.get("/api/v1/books/")
+
+        response = await client.put(
+            f"/api/v1/books/{test_book.id}",
+            json={"title": "Fresh Title"},
+            headers=librarian_headers
+        )
+        assert response.status_code == 200
+
+        detail = await client.get(f"/api/v1/books/{test_book.id}")
+        assert detail.json()["title"] == "Fresh Title"
+        listing = await client.get("/api/v1/books/")
+        assert [b["title"] for b in listing.json()["items"]] == ["Fresh Title"]
+
     @pytest.mark.asyncio
     async def test_update_nonexistent_book(
         self,
@@ -479,6 +685,33 @@ class TestBookStats:
         assert "borrowed" in data  # Field name is 'borrowed', not 'borrowed_copies'
         assert "lost" in data
     
+    @pytest.mark.asyncio
+    async def test_get_book_stats_counts_by_status(
+        self,
+        client: AsyncClient,
+        librarian_headers: dict
+    ):
+        """Test stats count copies per status"""
+        response = await client.post(
+            "/api/v1/books/",
+            json={
+                "title": "Stats Book",
+                "authors": ["Stats Author"],
+                "genres": ["Fiction"],
+                "location": {"floor": "1", "shelf": "S", "row": "1"},
+                "initial_copies": 2
+            },
+            headers=librarian_headers
+        )
+        book_id = response.json()["id"]
+
+        response = await client.get(f"/api/v1/books/{book_id}/stats")
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "total_copies": 2, "available": 2, "borrowed": 0, "lost": 0
+        }
+
     @pytest.mark.asyncio
     async def test_get_stats_nonexistent_book(
         self,
@@ -0,0 +1,95 @@
+"""
+Tests for Borrowing API endpoints (/api/v1/borrowing/*)
+"""
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import uuid4
+from datetime import datetime, timedelta
+
+from app.models.book_copy import BookCopy, BorrowRecord
+from app.models.book import Book
+from app.models.user import User
+
+
+class TestGetMyBorrowHistory:
+    """Test the current user's borrow history"""
+
+    @pytest.mark.asyncio
+    async def test_my_history(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        auth_headers: dict,
+        test_author,
+        test_borrowed_copy_by_user: BookCopy
+    ):
+        """Test that history rows carry book, author and copy details"""
+        db_session.expunge_all()
+
+        response = await client.get("/api/v1/borrowing/my-history", headers=auth_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data) == 1
+        assert data[0]["book_title"] == "Test Book"
+        assert data[0]["book_authors"] == [test_author.name]
+        assert data[0]["copy_barcode"] == "BC-TEST-USER-BORROWED"
+        assert data[0]["deposit_fee"] == 0
+
+
+class TestGetAllBorrows:
+    """Test listing all borrow records"""
+
+    @pytest.mark.asyncio
+    async def test_cursor_pagination(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        librarian_headers: dict,
+        test_user: User,
+        test_book: Book
+    ):
+        """Test walking every page with the X-Next-Cursor header"""
+        now = datetime.utcnow()
+        for i in range(5):
+            copy = BookCopy(id=uuid4(), book_id=test_book.id, barcode=f"BC-PAGE-{i}", status="BORROWED")
+            db_session.add(copy)
+            db_session.add(BorrowRecord(
+                id=uuid4(),
+                copy_id=copy.id,
+                user_id=test_user.id,
+                due_date=now + timedelta(days=14),
+                status="ACTIVE",
+                created_at=now - timedelta(minutes=i)
+            ))
+        await db_session.commit()
+
+        barcodes = []
+        response = await client.get("/api/v1/borrowing/all?limit=2", headers=librarian_headers)
+        while True:
+            assert response.status_code == 200
+            barcodes += [r["copy_barcode"] for r in response.json()]
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+            response = await client.get(
+                f"/api/v1/borrowing/all?limit=2&cursor={cursor}",
+                headers=librarian_headers
+            )
+
+        assert barcodes == [f"BC-PAGE-{i}" for i in range(5)]
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor(
+        self,
+        client: AsyncClient,
+        librarian_headers: dict
+    ):
+        """Test that a malformed cursor is rejected"""
+        response = await client.get(
+            "/api/v1/borrowing/all?cursor=not-a-cursor",
+            headers=librarian_headers
+        )
+
+        assert response.status_code == 400
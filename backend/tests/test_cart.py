@@ -3,8 +3,9 @@ Tests for Cart API endpoints (/api/v1/cart/*)
 """
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
-from uuid import uuid4
+from uuid import UUID, uuid4
 from datetime import datetime, timedelta
 
 from app.models.cart import Cart, CartItem
@@ -157,6 +158,33 @@ async def test_remove_book_from_cart_success(
     assert response.status_code == 204
 
 
+@pytest.mark.asyncio
+async def test_remove_book_not_in_cart_fails(
+    async_client: AsyncClient,
+    user_token: str,
+    test_user: User,
+    test_book: Book,
+    db_session: AsyncSession
+):
+    """Test removing a book that is not in the cart"""
+    response = await async_client.delete(
+        f"/api/v1/cart/items/{test_book.id}",
+        headers={"Authorization": f"Bearer {user_token}"}
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Cart not found"
+    
+    db_session.add(Cart(user_id=test_user.id))
+    await db_session.commit()
+    
+    response = await async_client.delete(
+        f"/api/v1/cart/items/{test_book.id}",
+        headers={"Authorization": f"Bearer {user_token}"}
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Book not found in cart"
+
+
 @pytest.mark.asyncio
 async def test_clear_cart_success(
     async_client: AsyncClient,
@@ -315,6 +343,7 @@ async def test_checkout_no_available_copy_fails(
     cart_item = CartItem(cart_id=cart.id, book_id=book.id)
     db_session.add(cart_item)
     await db_session.commit()
+    book_id = str(book.id)
     
     checkout_data = {}
     
@@ -327,3 +356,53 @@ async def test_checkout_no_available_copy_fails(
     assert response.status_code == 400
     detail = response.json()["detail"]
     assert "not available" in str(detail).lower()
+    assert detail["failed_books"] == [{
+        "book_id": book_id,
+        "book_title": "Unavailable Book",
+        "reason": "No available copies"
+    }]
+
+
+@pytest.mark.asyncio
+async def test_checkout_skips_copy_locked_elsewhere(
+    async_client: AsyncClient,
+    user_token: str,
+    test_user: User,
+    db_session: AsyncSession
+):
+    """Test checkout claims another copy when the lowest-id copy is held"""
+    cart = Cart(user_id=test_user.id)
+    db_session.add(cart)
+    book = Book(title="Popular Book", isbn="POPULAR-1", created_by=test_user.id)
+    db_session.add(book)
+    await db_session.flush()
+
+    held_id = UUID(int=1)
+    free_id = UUID(int=2)
+    db_session.add_all([
+        BookCopy(id=held_id, book_id=book.id, barcode="HELD-COPY", status=CopyStatus.AVAILABLE),
+        BookCopy(id=free_id, book_id=book.id, barcode="FREE-COPY", status=CopyStatus.AVAILABLE),
+        CartItem(cart_id=cart.id, book_id=book.id)
+    ])
+    await db_session.commit()
+
+    # SQLite has no row locks: emulate a concurrent transaction holding the
+    # lowest-id copy by hiding it from the SKIP LOCKED select
+    def skip_held_copy(orm_execute_state):
+        for_update = getattr(orm_execute_state.statement, "_for_update_arg", None)
+        if for_update is not None and for_update.skip_locked:
+            orm_execute_state.statement = orm_execute_state.statement.where(BookCopy.id != held_id)
+
+    event.listen(db_session.sync_session, "do_orm_execute", skip_held_copy)
+    try:
+        response = await async_client.post(
+            "/api/v1/cart/checkout",
+            json={},
+            headers={"Authorization": f"Bearer {user_token}"}
+        )
+    finally:
+        event.remove(db_session.sync_session, "do_orm_execute", skip_held_copy)
+
+    assert response.status_code == 200
+    records = response.json()["borrow_records"]
+    assert [record["copy_id"] for record in records] == [str(free_id)]
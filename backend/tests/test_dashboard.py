@@ -0,0 +1,68 @@
+"""
+Tests for Dashboard API endpoints (/api/v1/dashboard/*)
+"""
+import pytest
+from httpx import AsyncClient
+from datetime import datetime
+
+from app.models.book_copy import BookCopy
+
+
+class TestDashboardStats:
+    """Test dashboard statistics"""
+
+    @pytest.mark.asyncio
+    async def test_get_stats(
+        self,
+        client: AsyncClient,
+        librarian_headers: dict,
+        test_book_copy: BookCopy,
+        test_borrowed_copy: BookCopy
+    ):
+        """Test library and borrow counts"""
+        response = await client.get("/api/v1/dashboard/stats", headers=librarian_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["library_stats"] == {
+            "total_books": 1,
+            "total_copies": 2,
+            "available_copies": 1,
+            "borrowed_copies": 1,
+        }
+        assert data["borrow_stats"]["active_borrows"] == 1
+        assert data["borrow_stats"]["overdue_count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_get_stats_unauthorized(
+        self,
+        client: AsyncClient,
+        auth_headers: dict
+    ):
+        """Test that regular users cannot read dashboard stats"""
+        response = await client.get("/api/v1/dashboard/stats", headers=auth_headers)
+
+        assert response.status_code == 403
+
+
+class TestBorrowTrends:
+    """Test borrow trends"""
+
+    @pytest.mark.asyncio
+    async def test_get_borrow_trends(
+        self,
+        client: AsyncClient,
+        librarian_headers: dict,
+        test_borrowed_copy: BookCopy
+    ):
+        """Test one zero-filled entry per day with the borrow counted"""
+        response = await client.get(
+            "/api/v1/dashboard/borrow-trends?days=7",
+            headers=librarian_headers
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data) == 8
+        assert data[-1]["date"] == datetime.now().date().isoformat()
+        assert sum(day["count"] for day in data) == 1
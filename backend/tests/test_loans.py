@@ -0,0 +1,182 @@
+"""
+Tests for Loans API endpoints (/api/v1/loans/*)
+"""
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import uuid4
+from datetime import datetime, timedelta
+
+from app.models.book_copy import BookCopy, BorrowRecord
+from app.models.book import Book
+from app.models.user import User
+
+
+class TestGetLoans:
+    """Test the librarian loan list"""
+
+    @pytest.mark.asyncio
+    async def test_get_loans(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        librarian_headers: dict,
+        test_author,
+        test_user,
+        test_borrowed_copy_by_user: BookCopy
+    ):
+        """Test that loans carry user, copy and book details"""
+        db_session.expunge_all()
+
+        response = await client.get("/api/v1/loans/", headers=librarian_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 1
+        assert data["total_pages"] == 1
+        loan = data["items"][0]
+        assert loan["user"]["email"] == test_user.email
+        assert loan["copy"]["barcode"] == "BC-TEST-USER-BORROWED"
+        assert loan["book"]["title"] == "Test Book"
+        assert [a["name"] for a in loan["book"]["authors"]] == [test_author.name]
+
+    @pytest.mark.asyncio
+    async def test_get_loans_sparse_fields(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        librarian_headers: dict,
+        test_author,
+        test_borrowed_copy_by_user: BookCopy
+    ):
+        """Test that fields limits the book relationships returned"""
+        db_session.expunge_all()
+
+        response = await client.get("/api/v1/loans/?fields=authors", headers=librarian_headers)
+
+        assert response.status_code == 200
+        book = response.json()["items"][0]["book"]
+        assert [a["name"] for a in book["authors"]] == [test_author.name]
+        assert "genres" not in book
+        assert "keywords" not in book
+
+        response = await client.get("/api/v1/loans/?fields=", headers=librarian_headers)
+
+        book = response.json()["items"][0]["book"]
+        assert book["title"] == "Test Book"
+        assert "authors" not in book
+
+        response = await client.get("/api/v1/loans/?fields=authors, genres", headers=librarian_headers)
+
+        book = response.json()["items"][0]["book"]
+        assert "authors" in book
+        assert "genres" in book
+        assert "keywords" not in book
+
+    @pytest.mark.asyncio
+    async def test_get_loans_unknown_field(
+        self,
+        client: AsyncClient,
+        librarian_headers: dict
+    ):
+        """Test that an unknown fields name is rejected"""
+        response = await client.get("/api/v1/loans/?fields=authors,publisher", headers=librarian_headers)
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Unknown fields: publisher"
+
+    @pytest.mark.asyncio
+    async def test_get_loans_search(
+        self,
+        client: AsyncClient,
+        librarian_headers: dict,
+        test_borrowed_copy_by_user: BookCopy
+    ):
+        """Test filtering loans by barcode"""
+        response = await client.get("/api/v1/loans/?search=USER-BORROWED", headers=librarian_headers)
+        assert response.json()["total"] == 1
+
+        response = await client.get("/api/v1/loans/?search=no-such-loan", headers=librarian_headers)
+        assert response.json()["total"] == 0
+        assert response.json()["items"] == []
+
+    @pytest.mark.asyncio
+    async def test_get_loans_cursor_pagination(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        librarian_headers: dict,
+        test_user: User,
+        test_book: Book
+    ):
+        """Test walking every page with next_cursor"""
+        now = datetime.utcnow()
+        for i in range(5):
+            copy = BookCopy(id=uuid4(), book_id=test_book.id, barcode=f"BC-LOAN-{i}", status="BORROWED")
+            db_session.add(copy)
+            db_session.add(BorrowRecord(
+                id=uuid4(),
+                copy_id=copy.id,
+                user_id=test_user.id,
+                due_date=now + timedelta(days=14),
+                status="ACTIVE",
+                borrowed_at=now - timedelta(minutes=i)
+            ))
+        await db_session.commit()
+
+        barcodes = []
+        response = await client.get("/api/v1/loans/?page_size=2", headers=librarian_headers)
+        while True:
+            assert response.status_code == 200
+            data = response.json()
+            assert data["total"] == 5
+            barcodes += [loan["copy"]["barcode"] for loan in data["items"]]
+            if not data["next_cursor"]:
+                break
+            response = await client.get(
+                f"/api/v1/loans/?page_size=2&cursor={data['next_cursor']}",
+                headers=librarian_headers
+            )
+
+        assert barcodes == [f"BC-LOAN-{i}" for i in range(5)]
+
+    @pytest.mark.asyncio
+    async def test_get_loans_requires_librarian(
+        self,
+        client: AsyncClient,
+        auth_headers: dict
+    ):
+        """Test that regular users cannot list loans"""
+        response = await client.get("/api/v1/loans/", headers=auth_headers)
+        assert response.status_code == 403
+
+
+class TestGetLoanStats:
+    """Test loan statistics"""
+
+    @pytest.mark.asyncio
+    async def test_get_loan_stats(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        librarian_headers: dict,
+        test_user: User,
+        test_book: Book,
+        test_borrowed_copy_by_user: BookCopy
+    ):
+        """Test active and overdue loan counts"""
+        copy = BookCopy(id=uuid4(), book_id=test_book.id, barcode="BC-OVERDUE", status="BORROWED")
+        db_session.add(copy)
+        db_session.add(BorrowRecord(
+            id=uuid4(),
+            copy_id=copy.id,
+            user_id=test_user.id,
+            due_date=datetime.utcnow() - timedelta(days=1),
+            status="ACTIVE"
+        ))
+        await db_session.commit()
+
+        response = await client.get("/api/v1/loans/stats", headers=librarian_headers)
+
+        assert response.status_code == 200
+        assert response.json() == {"active_loans": 2, "overdue_loans": 1}
@@ -44,7 +44,46 @@ class TestNewsListing:
         assert data["page"] == 1
         assert data["page_size"] == 2
         assert len(data["items"]) <= 2
-    
+
+    @pytest.mark.asyncio
+    async def test_get_news_cursor_pagination(
+        self,
+        client: AsyncClient,
+        test_published_news_list: list[News]
+    ):
+        """Test walking the published list with next_cursor"""
+        titles = []
+        response = await client.get("/api/v1/news/?page_size=2")
+        while True:
+            assert response.status_code == 200
+            data = response.json()
+            titles += [item["title"] for item in data["items"]]
+            if not data["next_cursor"]:
+                break
+            response = await client.get(f"/api/v1/news/?page_size=2&cursor={data['next_cursor']}")
+
+        assert titles == ["News Article 1", "News Article 2", "News Article 3"]
+
+    @pytest.mark.asyncio
+    async def test_news_list_cache_dropped_on_publish(
+        self,
+        client: AsyncClient,
+        librarian_headers: dict,
+        test_draft_news: News
+    ):
+        """Test that publishing news is visible on an already cached list"""
+        response = await client.get("/api/v1/news/")
+        assert response.json()["total"] == 0
+
+        response = await client.post(
+            f"/api/v1/news/{test_draft_news.id}/publish",
+            headers=librarian_headers
+        )
+        assert response.status_code == 200
+
+        response = await client.get("/api/v1/news/")
+        assert response.json()["total"] == 1
+
     @pytest.mark.asyncio
     async def test_unpublished_news_not_shown(
         self,
@@ -218,7 +257,67 @@ class TestUpdateNews:
         assert response.status_code == 200
         data = response.json()
         assert data["title"] == "Updated Title"
-    
+
+    @pytest.mark.asyncio
+    async def test_update_news_publish_sets_published_at(
+        self,
+        client: AsyncClient,
+        librarian_headers: dict,
+        test_draft_news: News
+    ):
+        """Test that publishing through update stamps published_at"""
+        response = await client.put(
+            f"/api/v1/news/{test_draft_news.id}",
+            json={"published": True},
+            headers=librarian_headers
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["published"] is True
+        assert data["published_at"] is not None
+
+    @pytest.mark.asyncio
+    async def test_update_news_publish_with_null_published_at(
+        self,
+        client: AsyncClient,
+        librarian_headers: dict
+    ):
+        """Test that published news keep published_at, so the list pages by cursor"""
+        for title in ("First", "Second"):
+            response = await client.post(
+                "/api/v1/news/",
+                json={"title": title, "content": "Draft content"},
+                headers=librarian_headers
+            )
+            response = await client.put(
+                f"/api/v1/news/{response.json()['id']}",
+                json={"published": True, "published_at": None},
+                headers=librarian_headers
+            )
+            assert response.status_code == 200
+            assert response.json()["published_at"] is not None
+
+        # Clearing published_at on a published news is ignored as well
+        response = await client.put(
+            f"/api/v1/news/{response.json()['id']}",
+            json={"published_at": None},
+            headers=librarian_headers
+        )
+        assert response.json()["published_at"] is not None
+
+        titles = []
+        response = await client.get("/api/v1/news/?page_size=1")
+        while True:
+            assert response.status_code == 200
+            data = response.json()
+            titles += [item["title"] for item in data["items"]]
+            if not data["next_cursor"]:
+                break
+            response = await client.get(f"/api/v1/news/?page_size=1&cursor={data['next_cursor']}")
+
+        assert sorted(titles) == ["First", "Second"]
+
     @pytest.mark.asyncio
     async def test_update_nonexistent_news(
         self,
@@ -281,6 +281,47 @@ async def test_fulfill_reservation(
     assert data["status"] == "FULFILLED"
     assert data["fulfilled_at"] is not None
 
+    # A second attempt reports the current status
+    response = await async_client.post(
+        f"/api/v1/reservations/{reservation.id}/fulfill",
+        headers={"Authorization": f"Bearer {librarian_token}"}
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cannot fulfill reservation with status: FULFILLED"
+
+
+@pytest.mark.asyncio
+async def test_fulfill_expired_reservation(
+    async_client: AsyncClient,
+    librarian_token: str,
+    test_user: User,
+    test_book: Book,
+    db_session: AsyncSession
+):
+    """Test that fulfilling an expired reservation marks it EXPIRED"""
+    reservation = Reservation(
+        user_id=test_user.id,
+        book_id=test_book.id,
+        status="PENDING",
+        expires_at=datetime.utcnow() - timedelta(hours=1)
+    )
+    db_session.add(reservation)
+    await db_session.commit()
+    reservation_id = reservation.id
+
+    response = await async_client.post(
+        f"/api/v1/reservations/{reservation_id}/fulfill",
+        headers={"Authorization": f"Bearer {librarian_token}"}
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Reservation has expired"
+
+    db_session.expunge_all()
+    reservation = await db_session.get(Reservation, reservation_id)
+    assert reservation.status == "EXPIRED"
+    assert reservation.fulfilled_at is None
+
 
 @pytest.mark.asyncio
 async def test_auto_fulfill_on_return(
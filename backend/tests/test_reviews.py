@@ -0,0 +1,155 @@
+"""
+Tests for Reviews API endpoints (/api/v1/books/{id}/reviews, /api/v1/reviews/*)
+"""
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import uuid4
+
+from app.models.book import Book
+from app.models.review import Review
+from app.models.user import User
+from app.utils.security import hash_password
+
+
+class TestGetBookReviews:
+    """Test the public review list of a book"""
+
+    @pytest.mark.asyncio
+    async def test_reviews_include_reviewer(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        test_user: User,
+        test_book: Book
+    ):
+        """Test that each review carries its reviewer's name"""
+        other = User(
+            email="reviewer@test.com",
+            username="reviewer",
+            full_name="Second Reviewer",
+            hashed_password=hash_password("Password123"),
+            role="user"
+        )
+        db_session.add(other)
+        await db_session.flush()
+        db_session.add_all([
+            Review(user_id=test_user.id, book_id=test_book.id, rating=5),
+            Review(user_id=other.id, book_id=test_book.id, rating=2, review_text="Meh")
+        ])
+        await db_session.commit()
+        db_session.expunge_all()
+
+        response = await client.get(f"/api/v1/books/{test_book.id}/reviews?sort_by=highest")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 2
+        assert [(r["rating"], r["user_username"]) for r in data["items"]] == [
+            (5, test_user.username),
+            (2, "reviewer")
+        ]
+        assert data["items"][1]["user_full_name"] == "Second Reviewer"
+
+    @pytest.mark.asyncio
+    async def test_reviews_of_missing_book(self, client: AsyncClient):
+        """Test that an unknown book returns 404"""
+        response = await client.get(f"/api/v1/books/{uuid4()}/reviews")
+        assert response.status_code == 404
+
+
+class TestGetMyReviews:
+    """Test the current user's review list"""
+
+    @pytest.mark.asyncio
+    async def test_my_reviews_total_on_every_page(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        auth_headers: dict,
+        test_user: User,
+        test_books_list: list[Book]
+    ):
+        """Test that the total is reported on full, partial and empty pages"""
+        db_session.add_all([
+            Review(user_id=test_user.id, book_id=book.id, rating=4)
+            for book in test_books_list[:3]
+        ])
+        await db_session.commit()
+
+        for page, count in [(1, 2), (2, 1), (3, 0)]:
+            response = await client.get(
+                f"/api/v1/my-reviews?page={page}&page_size=2",
+                headers=auth_headers
+            )
+            assert response.status_code == 200
+            data = response.json()
+            assert data["total"] == 3
+            assert len(data["items"]) == count
+
+
+class TestRatingStats:
+    """Test book rating statistics"""
+
+    @pytest.mark.asyncio
+    async def test_rating_stats_refresh_after_review(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        test_book: Book
+    ):
+        """Test that cached stats are dropped when a review is written"""
+        response = await client.get(f"/api/v1/books/{test_book.id}/rating-stats")
+        assert response.status_code == 200
+        assert response.json()["rating_distribution"]["4"] == 0
+
+        response = await client.post(
+            f"/api/v1/books/{test_book.id}/reviews",
+            json={"rating": 4},
+            headers=auth_headers
+        )
+        assert response.status_code == 201
+
+        response = await client.get(f"/api/v1/books/{test_book.id}/rating-stats")
+        data = response.json()
+        assert data["total_reviews"] == 1
+        assert data["rating_distribution"]["4"] == 1
+
+    @pytest.mark.asyncio
+    async def test_rating_stats_of_missing_book(self, client: AsyncClient):
+        """Test that an unknown book returns 404"""
+        response = await client.get(f"/api/v1/books/{uuid4()}/rating-stats")
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_book_rating_follows_review_writes(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        test_book: Book
+    ):
+        """Test that the book's average and count track create/update/delete"""
+        url = f"/api/v1/books/{test_book.id}/rating-stats"
+
+        response = await client.post(
+            f"/api/v1/books/{test_book.id}/reviews",
+            json={"rating": 5},
+            headers=auth_headers
+        )
+        review_id = response.json()["id"]
+        data = (await client.get(url)).json()
+        assert (data["average_rating"], data["total_reviews"]) == (5, 1)
+
+        response = await client.put(
+            f"/api/v1/reviews/{review_id}",
+            json={"rating": 2},
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        data = (await client.get(url)).json()
+        assert (data["average_rating"], data["total_reviews"]) == (2, 1)
+
+        response = await client.delete(f"/api/v1/reviews/{review_id}", headers=auth_headers)
+        assert response.status_code == 204
+        data = (await client.get(url)).json()
+        assert (data["average_rating"], data["total_reviews"]) == (None, 0)
@@ -4,7 +4,7 @@ from datetime import datetime, timedelta
 from uuid import uuid4
 
 from app.models.news import News, NewsCategory
-from app.services.scheduler import publish_scheduled_news, get_scheduler_status
+from app.services.scheduler import publish_scheduled_news, expire_stale_reservations, get_scheduler_status
 
 
 @pytest.mark.asyncio
@@ -99,6 +99,44 @@ async def test_publish_scheduled_news_current_time(db_session, test_user):
     assert news_now.published is True, "News scheduled for current time should be published"
 
 
+@pytest.mark.asyncio
+async def test_expire_stale_reservations(db_session, test_user, test_book):
+    """Test that only pending reservations past their expiry are expired"""
+    from app.models.reservation import Reservation
+    
+    stale = Reservation(
+        id=uuid4(),
+        user_id=test_user.id,
+        book_id=test_book.id,
+        status="PENDING",
+        expires_at=datetime.utcnow() - timedelta(hours=1)
+    )
+    live = Reservation(
+        id=uuid4(),
+        user_id=test_user.id,
+        book_id=test_book.id,
+        status="PENDING",
+        expires_at=datetime.utcnow() + timedelta(hours=1)
+    )
+    fulfilled = Reservation(
+        id=uuid4(),
+        user_id=test_user.id,
+        book_id=test_book.id,
+        status="FULFILLED",
+        expires_at=datetime.utcnow() - timedelta(hours=1)
+    )
+    db_session.add_all([stale, live, fulfilled])
+    await db_session.commit()
+    
+    await expire_stale_reservations(db_session)
+    
+    for reservation in (stale, live, fulfilled):
+        await db_session.refresh(reservation)
+    assert stale.status == "EXPIRED"
+    assert live.status == "PENDING"
+    assert fulfilled.status == "FULFILLED"
+
+
 def test_get_scheduler_status():
     """Test that scheduler status returns expected structure"""
     status = get_scheduler_status()
@@ -0,0 +1,129 @@
+"""
+Tests for Search API endpoints (/api/v1/search/*), database fallback
+"""
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.book import Book
+
+
+class TestSearchBooksFallback:
+    """Test book search when Elasticsearch is disabled"""
+
+    @pytest.mark.asyncio
+    async def test_search_filters_and_totals(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        test_books_list: list[Book]
+    ):
+        """Test that filtered pages report the filtered total"""
+        db_session.expunge_all()
+
+        response = await client.get("/api/v1/search/books?genres=Fiction&page_size=5")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 7
+        assert data["total_pages"] == 2
+        assert len(data["items"]) == 5
+        assert all(
+            [g["name"] for g in book["genres"]] == ["Fiction"] for book in data["items"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_search_page_past_end(
+        self,
+        client: AsyncClient,
+        test_books_list: list[Book]
+    ):
+        """Test that a page past the end is empty but keeps the total"""
+        response = await client.get("/api/v1/search/books?year_from=2024&page=2")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 3
+        assert data["items"] == []
+
+
+class TestSearchBooksElasticsearch:
+    """Test book search backed by Elasticsearch hits"""
+
+    @pytest.mark.asyncio
+    async def test_books_keep_hit_order(
+        self,
+        client: AsyncClient,
+        monkeypatch,
+        test_books_list: list[Book]
+    ):
+        """Test that books come back in the order Elasticsearch ranked them"""
+        from app.services.elasticsearch_service import es_service
+
+        ranked = [test_books_list[i] for i in (4, 0, 9)]
+
+        async def fake_search_books(**kwargs):
+            return {"total": 3, "hits": [{"id": str(book.id)} for book in ranked]}
+
+        monkeypatch.setattr(es_service, "enabled", True)
+        monkeypatch.setattr(es_service, "search_books", fake_search_books)
+
+        response = await client.get("/api/v1/search/books?q=book")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 3
+        assert [item["title"] for item in data["items"]] == [book.title for book in ranked]
+
+
+class TestSuggestBooks:
+    """Test title autocomplete"""
+
+    @pytest.mark.asyncio
+    async def test_suggestions_cached_per_prefix(
+        self,
+        client: AsyncClient,
+        monkeypatch
+    ):
+        """Test that a repeated prefix is answered without Elasticsearch"""
+        from app.services.elasticsearch_service import es_service
+
+        calls = []
+
+        async def fake_suggest_books(prefix, size):
+            calls.append((prefix, size))
+            return ["Harry Potter"]
+
+        monkeypatch.setattr(es_service, "enabled", True)
+        monkeypatch.setattr(es_service, "suggest_books", fake_suggest_books)
+
+        for q in ("har", "Har", "har"):
+            response = await client.get(f"/api/v1/search/suggest?q={q}")
+            assert response.json() == {"suggestions": ["Harry Potter"]}
+
+        await client.get("/api/v1/search/suggest?q=har&size=5")
+
+        assert calls == [("har", 10), ("har", 5)]
+
+    @pytest.mark.asyncio
+    async def test_failed_suggestions_not_cached(
+        self,
+        client: AsyncClient,
+        monkeypatch
+    ):
+        """Test that an Elasticsearch failure is retried on the next request"""
+        from app.services.elasticsearch_service import es_service
+
+        results = [None, ["Harry Potter"]]
+
+        async def fake_suggest_books(prefix, size):
+            return results.pop(0)
+
+        monkeypatch.setattr(es_service, "enabled", True)
+        monkeypatch.setattr(es_service, "suggest_books", fake_suggest_books)
+
+        response = await client.get("/api/v1/search/suggest?q=har")
+        assert response.json() == {"suggestions": []}
+
+        response = await client.get("/api/v1/search/suggest?q=har")
+        assert response.json() == {"suggestions": ["Harry Potter"]}